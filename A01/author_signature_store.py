@@ -0,0 +1,207 @@
+"""Persistent author signature store
+
+Keeps every known author's signature on disk so identification does not
+re-read the author corpora on each run.
+
+Layout of a store directory:
+    authors.json   author names, in row order, with each author's pending token/sentence,
+                   vocab file and the store generation
+    features.N.npy (n_authors, 8) float64 signatures, memory-mapped for identification
+    state.N.npy    (n_authors, 7) float64 running counters of each author's accumulator
+    vocab/         one gzip JSON word counter per author, read only when that author is updated
+
+An update writes new files under the next generation N and then replaces
+authors.json, which is the commit point. A crash before that rename leaves
+the previous generation intact and consistent. Files it superseded are
+removed afterwards. Stores written before generations existed use
+features.npy, state.npy and vocab/<row>.json.gz.
+"""
+import gzip
+import json
+import os
+import tempfile
+import numpy as np
+from collections import Counter
+
+from authorship_identifier_v02 import AuthorIndex, SignatureAccumulator
+
+STORE_VERSION = 1
+STATE_FIELDS = ['punct_count', 'char_count', 'sentence_count', 'sentence_words',
+                'sentence_mean', 'sentence_m2', 'sentence_max']
+INTEGER_FIELDS = {'punct_count', 'char_count', 'sentence_count', 'sentence_words', 'sentence_max'}
+
+def _atomic_write(path, write):
+    """Write through a temporary file and rename, so readers never see partial files"""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class AuthorSignatureStore:
+    """On-disk author signatures with incremental per-author updates
+    Decision reason: Recomputing every author's signature from raw text on each run does not scale
+    Adding text to an author continues that author's accumulator, so the stored signature always
+    equals make_signature of everything added for the author, in order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, 'vocab'), exist_ok=True)
+        self._authors = None
+        self._generation = 0
+        self._features = None
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load_authors(self):
+        if self._authors is None:
+            try:
+                with open(self._file('authors.json')) as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {'version': STORE_VERSION, 'authors': []}
+            if data['version'] != STORE_VERSION:
+                raise ValueError(f"Unsupported store version {data['version']}")
+            self._authors = data['authors']
+            self._generation = data.get('generation', 0)
+        return self._authors
+
+    def _array_path(self, name, generation):
+        if generation == 0:
+            return self._file(f'{name}.npy')
+        return self._file(f'{name}.{generation:06d}.npy')
+
+    @property
+    def authors(self):
+        """Author names in row order"""
+        return [entry['name'] for entry in self._load_authors()]
+
+    @property
+    def features(self):
+        """(n_authors, 8) signature matrix, memory-mapped read-only"""
+        if self._features is None:
+            authors = self._load_authors()
+            if not authors:
+                return np.zeros((0, 8))
+            # Rows past the author list belong to an update that never committed
+            features = np.load(self._array_path('features', self._generation), mmap_mode='r')
+            self._features = features[:len(authors)]
+        return self._features
+
+    def signature(self, author):
+        return tuple(float(x) for x in self.features[self.authors.index(author)])
+
+    def index(self, standardize=False):
+        """AuthorIndex over the stored signatures, ready for batched guesses"""
+        return AuthorIndex.from_matrix(self.authors, self.features, standardize=standardize)
+
+    def _vocab_path(self, row, entry):
+        return self._file(os.path.join('vocab', entry.get('vocab', f'{row:06d}.json.gz')))
+
+    def _load_accumulator(self, row, entry, state):
+        accumulator = SignatureAccumulator()
+        with gzip.open(self._vocab_path(row, entry), 'rt', encoding='utf-8') as f:
+            accumulator.word_counts = Counter(json.load(f))
+        for field, value in zip(STATE_FIELDS, state):
+            setattr(accumulator, field, int(value) if field in INTEGER_FIELDS else float(value))
+        accumulator._carry = entry['carry']
+        accumulator._open_sentence_words = entry['open_sentence_words']
+        return accumulator
+
+    def add_texts(self, texts_by_author):
+        """Add text for one or more authors, creating unknown authors
+        texts_by_author maps an author name to a string or an iterable of strings (e.g. an open file).
+        """
+        entries = [dict(entry) for entry in self._load_authors()]
+        generation = self._generation + 1
+        rows = {entry['name']: row for row, entry in enumerate(entries)}
+        new_authors = [author for author in dict.fromkeys(texts_by_author) if author not in rows]
+        for author in new_authors:
+            rows[author] = len(entries)
+            entries.append({'name': author, 'carry': '', 'open_sentence_words': 0})
+        # Grow both arrays once for all new authors
+        state = np.zeros((len(entries), len(STATE_FIELDS)))
+        features = np.zeros((len(entries), 8))
+        existing = len(entries) - len(new_authors)
+        if existing:
+            state[:existing] = np.load(self._array_path('state', self._generation))[:existing]
+            features[:existing] = self.features
+
+        for author, text in texts_by_author.items():
+            row = rows[author]
+            if row >= existing:
+                accumulator = SignatureAccumulator()
+            else:
+                accumulator = self._load_accumulator(row, entries[row], state[row])
+
+            if isinstance(text, str):
+                accumulator.update(text)
+            else:
+                accumulator.update_lines(text)
+
+            state[row] = [getattr(accumulator, field) for field in STATE_FIELDS]
+            features[row] = accumulator.signature()
+            entries[row]['carry'] = accumulator._carry
+            entries[row]['open_sentence_words'] = accumulator._open_sentence_words
+            entries[row]['vocab'] = f'{row:06d}.{generation:06d}.json.gz'
+            payload = json.dumps(accumulator.word_counts).encode('utf-8')
+            _atomic_write(self._vocab_path(row, entries[row]), lambda f: f.write(gzip.compress(payload)))
+
+        # New files first, then the author list that switches readers to them
+        self._features = None
+        _atomic_write(self._array_path('state', generation), lambda f: np.save(f, state))
+        _atomic_write(self._array_path('features', generation), lambda f: np.save(f, features))
+        body = json.dumps({'version': STORE_VERSION, 'generation': generation,
+                           'authors': entries}).encode('utf-8')
+        _atomic_write(self._file('authors.json'), lambda f: f.write(body))
+        self._authors = entries
+        self._generation = generation
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        """Delete arrays and vocab files that the committed author list no longer references"""
+        live = {self._array_path('state', self._generation), self._array_path('features', self._generation)}
+        live.update(self._vocab_path(row, entry) for row, entry in enumerate(self._authors))
+        candidates = [self._file(name) for name in os.listdir(self.path)
+                      if name.startswith(('state.', 'features.')) and name.endswith('.npy')]
+        candidates += [self._file(os.path.join('vocab', name)) for name in os.listdir(self._file('vocab'))
+                       if name.endswith('.json.gz')]
+        for path in candidates:
+            if path not in live:
+                os.remove(path)
+
+    def add_file(self, author, path, encoding='utf-8'):
+        """Stream a text file into an author's signature"""
+        with open(path, encoding=encoding) as f:
+            self.add_texts({author: f})
+
+def test_store():
+    """Build a small store, update one author and identify mystery texts"""
+    store_dir = tempfile.mkdtemp(prefix='author_store_')
+    store = AuthorSignatureStore(store_dir)
+    store.add_texts({
+        "Author A": "The quick brown fox jumps over the lazy dog. This is a simple sentence",
+        "Author B": "Programming is fun and challenging. We enjoy writing code and solving complex problems with algorithms.",
+        "Author C": "Data science and machine learning are fascinating fields. They involve statistics, programming, and domain knowledge to extract insights."
+    })
+    store.add_texts({"Author A": " for testing purposes."})
+
+    reopened = AuthorSignatureStore(store_dir)
+    print(f"Authors: {reopened.authors}")
+    print(f"Author A signature: {[f'{x:.4f}' for x in reopened.signature('Author A')]}")
+    mystery_texts = [
+        "A quick brown animal leaps over a sleepy canine.",
+        "Coding brings joy and presents difficult puzzles for us to solve."
+    ]
+    for text, guesses in zip(mystery_texts, reopened.index().guess(mystery_texts, k=2)):
+        print(f"'{text}' -> {[(author, round(distance, 4)) for author, distance in guesses]}")
+
+if __name__ == "__main__":
+    test_store()
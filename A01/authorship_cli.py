@@ -0,0 +1,230 @@
+"""Command-line authorship identification
+
+Identify the authors of a directory of mystery texts against a directory of known-author texts:
+
+    python authorship_cli.py identify known/ mystery/ --output guesses.csv --top 3
+    python authorship_cli.py identify known/ mystery/ --features ngram --output guesses.json
+
+Known authors are either one file per author (the author is the file name without
+extension) or one subdirectory per author whose files are read as a single text.
+
+Measure extraction and identification throughput on synthetic corpora:
+
+    python authorship_cli.py benchmark --authors 50 200 --processes 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from authorship_identifier_v02 import (AuthorIndex, SignatureAccumulator, average_word_length,
+                                       common_word_ratios, different_to_total, exactly_once_to_total,
+                                       fast_signature, make_signature, make_signatures_batch,
+                                       punctuation_ratio, sentence_length_features, split_string,
+                                       vocabulary_richness, word_length_distribution)
+
+DEFAULT_PATTERN = '.txt'
+
+def find_texts(directory, extension=DEFAULT_PATTERN):
+    """Map each text name to its files: top-level files by name, subdirectories by directory name"""
+    texts = {}
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry)
+        if os.path.isdir(path):
+            files = sorted(os.path.join(root, name) for root, _, names in os.walk(path)
+                           for name in names if name.endswith(extension))
+            if files:
+                texts[entry] = files
+        elif entry.endswith(extension):
+            texts[os.path.splitext(entry)[0]] = [path]
+    if not texts:
+        raise ValueError(f"No {extension} files found in {directory}")
+    return texts
+
+def read_text(paths, encoding='utf-8'):
+    """Contents of one or more files joined by newlines"""
+    parts = []
+    for path in paths:
+        with open(path, encoding=encoding, errors='replace') as f:
+            parts.append(f.read())
+    return '\n'.join(parts)
+
+def files_signature(paths, encoding='utf-8'):
+    """Signature of files joined by newlines, streamed so large files are never held in memory"""
+    accumulator = SignatureAccumulator()
+    for i, path in enumerate(paths):
+        if i:
+            accumulator.update('\n')
+        with open(path, encoding=encoding, errors='replace') as f:
+            for chunk in iter(lambda: f.read(1 << 20), ''):
+                accumulator.update(chunk)
+    return accumulator.signature()
+
+def signatures_for_files(file_groups, processes=None):
+    """(n, 8) signature matrix of file groups, computed in a process pool
+    Decision reason: Workers read their own files, so only paths and 8 floats cross process boundaries
+    """
+    file_groups = list(file_groups)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(file_groups)))
+    if processes == 1:
+        rows = [files_signature(paths) for paths in file_groups]
+    else:
+        chunksize = max(1, len(file_groups) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            rows = list(executor.map(files_signature, file_groups, chunksize=chunksize))
+    return np.array(rows, dtype=np.float64).reshape(len(file_groups), 8)
+
+def identify(known_dir, mystery_dir, top=1, features='signature', standardize=False, processes=None,
+             extension=DEFAULT_PATTERN):
+    """Top guesses for every mystery text as {'mystery': name, 'guesses': [(author, distance), ...]}"""
+    known = find_texts(known_dir, extension)
+    mystery = find_texts(mystery_dir, extension)
+    if features == 'ngram':
+        from ngram_features import NgramAuthorIndex
+
+        index = NgramAuthorIndex({author: read_text(paths) for author, paths in known.items()},
+                                 processes=processes or os.cpu_count() or 1)
+        results = index.guess([read_text(paths) for paths in mystery.values()], k=top)
+    else:
+        index = AuthorIndex.from_matrix(list(known), signatures_for_files(known.values(), processes),
+                                        standardize=standardize)
+        indices, distances = index.top_k(signatures_for_files(mystery.values(), processes), top)
+        results = [[(index.authors[i], float(d)) for i, d in zip(row_indices, row_distances)]
+                   for row_indices, row_distances in zip(indices, distances)]
+    return [{'mystery': name, 'guesses': guesses} for name, guesses in zip(mystery, results)]
+
+def write_results(results, output=None, output_format=None, features='signature'):
+    """Write guesses as CSV (one row per mystery text and rank) or JSON; stdout when output is None"""
+    if output_format is None:
+        output_format = 'json' if output and output.endswith('.json') else 'csv'
+    stream = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        if output_format == 'json':
+            payload = [{'mystery': result['mystery'], 'features': features,
+                        'guesses': [{'rank': rank, 'author': author, 'distance': distance}
+                                    for rank, (author, distance) in enumerate(result['guesses'], 1)]}
+                       for result in results]
+            json.dump(payload, stream, indent=2)
+            stream.write('\n')
+        else:
+            writer = csv.writer(stream)
+            writer.writerow(['mystery', 'rank', 'author', 'distance'])
+            for result in results:
+                for rank, (author, distance) in enumerate(result['guesses'], 1):
+                    writer.writerow([result['mystery'], rank, author, f'{distance:.6f}'])
+    finally:
+        if output:
+            stream.close()
+
+# BENCHMARK
+FEATURE_FUNCTIONS = [
+    ('split_string', lambda text, words: split_string(text)),
+    ('average_word_length', lambda text, words: average_word_length(words)),
+    ('different_to_total', lambda text, words: different_to_total(words)),
+    ('exactly_once_to_total', lambda text, words: exactly_once_to_total(words)),
+    ('sentence_length_features', lambda text, words: sentence_length_features(text)),
+    ('punctuation_ratio', lambda text, words: punctuation_ratio(text)),
+    ('common_word_ratios', lambda text, words: common_word_ratios(words)),
+    ('vocabulary_richness', lambda text, words: vocabulary_richness(words)),
+    ('word_length_distribution', lambda text, words: word_length_distribution(words)),
+]
+
+def _time_per_text(function, texts, repeat=3):
+    """Best-of-repeat seconds per text for function(text)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts)
+
+def benchmark(author_counts=(50, 200), known_words=2000, mystery_words=300, processes=None, seed=0):
+    """Report per-feature extraction cost and end-to-end texts/sec on synthetic corpora"""
+    from ngram_features import NgramAuthorIndex, NgramVectorizer
+    from synthetic_corpus import synthetic_corpus
+
+    processes = processes or os.cpu_count() or 1
+    known_texts, _, _ = synthetic_corpus(50, known_words=known_words, seed=seed)
+    texts = list(known_texts.values())
+    split = [split_string(text) for text in texts]
+    print(f"Per-feature extraction cost ({len(texts)} texts of {known_words} words)")
+    print(f"{'feature':<26} {'us/text':>10}")
+    for name, function in FEATURE_FUNCTIONS:
+        # Feature functions take the pre-split words, as in make_signature
+        cost = _time_per_text(lambda pair: function(*pair), list(zip(texts, split)))
+        print(f"{name:<26} {cost * 1e6:>10.1f}")
+    vectorizer = NgramVectorizer()
+    for name, function in (('make_signature', make_signature), ('fast_signature', fast_signature),
+                           ('ngram vector', vectorizer.vector)):
+        print(f"{name:<26} {_time_per_text(function, texts) * 1e6:>10.1f}")
+
+    print(f"\nThroughput over known + mystery texts (processes={processes})")
+    print(f"{'authors':>8} {'stage':<30} {'texts/s':>10}")
+    for n_authors in author_counts:
+        known_texts, mystery_texts, _ = synthetic_corpus(
+            n_authors, known_words=known_words, mystery_words=mystery_words, seed=seed)
+        all_texts = list(known_texts.values()) + mystery_texts
+        stages = [
+            ('make_signature', lambda: [make_signature(text) for text in all_texts]),
+            ('make_signatures_batch', lambda: make_signatures_batch(all_texts, processes=processes)),
+            ('identify (signature)', lambda: AuthorIndex.from_matrix(
+                list(known_texts), make_signatures_batch(known_texts.values(), processes=processes)
+            ).guess(mystery_texts, processes=processes)),
+            ('identify (ngram)', lambda: NgramAuthorIndex(
+                known_texts, processes=processes).guess(mystery_texts)),
+        ]
+        for name, stage in stages:
+            start = time.perf_counter()
+            stage()
+            seconds = time.perf_counter() - start
+            print(f"{n_authors:>8} {name:<30} {len(all_texts) / seconds:>10.1f}")
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authorship identification")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    identify_parser = subparsers.add_parser('identify', help="Guess the authors of mystery texts")
+    identify_parser.add_argument('known_dir', help="One file or subdirectory per known author")
+    identify_parser.add_argument('mystery_dir', help="One file or subdirectory per mystery text")
+    identify_parser.add_argument('--output', '-o', help="Output file (.csv or .json); default: CSV on stdout")
+    identify_parser.add_argument('--format', choices=['csv', 'json'], help="Override the output format")
+    identify_parser.add_argument('--top', type=positive_int, default=1, help="Guesses per mystery text")
+    identify_parser.add_argument('--features', choices=['signature', 'ngram'], default='signature')
+    identify_parser.add_argument('--standardize', action='store_true',
+                                 help="z-score signature features over the known authors")
+    identify_parser.add_argument('--processes', type=positive_int, help="Worker processes (default: all cores)")
+    identify_parser.add_argument('--extension', default=DEFAULT_PATTERN, help="Text file extension")
+
+    benchmark_parser = subparsers.add_parser('benchmark', help="Measure extraction cost and throughput")
+    benchmark_parser.add_argument('--authors', type=int, nargs='+', default=[50, 200])
+    benchmark_parser.add_argument('--known-words', type=int, default=2000)
+    benchmark_parser.add_argument('--mystery-words', type=int, default=300)
+    benchmark_parser.add_argument('--processes', type=positive_int)
+
+    args = parser.parse_args(argv)
+    if args.command == 'identify':
+        start = time.perf_counter()
+        results = identify(args.known_dir, args.mystery_dir, top=args.top, features=args.features,
+                           standardize=args.standardize, processes=args.processes, extension=args.extension)
+        write_results(results, args.output, args.format, args.features)
+        print(f"Identified {len(results)} texts in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    else:
+        benchmark(args.authors, args.known_words, args.mystery_words, args.processes)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,16 @@ import re
 from collections import Counter
 import string
 import math
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Most common English function words (used by common_word_ratios)
+COMMON_WORDS = frozenset({
+    'the', 'and', 'to', 'of', 'a', 'in', 'that', 'is', 'it', 'with',
+    'for', 'as', 'was', 'on', 'are', 'but', 'not', 'they', 'this', 'have'
+})
 
 # Existing functions from v01 (keeping for compatibility)
 def clean_word(word):
@@ -99,25 +109,19 @@ def common_word_ratios(words):
     """Calculate the ratio of common function words
     Decision reason: Function word usage patterns are hard to consciously change, making them reliable author fingerprints
     """
-    # Most common English function words
-    common_words = {
-        'the', 'and', 'to', 'of', 'a', 'in', 'that', 'is', 'it', 'with',
-        'for', 'as', 'was', 'on', 'are', 'but', 'not', 'they', 'this', 'have'
-    }
-    
-    cleaned_words = [clean_word(word) for word in words if clean_word(word)]
+    cleaned_words = [cleaned for cleaned in map(clean_word, words) if cleaned]
     
     if not cleaned_words:
         return 0
     
-    common_count = sum(1 for word in cleaned_words if word in common_words)
+    common_count = sum(1 for word in cleaned_words if word in COMMON_WORDS)
     return common_count / len(cleaned_words)
 
 def vocabulary_richness(words):
     """Calculate vocabulary richness using Honore's R measure
     Decision reason: Better reflects vocabulary diversity than simple type-token ratio
     """
-    cleaned_words = [clean_word(word) for word in words if clean_word(word)]
+    cleaned_words = [cleaned for cleaned in map(clean_word, words) if cleaned]
     
     if not cleaned_words:
         return 0
@@ -141,7 +145,7 @@ def word_length_distribution(words):
     """Calculate word length distribution features
     Decision reason: Author preference for short vs long words is a stylistic feature
     """
-    cleaned_words = [clean_word(word) for word in words if clean_word(word)]
+    cleaned_words = [cleaned for cleaned in map(clean_word, words) if cleaned]
     
     if not cleaned_words:
         return 0, 0
@@ -189,6 +193,183 @@ def make_signature(text):
         long_words_ratio            # 7: Long words ratio (new)
     )
 
+# FAST SINGLE-PASS FEATURE EXTRACTION
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+PUNCTUATION_DELETE = str.maketrans('', '', string.punctuation)
+
+def clean_word_counts(words):
+    """Count cleaned words, cleaning each distinct raw token only once
+    Decision reason: Natural text repeats tokens heavily, so cleaning unique tokens avoids most clean_word calls
+    """
+    word_counts = Counter()
+    for raw, count in Counter(words).items():
+        cleaned = clean_word(raw)
+        if cleaned:
+            word_counts[cleaned] += count
+    return word_counts
+
+def sentence_word_counts(text):
+    """Word count of every non-empty sentence, split the same way as sentence_length_features"""
+    return [len(s.split()) for s in SENTENCE_SPLIT.split(text) if s.strip()]
+
+def count_punctuation(text):
+    """Count characters in string.punctuation without a per-character Python loop"""
+    return len(text) - len(text.translate(PUNCTUATION_DELETE))
+
+def signature_from_counts(word_counts, sentence_count, sentence_words, punct_count, char_count):
+    """Build the 8-feature signature from shared counts
+    Decision reason: Every feature is a function of these counts, so extractors only need to count once
+    Returns exactly the values make_signature computes for the same text.
+    """
+    total_words = sum(word_counts.values())
+    if total_words == 0:
+        avg_len = diff_ratio = once_ratio = common_ratio = vocab_rich = long_words_ratio = 0
+    else:
+        unique_words = len(word_counts)
+        hapax_count = sum(1 for count in word_counts.values() if count == 1)
+        total_chars = sum(len(word) * count for word, count in word_counts.items())
+        avg_len = total_chars / total_words
+        diff_ratio = unique_words / total_words
+        once_ratio = hapax_count / total_words
+        common_ratio = sum(word_counts[word] for word in COMMON_WORDS if word in word_counts) / total_words
+        long_words_ratio = sum(count for word, count in word_counts.items() if len(word) > 6) / total_words
+        vocab_rich = 0
+        if hapax_count != 0:
+            try:
+                vocab_rich = 100 * (math.log(total_words) / (1 - (hapax_count / unique_words)))
+            except (ValueError, ZeroDivisionError):
+                vocab_rich = 0
+    
+    avg_sent_len = sentence_words / sentence_count if sentence_count else 0
+    punct_ratio = punct_count / char_count if char_count else 0
+    return (avg_len, diff_ratio, once_ratio, avg_sent_len,
+            punct_ratio, common_ratio, vocab_rich, long_words_ratio)
+
+def fast_signature(text):
+    """Single-pass equivalent of make_signature
+    Decision reason: Tokenize and clean once, then derive all 8 features from shared counts
+    """
+    sentence_lengths = sentence_word_counts(text)
+    return signature_from_counts(
+        clean_word_counts(text.split()),
+        len(sentence_lengths),
+        sum(sentence_lengths),
+        count_punctuation(text),
+        len(text)
+    )
+
+class SignatureAccumulator:
+    """Incremental make_signature over text fed in chunks or lines
+    Decision reason: Multi-hundred-MB corpora should not need to fit in memory as one string
+    Memory stays constant apart from the cleaned-word counter. signature() returns
+    the same 8-tuple make_signature gives for the concatenated input.
+    """
+    
+    def __init__(self):
+        self.word_counts = Counter()
+        self.punct_count = 0
+        self.char_count = 0
+        # Sentence lengths: exact total for the average, Welford for the variance
+        self.sentence_count = 0
+        self.sentence_words = 0
+        self.sentence_mean = 0.0
+        self.sentence_m2 = 0.0
+        self.sentence_max = 0
+        self._open_sentence_words = 0
+        self._carry = ''
+    
+    def _close_sentence(self):
+        length = self._open_sentence_words
+        self._open_sentence_words = 0
+        if length == 0:  # whitespace-only segments are not sentences
+            return
+        self.sentence_count += 1
+        self.sentence_words += length
+        delta = length - self.sentence_mean
+        self.sentence_mean += delta / self.sentence_count
+        self.sentence_m2 += delta * (length - self.sentence_mean)
+        self.sentence_max = max(self.sentence_max, length)
+    
+    def _consume(self, block):
+        """Count a block that ends on a token boundary"""
+        self.word_counts.update(clean_word_counts(block.split()))
+        segments = SENTENCE_SPLIT.split(block)
+        self._open_sentence_words += len(segments[0].split())
+        for segment in segments[1:]:
+            self._close_sentence()
+            self._open_sentence_words = len(segment.split())
+    
+    def update(self, chunk):
+        """Add the next piece of text; pieces may split words and sentences anywhere"""
+        self.char_count += len(chunk)
+        self.punct_count += count_punctuation(chunk)
+        buffer = self._carry + chunk
+        # Hold back a trailing partial token until the next chunk completes it
+        cut = len(buffer)
+        while cut > 0 and not buffer[cut - 1].isspace():
+            cut -= 1
+        self._carry = buffer[cut:]
+        if cut:
+            self._consume(buffer[:cut])
+        return self
+    
+    def update_lines(self, lines):
+        """Add every string from an iterator (e.g. an open file)"""
+        for line in lines:
+            self.update(line)
+        return self
+    
+    @classmethod
+    def from_file(cls, path, chunk_size=1 << 20, encoding='utf-8'):
+        """Accumulate a file in fixed-size chunks"""
+        accumulator = cls()
+        with open(path, encoding=encoding) as f:
+            for chunk in iter(lambda: f.read(chunk_size), ''):
+                accumulator.update(chunk)
+        return accumulator
+    
+    def _finished(self):
+        """Copy of the state as if the input ended here; more text can still be added to self"""
+        final = copy.copy(self)
+        if self._carry:
+            final.word_counts = self.word_counts.copy()
+            final._consume(self._carry)
+            final._carry = ''
+        final._close_sentence()
+        return final
+    
+    def sentence_stats(self):
+        """(average, max, variance) of sentence lengths, as sentence_length_features"""
+        final = self._finished()
+        if final.sentence_count == 0:
+            return 0, 0, 0
+        variance = final.sentence_m2 / final.sentence_count if final.sentence_count > 1 else 0
+        return final.sentence_words / final.sentence_count, final.sentence_max, variance
+    
+    def signature(self):
+        """The 8-feature signature of everything seen so far"""
+        final = self._finished()
+        return signature_from_counts(final.word_counts, final.sentence_count, final.sentence_words,
+                                     final.punct_count, final.char_count)
+
+def make_signatures_batch(texts, processes=None, chunksize=None):
+    """Compute signatures for many texts as an (n_texts, 8) float64 matrix
+    Decision reason: Signature extraction is CPU-bound and independent per text, so it scales across processes
+    Rows follow the input order. processes=1 runs in-process.
+    """
+    texts = list(texts)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(texts)))
+    if processes == 1:
+        rows = [fast_signature(text) for text in texts]
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(texts) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            rows = list(executor.map(fast_signature, texts, chunksize=chunksize))
+    return np.array(rows, dtype=np.float64).reshape(len(texts), 8)
+
 def get_all_signatures(authors_texts):
     """Get enhanced feature signatures for all authors"""
     signatures = {}
@@ -196,40 +377,97 @@ def get_all_signatures(authors_texts):
         signatures[author] = make_signature(text)
     return signatures
 
+# Feature weights (based on linguistic importance)
+FEATURE_WEIGHTS = [
+    1.0,   # Average word length
+    1.5,   # Word variety ratio (important)
+    1.2,   # Hapax legomena ratio
+    1.0,   # Average sentence length
+    0.8,   # Punctuation ratio
+    1.3,   # Common word ratio (important)
+    1.4,   # Vocabulary richness (important)
+    1.1    # Long words ratio
+]
+
 def make_guess(mystery_text, author_signatures):
     """Enhanced guessing function using weighted Euclidean distance
     Decision reason: Different features have different importance, weighting improves accuracy
     """
-    mystery_sig = make_signature(mystery_text)
-    
-    best_author = None
-    best_distance = float('inf')
-    
-    # Feature weights (based on linguistic importance)
-    weights = [
-        1.0,   # Average word length
-        1.5,   # Word variety ratio (important)
-        1.2,   # Hapax legomena ratio
-        1.0,   # Average sentence length
-        0.8,   # Punctuation ratio
-        1.3,   # Common word ratio (important)
-        1.4,   # Vocabulary richness (important)
-        1.1    # Long words ratio
-    ]
+    if not author_signatures:
+        return None, float('inf')
     
-    for author, signature in author_signatures.items():
-        distance = 0
-        for i in range(len(mystery_sig)):
-            weight = weights[i] if i < len(weights) else 1.0
-            diff = mystery_sig[i] - signature[i]
-            distance += weight * (diff ** 2)
-        distance = distance ** 0.5
-        
-        if distance < best_distance:
-            best_distance = distance
-            best_author = author
-    
-    return best_author, best_distance  # Return author and distance score
+    # AuthorIndex.top_k keeps the earlier author on ties, as the old per-author loop did
+    index = AuthorIndex(author_signatures)
+    indices, distances = index.top_k([make_signature(mystery_text)])
+    return index.authors[indices[0][0]], float(distances[0][0])  # Return author and distance score
+
+# VECTORIZED NEAREST-AUTHOR SEARCH
+def nearest_k(distances, k=1):
+    """Column indices and values of the k smallest entries per row of a distance matrix, nearest first"""
+    n_columns = distances.shape[1]
+    k = min(k, n_columns)
+    if k < n_columns:
+        candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(n_columns), (len(distances), 1))
+    candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+    # stable sort keeps the earlier author first on ties, like make_guess
+    order = np.lexsort((candidates, candidate_distances), axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1)
+    return indices, np.take_along_axis(distances, indices, axis=1)
+
+class AuthorIndex:
+    """Precomputed author signature matrix for batched weighted-distance search
+    Decision reason: One broadcasted distance computation over all authors replaces a Python loop per author
+    """
+    
+    def __init__(self, author_signatures, weights=None, standardize=False, matrix=None):
+        self.authors = list(author_signatures)
+        if matrix is None:
+            matrix = [author_signatures[a] for a in self.authors]
+        self.signatures = np.asarray(matrix, dtype=np.float64).reshape(len(self.authors), 8)
+        self.weights = np.asarray(FEATURE_WEIGHTS if weights is None else weights, dtype=np.float64)
+        self.standardize = standardize
+        if standardize and len(self.authors) > 1:
+            # z-scores over the reference authors keep large-scale features
+            # (vocabulary richness is in the hundreds) from swamping ratios
+            self.mean = self.signatures.mean(axis=0)
+            std = self.signatures.std(axis=0)
+            self.scale = np.where(std > 0, std, 1.0)
+        else:
+            self.mean = np.zeros(8)
+            self.scale = np.ones(8)
+        self.normalized = (self.signatures - self.mean) / self.scale
+    
+    @classmethod
+    def from_matrix(cls, authors, matrix, weights=None, standardize=False):
+        """Build an index from author names and an (n_authors, 8) signature matrix"""
+        return cls(authors, weights=weights, standardize=standardize, matrix=matrix)
+    
+    def distances(self, query_signatures, block_size=1024):
+        """Weighted Euclidean distance from each query to each author, shape (n_queries, n_authors)
+        Queries are processed in blocks so the broadcast stays within block_size x n_authors x 8 values.
+        """
+        queries = (np.asarray(query_signatures, dtype=np.float64).reshape(-1, 8) - self.mean) / self.scale
+        result = np.empty((len(queries), len(self.authors)))
+        for start in range(0, len(queries), block_size):
+            diff = queries[start:start + block_size, None, :] - self.normalized[None, :, :]
+            result[start:start + block_size] = np.sqrt(np.einsum('qaf,qaf,f->qa', diff, diff, self.weights))
+        return result
+    
+    def top_k(self, query_signatures, k=1):
+        """Return (author_indices, distances) of the k nearest authors per query, nearest first"""
+        return nearest_k(self.distances(query_signatures), k)
+    
+    def guess(self, mystery_texts, k=1, processes=1):
+        """Top-k (author, distance) lists for each mystery text"""
+        indices, distances = self.top_k(make_signatures_batch(mystery_texts, processes=processes), k)
+        return [[(self.authors[i], float(d)) for i, d in zip(row_indices, row_distances)]
+                for row_indices, row_distances in zip(indices, distances)]
+
+def make_guesses(mystery_texts, author_signatures, k=1, standardize=False):
+    """Batch version of make_guess returning the top-k (author, distance) pairs per text"""
+    return AuthorIndex(author_signatures, standardize=standardize).guess(mystery_texts, k=k)
 
 # TESTING FUNCTIONS
 def test_functions():
@@ -0,0 +1,110 @@
+# benchmarks/corpus.py
+"""
+Reproducible synthetic corpora for benchmarks.
+
+PDFs are written directly (one Helvetica text stream per page) so corpus
+generation has no dependencies beyond the standard library and the same
+seed always produces byte-identical files.
+"""
+import os
+import random
+from typing import List
+
+VOCABULARY = (
+    "model data learning network training retrieval vector embedding query "
+    "document attention transformer layer gradient loss accuracy benchmark "
+    "corpus token sequence language semantic similarity index search result "
+    "method approach experiment evaluation baseline dataset feature analysis "
+    "performance latency throughput memory system architecture parameter "
+    "the of and to in a is that for with as on by this are we from be"
+).split()
+
+LINES_PER_PAGE = 48
+WORDS_PER_LINE = 12
+
+
+def make_sentence(rng: random.Random, min_words: int = 6, max_words: int = 18) -> str:
+    """Build one pseudo-academic sentence"""
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_page_text(rng: random.Random, lines: int = LINES_PER_PAGE) -> List[str]:
+    """Build the text lines of one page, with blank lines between paragraphs"""
+    page_lines = []
+    current = ""
+    while len(page_lines) < lines:
+        current = (current + " " + make_sentence(rng)).strip()
+        words = current.split()
+        while len(words) >= WORDS_PER_LINE and len(page_lines) < lines:
+            page_lines.append(" ".join(words[:WORDS_PER_LINE]))
+            words = words[WORDS_PER_LINE:]
+            if rng.random() < 0.12 and len(page_lines) < lines:
+                page_lines.append("")
+        current = " ".join(words)
+    return page_lines
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: List[List[str]]):
+    """Write a minimal PDF with one text stream per page"""
+    objects = []  # object bodies, object number = index + 1
+    page_ids = []
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # pages tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for lines in pages:
+        stream = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        for line in lines:
+            stream.append(f"({_escape_pdf_text(line)}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_corpus(output_dir: str, num_documents: int = 5, pages_per_document: int = 20,
+                    seed: int = 42) -> List[str]:
+    """Generate a reproducible corpus of synthetic PDF papers and return their paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for doc_index in range(num_documents):
+        pages = [make_page_text(rng) for _ in range(pages_per_document)]
+        path = os.path.join(output_dir, f"synthetic_paper_{doc_index:03d}.pdf")
+        write_pdf(path, pages)
+        paths.append(path)
+    return paths
+
+
+def generate_queries(num_queries: int, seed: int = 7) -> List[str]:
+    """Generate reproducible benchmark questions"""
+    rng = random.Random(seed)
+    return [make_sentence(rng, 4, 10).rstrip(".") + "?" for _ in range(num_queries)]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Hedged LLM call benchmark
+Run with: python benchmarks/hedging.py --calls 300
+
+Two local stand-in providers with the same heavy-tailed latency (a base
+latency plus, for a small fraction of requests, a long stall) answer the
+same sequence of chat completions:
+  - single:  every call goes to the primary
+  - pool:    ProviderPool, hedging to the secondary after the primary's
+             recent p95 latency
+Reports latency percentiles and how many extra requests hedging cost.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_llm_server import MockLLMServer
+from benchmarks.stats import summarize
+from src.clients.llm_providers import OpenAICompatibleProvider
+from src.clients.openai_client import build_openai_client
+from src.clients.provider_pool import ProviderPool
+from src.clients.resilience import ResilientCaller, RetryPolicy
+
+MESSAGES = [{"role": "user", "content": "Summarize the attention mechanism."}]
+
+
+def _provider(name: str, mock: MockLLMServer) -> OpenAICompatibleProvider:
+    client = build_openai_client(api_key="benchmark", base_url=mock.base_url)
+    caller = ResilientCaller(f"{name}_chat", retry_policy=RetryPolicy(max_retries=0))
+    return OpenAICompatibleProvider(name, "mock-model", client, caller)
+
+
+def _run(provider, calls: int) -> Dict[str, Any]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        provider.complete(MESSAGES)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, calls, time.perf_counter() - start)
+
+
+def run(calls: int, latency: float, tail_probability: float, tail_latency: float,
+        percentile: float) -> Dict[str, Any]:
+    options = dict(latency_seconds=latency, jitter_seconds=latency / 2, tail_probability=tail_probability,
+                   tail_latency_seconds=tail_latency, reply="One two three four five six seven eight.")
+    results: Dict[str, Any] = {}
+    with MockLLMServer(**options) as primary, MockLLMServer(**options) as secondary:
+        results["single"] = _run(_provider("primary", primary), calls)
+
+        pool = ProviderPool([_provider("primary", primary), _provider("secondary", secondary)],
+                            hedge_percentile=percentile, initial_hedge_delay=latency * 3, min_samples=20)
+        before = primary.request_count + secondary.request_count
+        results["pool"] = _run(pool, calls)
+        results["pool"]["extra_requests_pct"] = round(
+            100.0 * (primary.request_count + secondary.request_count - before - calls) / calls, 2)
+        results["pool"]["routing"] = pool.summary()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Hedged LLM call benchmark")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="Base latency per call (seconds)")
+    parser.add_argument("--tail-probability", type=float, default=0.03)
+    parser.add_argument("--tail-latency", type=float, default=0.5, help="Extra latency of tail calls (seconds)")
+    parser.add_argument("--percentile", type=float, default=95.0, help="Hedge after this latency percentile")
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    print(f"=== Hedged LLM calls: {args.calls} calls, {100 * args.tail_probability:.1f}% "
+          f"stall {args.tail_latency}s ===")
+    results = run(args.calls, args.latency, args.tail_probability, args.tail_latency, args.percentile)
+    print(f"{'mode':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'extra req %':>12}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        print(f"{name:<8} {latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f} "
+              f"{latency['max']:>9.1f} {result.get('extra_requests_pct', 0.0):>12}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
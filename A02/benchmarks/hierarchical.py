@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Two-stage (document -> chunk) retrieval benchmark
+Run with: python benchmarks/hierarchical.py --documents 300 --queries 200
+
+Builds a synthetic corpus straight from vectors: documents belong to
+research areas (about ten per area) and drift from the area's direction,
+pages drift from their document and chunks from their page, so a query's
+nearest chunks often span several related papers.
+Queries are perturbed copies of random chunks. Chunks go into a fresh
+Chroma collection, and centroids are stored the way ingest stores them.
+Each query then runs:
+  - flat:      one search over every chunk
+  - document:  nearest document centroids, then a chunk search within them
+  - page:      nearest page centroids, then a chunk search within them
+Recall@k is measured against exact brute-force search over all chunks.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import summarize
+from src.vector_store.centroids import DOCUMENT_LEVEL, PAGE_LEVEL, CentroidIndex
+from src.vector_store.chroma_manager import ChromaDBManager
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def make_corpus(rng: np.random.Generator, documents: int, pages: int, chunks_per_page: int,
+                dimension: int):
+    """Chunk records and unit embeddings clustered by document and page"""
+    records, vectors = [], []
+    areas = rng.normal(size=(max(1, documents // 10), dimension))
+    for doc_index in range(documents):
+        source = f"synthetic_paper_{doc_index:04d}.pdf"
+        topic = areas[doc_index % len(areas)] + 0.6 * rng.normal(size=dimension)
+        for page in range(1, pages + 1):
+            page_center = topic + 0.8 * rng.normal(size=dimension)
+            for chunk_id in range(chunks_per_page):
+                vectors.append(page_center + 1.5 * rng.normal(size=dimension))
+                records.append({"content": f"{source} p{page} c{chunk_id}",
+                                "metadata": {"source": source, "filename": source, "page": page,
+                                             "chunk_id": chunk_id}})
+    return records, _unit(np.asarray(vectors))
+
+
+def _ids(results: Dict[str, Any]) -> List[str]:
+    return [metadata["content"] for metadata in results["metadatas"][0]]
+
+
+def run(documents: int, pages: int, chunks_per_page: int, dimension: int, queries: int, top_k: int,
+        top_documents: int, top_pages: int, seed: int) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    records, vectors = make_corpus(rng, documents, pages, chunks_per_page, dimension)
+    for record in records:
+        record["metadata"]["content"] = record["content"]  # lets results be matched by label
+    picks = rng.integers(0, len(records), size=queries)
+    query_vectors = _unit(vectors[picks] + 0.8 * rng.normal(size=(queries, dimension)) / np.sqrt(dimension))
+    truth = [set(records[i]["content"] for i in np.argsort(-vectors @ q)[:top_k]) for q in query_vectors]
+
+    workdir = tempfile.mkdtemp(prefix="hierarchical_benchmark_")
+    try:
+        store = ChromaDBManager(os.path.join(workdir, "chroma_db"), "benchmark_papers")
+        centroids = CentroidIndex(store)
+        per_document = pages * chunks_per_page
+        for start in range(0, len(records), per_document):  # one document per ingest, as the pipeline does
+            batch, embeddings = records[start:start + per_document], vectors[start:start + per_document].tolist()
+            store.add_documents(batch, embeddings)
+            centroids.add(batch, embeddings)
+
+        def two_stage(level: str, top_n: int):
+            def search(query: List[float]):
+                where, candidates = centroids.candidate_filter(query, level, top_n)
+                return store.search_similar(query, top_k=top_k, where=where, candidate_count=candidates)
+            return search
+
+        modes = {
+            "flat": lambda q: store.search_similar(q, top_k=top_k),
+            "document": two_stage(DOCUMENT_LEVEL, top_documents),
+            "page": two_stage(PAGE_LEVEL, top_pages),
+        }
+        results: Dict[str, Any] = {}
+        for name, search in modes.items():
+            search(query_vectors[0].tolist())  # warm the HNSW segment
+            latencies, hits = [], 0
+            start = time.perf_counter()
+            for query, expected in zip(query_vectors, truth):
+                call_start = time.perf_counter()
+                found = _ids(search(query.tolist()))
+                latencies.append(time.perf_counter() - call_start)
+                hits += len(expected.intersection(found))
+            results[name] = summarize(latencies, queries, time.perf_counter() - start)
+            results[name]["recall_at_k"] = round(hits / (queries * top_k), 4)
+        results["corpus"] = {"documents": documents, "chunks": len(records), "pages": documents * pages}
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Two-stage (document -> chunk) retrieval benchmark")
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=10, help="Pages per document")
+    parser.add_argument("--chunks-per-page", type=int, default=6)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--top-documents", type=int, default=8, help="Documents kept by the first stage")
+    parser.add_argument("--top-pages", type=int, default=32, help="Pages kept by the first stage")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"=== Two-stage retrieval: {args.documents} documents x {args.pages} pages x "
+          f"{args.chunks_per_page} chunks, {args.queries} queries, top-{args.top_k} ===")
+    results = run(args.documents, args.pages, args.chunks_per_page, args.dimension, args.queries, args.top_k,
+                  args.top_documents, args.top_pages, args.seed)
+    print(f"{'mode':<9} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'qps':>8}")
+    for name in ("flat", "document", "page"):
+        result = results[name]
+        latency = result["latency_ms"]
+        print(f"{name:<9} {result['recall_at_k']:>9.3f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} "
+              f"{latency['p99']:>9.2f} {result['throughput_per_second']:>8.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+LLM call logging overhead benchmark
+Run with: python benchmarks/llm_logging.py --calls 20000
+
+Measures the time each logging approach adds to the calling thread of an
+LLM call, for a RAG-sized chat request (system + ~6 KB user prompt) and
+answer:
+  - sync-indent:   FileHandler + json.dumps(..., indent=2) on the calling
+                   thread (the pattern in main_with_mock.py)
+  - disabled:      llm_call_log with no file configured
+  - queued:        llm_call_log, metadata only
+  - queued+payload: llm_call_log with every call's payload sampled
+Writing time for the queued modes is reported separately as drain time.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.monitoring.llm_logging import LLMCallLogger
+from src.monitoring.metrics import LatencyHistogram
+
+
+def sample_call():
+    context = "\n".join(f"Document {i} (Source: paper_{i}.pdf, Page: {i}):\n" + "Transformer attention scales "
+                        "quadratically with sequence length. " * 20 for i in range(1, 6))
+    messages = [
+        {"role": "system", "content": "You are an academic research assistant."},
+        {"role": "user", "content": f"Based on the following context...\n{context}\nQuestion: Why?"},
+    ]
+    answer = "According to Document 1, attention cost grows quadratically. " * 25
+    return messages, answer
+
+
+def _summary(histogram: LatencyHistogram, drain_seconds: float = 0.0) -> Dict[str, Any]:
+    return {
+        "mean_us": round(1e6 * histogram.sum_seconds / histogram.count, 2),
+        "p50_us": round(1e6 * histogram.percentile(50), 2),
+        "p99_us": round(1e6 * histogram.percentile(99), 2),
+        "drain_ms": round(1000 * drain_seconds, 1),
+    }
+
+
+def run(calls: int) -> Dict[str, Any]:
+    messages, answer = sample_call()
+    workdir = tempfile.mkdtemp(prefix="llm_logging_")
+    results: Dict[str, Any] = {}
+    try:
+        # Synchronous baseline, as in main_with_mock.py
+        sync_logger = logging.getLogger("benchmark.sync_llm_log")
+        sync_logger.propagate = False
+        sync_logger.setLevel(logging.DEBUG)
+        file_handler = logging.FileHandler(os.path.join(workdir, "sync.log"), encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        sync_logger.addHandler(file_handler)
+        histogram = LatencyHistogram()
+        for _ in range(calls):
+            start = time.perf_counter()
+            sync_logger.debug(f"Request JSON: {json.dumps({'model': 'gpt', 'messages': messages}, indent=2)}")
+            sync_logger.debug(f"Response JSON: {json.dumps({'content': answer}, indent=2)}")
+            histogram.record(time.perf_counter() - start)
+        sync_logger.removeHandler(file_handler)
+        file_handler.close()
+        results["sync-indent"] = _summary(histogram)
+
+        for name, path, sample_rate in (("disabled", None, 0.0),
+                                        ("queued", "queued.jsonl", 0.0),
+                                        ("queued+payload", "payload.jsonl", 1.0)):
+            call_log = LLMCallLogger()
+            call_log.configure(path and os.path.join(workdir, path), payload_sample_rate=sample_rate,
+                               queue_size=calls + 1)
+            histogram = LatencyHistogram()
+            for _ in range(calls):
+                start = time.perf_counter()
+                call_log.log_call("chat", "gpt-3.5-turbo", 0.8, prompt_tokens=1600, completion_tokens=400,
+                                  request=messages, response=answer)
+                histogram.record(time.perf_counter() - start)
+            start = time.perf_counter()
+            call_log.close()
+            results[name] = _summary(histogram, time.perf_counter() - start)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM call logging overhead benchmark")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    print(f"=== LLM call logging: {args.calls} calls ===")
+    results = run(args.calls)
+    print(f"{'mode':<16} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'drain ms':>9}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['mean_us']:>9} {result['p50_us']:>9} {result['p99_us']:>9} {result['drain_ms']:>9}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"calls": args.calls, "modes": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
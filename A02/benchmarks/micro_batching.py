@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Query embedding micro-batching benchmark
+Run with: python benchmarks/micro_batching.py --clients 50 --queries 10
+
+Each of N client threads embeds distinct questions back to back against a
+local stand-in embeddings API with fixed per-request latency, as concurrent
+/query requests do. Compares one request per question with
+EmbeddingMicroBatcher at several maximum waits, reporting throughput,
+latency, API requests and the mean batch size.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_llm_server import MockLLMServer
+from benchmarks.stats import summarize
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import ResilientCaller
+from src.embedding.embedder import EmbeddingGenerator
+from src.embedding.micro_batcher import EmbeddingMicroBatcher
+from src.monitoring.metrics import metrics
+
+
+def _run_clients(embed, clients: int, queries: int, label: str) -> Dict[str, Any]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def client(index: int):
+        local = []
+        for i in range(queries):
+            start = time.perf_counter()
+            embed(f"{label} client {index} question {i}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, clients * queries, time.perf_counter() - start)
+
+
+def run(clients: int, queries: int, latency: float, waits_ms: List[float], max_batch_size: int,
+        max_in_flight: int, max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with MockLLMServer(embedding_dimension=256, latency_seconds=latency) as mock:
+        client = build_openai_client(api_key="benchmark", base_url=mock.base_url, max_connections=clients)
+        caller = ResilientCaller("embeddings", max_concurrency=max_concurrency or max_in_flight)
+        embedder = EmbeddingGenerator("openai", client=client, caller=caller, batch_size=max_batch_size)
+
+        before = mock.request_count
+        results["unbatched"] = _run_clients(embedder.generate_embedding, clients, queries, "unbatched")
+        results["unbatched"]["api_requests"] = mock.request_count - before
+
+        for wait_ms in waits_ms:
+            metrics.reset()
+            batcher = EmbeddingMicroBatcher(embedder, max_batch_size=max_batch_size,
+                                            max_wait_seconds=wait_ms / 1000, max_in_flight=max_in_flight)
+            before = mock.request_count
+            name = f"batched wait={wait_ms:g}ms"
+            results[name] = _run_clients(batcher.embed, clients, queries, name)
+            batcher.close()
+            results[name]["api_requests"] = mock.request_count - before
+            results[name]["batch_sizes"] = metrics.value_summary()["embedding_batch_size"]
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query embedding micro-batching benchmark")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent query threads")
+    parser.add_argument("--queries", type=int, default=10, help="Questions per client")
+    parser.add_argument("--latency", type=float, default=0.02, help="Embeddings API latency (seconds)")
+    parser.add_argument("--waits-ms", type=float, nargs="+", default=[0, 2, 10])
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--in-flight", type=int, default=4, help="Concurrent embedding requests")
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    print(f"=== Query embeddings: {args.clients} clients x {args.queries} questions, "
+          f"{1000 * args.latency:g}ms API latency, {args.in_flight} requests in flight ===")
+    results = run(args.clients, args.queries, args.latency, args.waits_ms, args.max_batch_size, args.in_flight)
+    print(f"{'mode':<22} {'texts/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'requests':>9} {'mean batch':>11}")
+    for name, result in results.items():
+        batch = result.get("batch_sizes", {}).get("mean", 1.0)
+        print(f"{name:<22} {result['throughput_per_second']:>9.1f} {result['latency_ms']['p50']:>9.1f} "
+              f"{result['latency_ms']['p99']:>9.1f} {result['api_requests']:>9} {batch:>11}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# benchmarks/mock_llm_server.py
+"""
+Local stand-in for an OpenAI-compatible API.
+
+Serves /v1/chat/completions (including `stream: true` server-sent events)
+and /v1/embeddings with configurable injected latency and failures so
+benchmarks and tests run fully offline.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class MockLLMServer:
+    """OpenAI-compatible mock server running in a background thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_seconds: float = 0.0, jitter_seconds: float = 0.0,
+                 embedding_dimension: int = 1536, reply: str = "This is a mock answer.",
+                 fail_first: int = 0, fail_status: int = 503, token_latency_seconds: float = 0.0,
+                 tail_probability: float = 0.0, tail_latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.token_latency_seconds = token_latency_seconds
+        self.jitter_seconds = jitter_seconds
+        # Heavy tail: this fraction of requests waits tail_latency_seconds extra
+        self.tail_probability = tail_probability
+        self.tail_latency_seconds = tail_latency_seconds
+        self.embedding_dimension = embedding_dimension
+        self.reply = reply
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.request_count = 0
+        self.connection_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled_streams = 0  # streams the client disconnected from mid-generation
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _delay(self):
+        delay = self.latency_seconds
+        if self.jitter_seconds:
+            delay += random.uniform(0, self.jitter_seconds)
+        if self.tail_probability and random.random() < self.tail_probability:
+            delay += self.tail_latency_seconds
+        if delay > 0:
+            time.sleep(delay)
+
+    def _embedding(self, text: str) -> List[float]:
+        seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        return [rng.gauss(0, 1) for _ in range(self.embedding_dimension)]
+
+    def _chat_completion(self, payload: dict) -> dict:
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+        completion_tokens = len(self.reply.split())
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def _stream_chunks(self, payload: dict):
+        """OpenAI-style chat.completion.chunk events, one per reply word"""
+        words = self.reply.split(" ")
+        for i, word in enumerate(words):
+            yield {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get("model", "mock-model"),
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if i == 0 else " " + word},
+                    "finish_reason": "stop" if i == len(words) - 1 else None
+                }]
+            }
+
+    def _embeddings(self, payload: dict) -> dict:
+        inputs = payload.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        tokens = sum(len(text.split()) for text in inputs)
+        return {
+            "object": "list",
+            "model": payload.get("model", "mock-embedding"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": self._embedding(text)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connection_count += 1
+
+            def _send_chunk(self, data: bytes):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def _send_stream(self, payload: dict):
+                # Chunked transfer encoding keeps the connection reusable
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in server._stream_chunks(payload):
+                        if server.token_latency_seconds:
+                            time.sleep(server.token_latency_seconds)
+                        self._send_chunk(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+                    self._send_chunk(b"data: [DONE]\n\n")
+                    self._send_chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    with server._lock:
+                        server.cancelled_streams += 1
+                    self.close_connection = True
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.request_count += 1
+                    should_fail = server.request_count <= server.fail_first
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    server._delay()
+                    if should_fail:
+                        self._send_json(server.fail_status, {"error": {"message": "Injected failure"}})
+                    elif self.path.endswith("/chat/completions") and payload.get("stream"):
+                        self._send_stream(payload)
+                    elif self.path.endswith("/chat/completions"):
+                        self._send_json(200, server._chat_completion(payload))
+                    elif self.path.endswith("/embeddings"):
+                        self._send_json(200, server._embeddings(payload))
+                    else:
+                        self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        return Handler
+
+
+if __name__ == "__main__":
+    with MockLLMServer(port=8765, latency_seconds=0.05) as mock:
+        print(f"Mock LLM server listening on {mock.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
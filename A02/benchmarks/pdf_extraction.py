@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Page-parallel PDF extraction benchmark
+Run with: python benchmarks/pdf_extraction.py --pages 500
+
+Extracts one long synthetic PDF with 1, 2, 4, ... worker processes (up to
+the core count) and reports wall time and speedup over serial extraction.
+Worker pools are started before timing, so only extraction is measured.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run(pages: int, runs: int, max_workers: int, pages_per_task: int) -> Dict[str, Any]:
+    from src.document_loader.pdf_loader import AcademicPDFLoader
+
+    workdir = tempfile.mkdtemp(prefix="pdf_extraction_")
+    results: Dict[str, Any] = {}
+    try:
+        path = generate_corpus(workdir, num_documents=1, pages_per_document=pages)[0]
+        serial_seconds = None
+        for workers in worker_counts(max_workers):
+            loader = AcademicPDFLoader(workers=workers, pages_per_task=pages_per_task)
+            loader.cache = None  # measure parsing, not cache reads
+            try:
+                loader.load_document(path)  # warm-up: start the pool, import pypdf
+                timings = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    extracted = loader.load_document(path)
+                    timings.append(time.perf_counter() - start)
+            finally:
+                loader.close()
+            seconds = statistics.median(timings)
+            serial_seconds = serial_seconds or seconds
+            results[str(workers)] = {
+                "seconds": round(seconds, 4),
+                "pages_per_second": round(len(extracted) / seconds, 1),
+                "speedup": round(serial_seconds / seconds, 2),
+            }
+            print(f"{workers:>3} workers: {seconds:8.3f}s  {len(extracted) / seconds:8.1f} pages/s  "
+                  f"x{serial_seconds / seconds:.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Page-parallel PDF extraction benchmark")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    print(f"=== PDF extraction: {args.pages} pages, {os.cpu_count()} cores ===")
+    results = run(args.pages, args.runs, args.max_workers, args.pages_per_task)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpu_count": os.cpu_count(), "pages": args.pages, "workers": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
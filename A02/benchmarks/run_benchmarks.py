@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Academic RAG System
+Run with: python benchmarks/run_benchmarks.py run
+Compare:  python benchmarks/run_benchmarks.py compare baseline.json current.json
+
+Everything runs offline: embeddings use the dummy embedder and generation,
+including the end-to-end query stage, talks to a local mock OpenAI-compatible
+server. The mock starts before any client is built, and the configuration
+points the OpenAI provider at it whatever the environment says.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.mock_llm_server import MockLLMServer
+from benchmarks.stats import measure
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+EMBED_BATCH_SIZE = 64
+
+
+def _batches(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_suite(num_documents: int, pages_per_document: int, num_queries: int,
+              top_k: int, seed: int, llm_latency: float) -> Dict[str, Any]:
+    """Run every benchmark stage against a fresh synthetic corpus"""
+    from config import config
+
+    # Before any client or provider is built: the shared ones read this configuration once
+    mock = MockLLMServer(latency_seconds=llm_latency).start()
+    config.LLM_PROVIDER = "openai"
+    config.OPENAI_BASE_URL = mock.base_url
+    config.OPENAI_API_KEY = "benchmark-key"
+    config.EMBEDDING_PROVIDER = "dummy"
+
+    workdir = tempfile.mkdtemp(prefix="rag_benchmark_")
+    config.VECTOR_DB_PATH = os.path.join(workdir, "chroma_db")
+    config.COLLECTION_NAME = "benchmark_papers"
+    # Fresh extraction cache: the load stage measures cold PDF parsing
+    config.EXTRACTION_CACHE_DIR = os.path.join(workdir, "extraction_cache")
+
+    from src.document_loader.pdf_loader import AcademicPDFLoader
+    from src.document_loader.chunker import TextChunker
+    from src.embedding.embedder import EmbeddingGenerator
+    from src.vector_store.chroma_manager import ChromaDBManager
+    logging.getLogger().setLevel(logging.WARNING)
+
+    stages: Dict[str, Any] = {}
+    try:
+        paths = generate_corpus(os.path.join(workdir, "corpus"), num_documents,
+                                pages_per_document, seed=seed)
+        queries = generate_queries(num_queries, seed=seed)
+
+        loader = AcademicPDFLoader()
+        pages_by_doc: List[List[Dict[str, Any]]] = []
+
+        def load(path):
+            pages = loader.load_document(path)
+            pages_by_doc.append(pages)
+            return len(pages)
+        stages["load"] = measure(load, paths)
+
+        chunker = TextChunker(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+        chunks: List[Dict[str, Any]] = []
+
+        def chunk(pages):
+            doc_chunks = chunker.chunk_documents(pages)
+            chunks.extend(doc_chunks)
+            return len(doc_chunks)
+        stages["chunk"] = measure(chunk, pages_by_doc)
+
+        embedder = EmbeddingGenerator(model_type="dummy")
+        embeddings: List[List[float]] = []
+
+        def embed(batch):
+            embeddings.extend(embedder.generate_embeddings_batch([c['content'] for c in batch]))
+            return len(batch)
+        stages["embed"] = measure(embed, _batches(chunks, EMBED_BATCH_SIZE))
+
+        store = ChromaDBManager(config.VECTOR_DB_PATH, config.COLLECTION_NAME)
+        pairs = list(zip(chunks, embeddings))
+
+        def ingest(batch):
+            store.add_documents([c for c, _ in batch], [e for _, e in batch])
+            return len(batch)
+        stages["ingest"] = measure(ingest, _batches(pairs, EMBED_BATCH_SIZE))
+
+        def search(question):
+            store.search_similar(embedder.generate_embedding(question), top_k=top_k)
+            return 1
+        stages["search"] = measure(search, queries)
+
+        from fastapi.testclient import TestClient
+        from src.api.app import app
+        logging.getLogger().setLevel(logging.WARNING)
+        client = TestClient(app)
+
+        def query_e2e(question):
+            response = client.post("/query", json={"question": question, "top_k": top_k})
+            response.raise_for_status()
+            return 1
+        stages["query_e2e"] = measure(query_e2e, queries)
+
+        from src.clients.llm_providers import OpenAICompatibleProvider
+        from src.clients.openai_client import build_caller, build_openai_client
+        from src.retrieval.response_generator import ResponseGenerator
+        provider = OpenAICompatibleProvider("openai", config.LLM_MODEL,
+                                            build_openai_client(base_url=mock.base_url), build_caller("chat"))
+        generator = ResponseGenerator(config, provider=provider)
+        context_docs = chunks[:top_k]
+
+        def generate(question):
+            generator.generate_response(question, context_docs)
+            return 1
+        stages["generation"] = measure(generate, queries)
+    finally:
+        mock.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return stages
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float) -> List[str]:
+    """Return a description of every stage that regressed beyond `threshold`"""
+    regressions = []
+    for stage, base in baseline["stages"].items():
+        cur = current["stages"].get(stage)
+        if cur is None:
+            continue
+        base_p95 = base["latency_ms"]["p95"]
+        cur_p95 = cur["latency_ms"]["p95"]
+        if base_p95 > 0 and (cur_p95 - base_p95) / base_p95 > threshold:
+            regressions.append(f"{stage}: p95 latency {base_p95:.3f}ms -> {cur_p95:.3f}ms")
+        base_tput = base["throughput_per_second"]
+        cur_tput = cur["throughput_per_second"]
+        if base_tput > 0 and (base_tput - cur_tput) / base_tput > threshold:
+            regressions.append(f"{stage}: throughput {base_tput:.1f}/s -> {cur_tput:.1f}/s")
+    return regressions
+
+
+def print_stages(stages: Dict[str, Any]):
+    print(f"{'stage':<12} {'items/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'rss MB':>9}")
+    for name, result in stages.items():
+        latency = result["latency_ms"]
+        print(f"{name:<12} {result['throughput_per_second']:>12.1f} {latency['p50']:>10.3f} "
+              f"{latency['p95']:>10.3f} {latency['p99']:>10.3f} {result['peak_rss_mb']:>9.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Academic RAG System benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--documents", type=int, default=5)
+    run_parser.add_argument("--pages", type=int, default=20, help="Pages per document")
+    run_parser.add_argument("--queries", type=int, default=100)
+    run_parser.add_argument("--top-k", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--llm-latency", type=float, default=0.0,
+                            help="Injected mock LLM latency in seconds")
+    run_parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Allowed relative slowdown before flagging (default 0.10)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        if regressions:
+            print("Regressions detected:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("No regressions detected.")
+        return 0
+
+    print("=== Running RAG Benchmarks ===")
+    stages = run_suite(args.documents, args.pages, args.queries, args.top_k,
+                       args.seed, args.llm_latency)
+    result = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "parameters": {
+                "documents": args.documents,
+                "pages_per_document": args.pages,
+                "queries": args.queries,
+                "top_k": args.top_k,
+                "seed": args.seed,
+                "llm_latency_seconds": args.llm_latency,
+            },
+        },
+        "stages": stages,
+    }
+    print_stages(stages)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
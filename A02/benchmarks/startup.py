@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API server
+Run with: python benchmarks/startup.py --runs 5
+
+Measures, each in a fresh interpreter:
+  - import time of src.api.app and which heavy modules it pulls in
+  - time until uvicorn answers /health (process can take traffic)
+  - time until /ready succeeds (pipeline warmed up)
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("chromadb", "pypdf", "numpy", "openai")
+
+IMPORT_PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import src.api.app\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float) -> float:
+    """Poll `url` until it returns 200; return the time it first succeeded"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not become available")
+
+
+def measure_import(env) -> dict:
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_server(env, timeout: float = 60.0) -> dict:
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = start + timeout
+        healthy = _wait_for(f"http://127.0.0.1:{port}/health", deadline)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", deadline)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"health_seconds": healthy - start, "ready_seconds": ready - start}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rag_startup_")
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+
+    imports, servers = [], []
+    try:
+        for _ in range(args.runs):
+            imports.append(measure_import(env))
+            servers.append(measure_server(dict(env, VECTOR_DB_PATH=os.path.join(workdir, "chroma_db"))))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "runs": args.runs,
+        "import_seconds_median": round(statistics.median(i["seconds"] for i in imports), 4),
+        "heavy_modules_at_import": imports[-1]["loaded"],
+        "time_to_health_seconds_median": round(statistics.median(s["health_seconds"] for s in servers), 4),
+        "time_to_ready_seconds_median": round(statistics.median(s["ready_seconds"] for s in servers), 4),
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# benchmarks/stats.py
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies: List[float], items: int, wall_time: float) -> Dict[str, Any]:
+    """Summarize per-operation latencies (seconds) into a result record"""
+    ordered = sorted(latencies)
+    return {
+        "operations": len(ordered),
+        "items": items,
+        "wall_time_seconds": round(wall_time, 6),
+        "throughput_per_second": round(items / wall_time, 3) if wall_time > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(1000 * sum(ordered) / len(ordered), 4) if ordered else 0.0,
+            "p50": round(1000 * percentile(ordered, 50), 4),
+            "p95": round(1000 * percentile(ordered, 95), 4),
+            "p99": round(1000 * percentile(ordered, 99), 4),
+            "max": round(1000 * ordered[-1], 4) if ordered else 0.0,
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+    }
+
+
+def measure(operation: Callable[[Any], int], inputs: Iterable[Any]) -> Dict[str, Any]:
+    """Time `operation` once per input; the operation returns how many items it processed"""
+    latencies = []
+    items = 0
+    wall_start = time.perf_counter()
+    for value in inputs:
+        start = time.perf_counter()
+        items += operation(value)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, items, time.perf_counter() - wall_start)
@@ -16,17 +16,38 @@ class Config:
     # Document processing
     CHUNK_SIZE = 512
     CHUNK_OVERLAP = 50
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "1"))  # >1 extracts page ranges in parallel
+    PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))
+    EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(DATA_DIR, "extraction_cache"))
+    INGEST_PAGE_BATCH = int(os.getenv("INGEST_PAGE_BATCH", "32"))  # pages chunked and stored per step
+    # Near-duplicate chunks (running headers, boilerplate) are dropped before embedding
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # estimated Jaccard over word shingles
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+    DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "3"))
+    DEDUP_INDEX_DIR = os.getenv("DEDUP_INDEX_DIR")  # unset: "<VECTOR_DB_PATH>_dedup"
     
     # Embedding model
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "dummy")  # "dummy" or "openai"
     
     # Vector database
-    VECTOR_DB_PATH = os.path.join(BASE_DIR, "chroma_db")
+    VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", os.path.join(BASE_DIR, "chroma_db"))
     COLLECTION_NAME = "academic_papers"
+    # Two-stage retrieval: nearest document (or page) centroids first, then chunks within them
+    HIERARCHICAL_RETRIEVAL = os.getenv("HIERARCHICAL_RETRIEVAL", "false").lower() == "true"
+    # Maintained at ingest; off by default unless two-stage retrieval uses them
+    CENTROIDS_ENABLED = os.getenv("CENTROIDS_ENABLED", str(HIERARCHICAL_RETRIEVAL)).lower() == "true"
+    HIERARCHICAL_LEVEL = os.getenv("HIERARCHICAL_LEVEL", "document")  # "document" or "page"
+    HIERARCHICAL_TOP_DOCUMENTS = int(os.getenv("HIERARCHICAL_TOP_DOCUMENTS", "8"))
+    HIERARCHICAL_TOP_PAGES = int(os.getenv("HIERARCHICAL_TOP_PAGES", "32"))
+    HIERARCHICAL_MIN_DOCUMENTS = int(os.getenv("HIERARCHICAL_MIN_DOCUMENTS", "20"))  # smaller corpora search flat
     
     # API settings
-    API_HOST = "0.0.0.0"
-    API_PORT = 8000
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("API_PORT", "8000"))
     
     # LLM settings - Now using environment variables
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -34,6 +55,75 @@ class Config:
     
     # Performance settings
     MAX_RETRIEVAL_DOCS = 5
+    WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
     TEMPERATURE = 0.1  # Lower temperature for more consistent academic responses
+    
+    # LLM client pooling and resilience
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # unset: api.openai.com
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    OPENAI_RPM = float(os.getenv("OPENAI_RPM", "3000"))
+    OPENAI_TPM = float(os.getenv("OPENAI_TPM", "1000000"))
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", "30"))
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))  # batches in flight during ingest
+    # Query embeddings from concurrent requests are coalesced into batched calls
+    EMBEDDING_MICROBATCH_ENABLED = os.getenv("EMBEDDING_MICROBATCH_ENABLED", "true").lower() == "true"
+    EMBEDDING_MICROBATCH_MAX_SIZE = int(os.getenv("EMBEDDING_MICROBATCH_MAX_SIZE", "32"))
+    EMBEDDING_MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MICROBATCH_MAX_WAIT_MS", "2"))  # 0: no waiting
+    EMBEDDING_MICROBATCH_IN_FLIGHT = int(os.getenv("EMBEDDING_MICROBATCH_IN_FLIGHT", "4"))
+    
+    # Answer generation provider: "openai" or "local" (OpenAI-compatible server
+    # such as Ollama at http://localhost:11434/v1 or LM Studio at http://localhost:1234/v1)
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+    LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:11434/v1")
+    LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "gemma2:2b")
+    LOCAL_LLM_API_KEY = os.getenv("LOCAL_LLM_API_KEY", "local")  # ignored by Ollama / LM Studio
+    LOCAL_LLM_CONCURRENCY = int(os.getenv("LOCAL_LLM_CONCURRENCY", "2"))  # generations in flight
+    LOCAL_LLM_TIMEOUT_SECONDS = float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "120"))  # first call may load the model
+    LOCAL_LLM_MAX_RETRIES = int(os.getenv("LOCAL_LLM_MAX_RETRIES", "1"))
+    
+    # Other OpenAI-compatible cloud endpoints, usable as pool members
+    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+    ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com/v1/")
+    ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-5-haiku-latest")
+    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    
+    # Provider pool (LLM_PROVIDER=pool): latency-aware routing with hedged requests
+    LLM_POOL_PROVIDERS = [p.strip() for p in os.getenv("LLM_POOL_PROVIDERS", "openai,anthropic,gemini,local").split(",") if p.strip()]
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))  # of the primary's recent latency
+    LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.05"))
+    LLM_HEDGE_INITIAL_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_INITIAL_DELAY_SECONDS", "2.0"))  # until warmed up
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_ROUTING_WINDOW = int(os.getenv("LLM_ROUTING_WINDOW", "200"))  # recent calls per provider
+    
+    # Multi-process serving
+    API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+    CHROMA_SERVER_HOST = os.getenv("CHROMA_SERVER_HOST")  # unset: embedded PersistentClient
+    CHROMA_SERVER_PORT = int(os.getenv("CHROMA_SERVER_PORT", "8001"))
+    INGEST_MODE = os.getenv("INGEST_MODE", "inline")  # "inline" or "queue" (single writer process)
+    INGEST_QUEUE_DIR = os.getenv("INGEST_QUEUE_DIR", os.path.join(DATA_DIR, "ingest_queue"))
+    INDEX_VERSION_FILE = os.path.join(INGEST_QUEUE_DIR, "index_version")
+    
+    # Tracing
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")  # "jsonl" or "otlp"
+    TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(BASE_DIR, "logs", "traces.jsonl"))
+    OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    
+    # LLM call logging
+    LLM_LOG_ENABLED = os.getenv("LLM_LOG_ENABLED", "false").lower() == "true"
+    LLM_LOG_FILE = os.getenv("LLM_LOG_FILE", os.path.join(BASE_DIR, "logs", "llm_calls.jsonl"))
+    LLM_LOG_MAX_BYTES = int(os.getenv("LLM_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LLM_LOG_BACKUP_COUNT = int(os.getenv("LLM_LOG_BACKUP_COUNT", "5"))
+    LLM_LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LLM_LOG_PAYLOAD_SAMPLE_RATE", "0.01"))  # calls logged with payloads
+    LLM_LOG_MAX_PAYLOAD_CHARS = int(os.getenv("LLM_LOG_MAX_PAYLOAD_CHARS", "2000"))
 
 config = Config()
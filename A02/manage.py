@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the Academic RAG System
+Bulk import: python manage.py bulk-import chunks.jsonl --batch-size 5000
+Snapshots:   python manage.py export snapshots/papers
+             python manage.py import snapshots/papers
+Centroids:   python manage.py build-centroids
+Dedup index: python manage.py rebuild-dedup
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import config
+
+
+def open_store(collection: str):
+    from src.vector_store.chroma_manager import ChromaDBManager
+    return ChromaDBManager(
+        db_path=config.VECTOR_DB_PATH,
+        collection_name=collection,
+        server_host=config.CHROMA_SERVER_HOST,
+        server_port=config.CHROMA_SERVER_PORT
+    )
+
+
+def cmd_bulk_import(args) -> int:
+    from src.embedding.embedder import EmbeddingGenerator
+    from src.vector_store.bulk_import import bulk_import
+
+    store = open_store(args.collection)
+    # Only rows without a precomputed vector are embedded
+    embedder = None if args.require_embeddings else EmbeddingGenerator(model_type=config.EMBEDDING_PROVIDER)
+
+    def report(stats):
+        print(f"\r{stats.rows:>12,} rows  {stats.rows_per_second:>10,.0f} rows/s  "
+              f"{stats.embedded:>10,} embedded  {stats.skipped:>8,} skipped", end="", flush=True)
+
+    for path in args.paths:
+        print(f"Importing {path} into '{args.collection}'")
+        stats = bulk_import(store, path, batch_size=args.batch_size, embedder=embedder, progress=report)
+        print(f"\nDone: {stats.rows:,} rows in {stats.seconds:.1f}s ({stats.rows_per_second:,.0f} rows/s)")
+    print(f"Collection now holds {store.get_collection_info():,} records")
+    return 0
+
+
+def cmd_export(args) -> int:
+    from src.vector_store.snapshot import export_snapshot
+
+    store = open_store(args.collection)
+    start = time.perf_counter()
+    manifest = export_snapshot(store, args.snapshot_dir, batch_size=args.batch_size)
+    print(f"Exported {manifest['count']:,} records ({manifest['dimension']} dims) "
+          f"to {args.snapshot_dir} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def cmd_import(args) -> int:
+    from src.vector_store.snapshot import import_snapshot, read_manifest
+
+    collection = args.collection or read_manifest(args.snapshot_dir)["collection"]
+    store = open_store(collection)
+
+    def report(restored, seconds):
+        print(f"\r{restored:>12,} records  {restored / seconds if seconds else 0:>10,.0f} records/s",
+              end="", flush=True)
+
+    result = import_snapshot(store, args.snapshot_dir, batch_size=args.batch_size,
+                             verify=not args.no_verify, progress=report)
+    print(f"\nImported {result['count']:,} records into '{collection}' in {result['seconds']:.1f}s")
+    return 0
+
+
+def cmd_build_centroids(args) -> int:
+    from src.vector_store.centroids import CentroidIndex
+
+    store = open_store(args.collection)
+    start = time.perf_counter()
+    result = CentroidIndex(store).rebuild(batch_size=args.batch_size)
+    print(f"Built {result['documents']:,} document and {result['pages']:,} page centroids "
+          f"from {result['chunks']:,} chunks in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def cmd_rebuild_dedup(args) -> int:
+    from src.document_loader.dedup import open_dedup_index
+
+    store = open_store(args.collection)
+    start = time.perf_counter()
+    result = open_dedup_index(config, str(store.collection.id)).rebuild(store, batch_size=args.batch_size)
+    print(f"Signed {result['chunks']:,} chunks from {result['sources']:,} sources "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Academic RAG System maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "bulk-import", help="Stream pre-chunked JSONL/Parquet rows into the vector store")
+    import_parser.add_argument("paths", nargs="+", help=".jsonl/.ndjson or .parquet files")
+    import_parser.add_argument("--batch-size", type=int, default=5000, help="Rows per write")
+    import_parser.add_argument("--collection", default=config.COLLECTION_NAME)
+    import_parser.add_argument("--require-embeddings", action="store_true",
+                               help="Fail on rows without an embedding instead of embedding them")
+    import_parser.set_defaults(func=cmd_bulk_import)
+
+    export_parser = subparsers.add_parser("export", help="Write a collection snapshot")
+    export_parser.add_argument("snapshot_dir")
+    export_parser.add_argument("--collection", default=config.COLLECTION_NAME)
+    export_parser.add_argument("--batch-size", type=int, default=5000)
+    export_parser.set_defaults(func=cmd_export)
+
+    restore_parser = subparsers.add_parser("import", help="Restore a collection snapshot")
+    restore_parser.add_argument("snapshot_dir")
+    restore_parser.add_argument("--collection", help="Target collection (default: the snapshot's)")
+    restore_parser.add_argument("--batch-size", type=int, default=5000)
+    restore_parser.add_argument("--no-verify", action="store_true", help="Skip checksum verification")
+    restore_parser.set_defaults(func=cmd_import)
+
+    centroid_parser = subparsers.add_parser(
+        "build-centroids", help="Recompute document and page centroids from the stored chunks")
+    centroid_parser.add_argument("--collection", default=config.COLLECTION_NAME)
+    centroid_parser.add_argument("--batch-size", type=int, default=5000)
+    centroid_parser.set_defaults(func=cmd_build_centroids)
+
+    dedup_parser = subparsers.add_parser(
+        "rebuild-dedup", help="Rebuild the near-duplicate index from the stored chunks")
+    dedup_parser.add_argument("--collection", default=config.COLLECTION_NAME)
+    dedup_parser.add_argument("--batch-size", type=int, default=5000)
+    dedup_parser.set_defaults(func=cmd_rebuild_dedup)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
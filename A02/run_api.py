@@ -2,7 +2,9 @@
 """
 FastAPI Server for Academic RAG System
 Run with: python run_api.py
+Multi-process: python run_api.py --workers 4
 """
+import argparse
 import uvicorn
 import os
 import sys
@@ -10,22 +12,35 @@ import sys
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.api.app import app
 from config import config
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Academic RAG API server")
+    parser.add_argument("--workers", type=int, default=config.API_WORKERS,
+                        help="Number of query worker processes (default: API_WORKERS or 1)")
+    args = parser.parse_args()
+
     print("=== Starting Academic RAG API Server ===")
     print(f"API will be available at: http://{config.API_HOST}:{config.API_PORT}")
     print("Endpoints:")
     print("    - GET /health : Health check")
+    print("    - GET /ready : Readiness check (pipeline warmed up)")
     print("    - GET /status : System status") 
+    print("    - GET /metrics : Prometheus metrics")
     print("    - POST /query : Query the RAG system")
     print("    - POST /ingest : Upload and ingest PDF document")
     print("\nPress Ctrl+C to stop the server")
 
-    uvicorn.run(
-        app,
-        host=config.API_HOST,
-        port=config.API_PORT
-        # Remove reload=True for now to avoid warning
-    )
\ No newline at end of file
+    if args.workers > 1:
+        # Shared Chroma server + single ingest writer + N read-only query workers
+        from src.serving.supervisor import serve_multiprocess
+        print(f"Serving with {args.workers} query workers and one ingest writer")
+        serve_multiprocess(args.workers)
+    else:
+        from src.api.app import app
+        uvicorn.run(
+            app,
+            host=config.API_HOST,
+            port=config.API_PORT
+            # Remove reload=True for now to avoid warning
+        )
@@ -1,27 +1,84 @@
 # src/api/app.py
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional
+import asyncio
 import os
 import sys
+import json
 import logging
+import threading
+import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from config import config
 from src.main import RAGPipeline
+from src.document_loader.dedup import DedupReport
+from src.vector_store.filters import build_where_clause
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer, exporter_from_config
+from src.monitoring.llm_logging import llm_call_log
+from src.serving.ingest_queue import IngestQueue
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The RAG pipeline opens the vector store, so it is built lazily (or by the
+# startup warmup thread) rather than at import time
+_pipeline: Optional[RAGPipeline] = None
+_pipeline_lock = threading.Lock()
+_warmup_state: Dict[str, Any] = {"status": "not_started", "error": None, "seconds": None}
+
+def get_pipeline() -> RAGPipeline:
+    """Return the shared RAG pipeline, building it on first use"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = RAGPipeline()
+    return _pipeline
+
+# In queue mode this process is a read-only query worker and uploads are
+# handed to the single ingest writer process
+ingest_queue = IngestQueue(config.INGEST_QUEUE_DIR) if config.INGEST_MODE == "queue" else None
+
+def warmup_pipeline():
+    """Build the pipeline and exercise its heavy dependencies once"""
+    _warmup_state["status"] = "warming"
+    start = time.perf_counter()
+    try:
+        get_pipeline().warmup()
+        _warmup_state["seconds"] = round(time.perf_counter() - start, 3)
+        _warmup_state["status"] = "ready"
+        logger.info(f"Pipeline warm after {_warmup_state['seconds']}s")
+    except Exception as e:
+        _warmup_state["error"] = str(e)
+        _warmup_state["status"] = "failed"
+        logger.error(f"Pipeline warmup failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start warmup in the background so the server binds immediately"""
+    if config.WARMUP_ON_STARTUP:
+        threading.Thread(target=warmup_pipeline, name="pipeline-warmup", daemon=True).start()
+    else:
+        _warmup_state["status"] = "disabled"
+    yield
+    tracer.flush()
+    llm_call_log.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Academic RAG System",
     description="Retrieval-Augmented Generation system for academic papers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow frontend applications
@@ -33,13 +90,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize RAG pipeline
-rag_pipeline = RAGPipeline()
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Open the root span of each request and return its traceparent"""
+    with tracer.start_span(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            response.headers["traceparent"] = span.traceparent
+        return response
+
+# Configure request tracing
+tracer.configure(exporter_from_config(config), sample_rate=config.TRACE_SAMPLE_RATE)
+llm_call_log.configure_from_config(config)
 
 # Pydantic models for request/response validation
+class QueryFilters(BaseModel):
+    source: Optional[str] = None
+    page_min: Optional[int] = None
+    page_max: Optional[int] = None
+    metadata: Optional[Dict[str, Any]] = None
+
 class QueryRequest(BaseModel):
     question: str
     top_k: int = 5
+    filters: Optional[QueryFilters] = None
 
 class DocumentResponse(BaseModel):
     content: str
@@ -56,10 +135,13 @@ class IngestResponse(BaseModel):
     status: str
     message: str
     document_count: int
+    job_id: Optional[str] = None
+    deduplication: Optional[Dict[str, Any]] = None
 
 class SystemStatus(BaseModel):
     status: str
     vector_store: Dict[str, Any]
+    performance: Dict[str, Any] = {}
     config: Dict[str, Any]
 
 # API endpoints
@@ -71,8 +153,11 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "status": "/status",
+            "metrics": "/metrics",
             "query": "/query (POST)",
+            "query_stream": "/query/stream (POST, server-sent events)",
             "ingest": "/ingest (POST)"
         }
     }
@@ -82,47 +167,114 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "Academic RAG API"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: succeeds once the pipeline has finished warming up"""
+    state = _warmup_state["status"]
+    if state in ("ready", "disabled"):
+        return {"status": "ready", "warmup_seconds": _warmup_state["seconds"]}
+    return JSONResponse(
+        status_code=503,
+        content={"status": state, "error": _warmup_state["error"]}
+    )
+
 @app.get("/status", response_model=SystemStatus)
 async def get_system_status():
     """Get system status and statistics"""
     try:
-        status = rag_pipeline.get_system_status()
+        status = get_pipeline().get_system_status()
         return status
     except Exception as e:
         logger.error(f"Error getting system status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-stage latency histograms and counters in Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.post("/query", response_model=QueryResponse)
 async def query_documents(request: QueryRequest):
     """Query the RAG system with a question"""
     try:
         logger.info(f"Received query: {request.question}")
         
-        # Get relevant documents
-        result = rag_pipeline.query(request.question, top_k=request.top_k)
+        filters = None
+        if request.filters is not None:
+            filters = request.filters.model_dump(exclude_none=True)
+            try:
+                build_where_clause(**filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
         
-        # For now, we'll just return the retrieved documents
-        # In the next step, we'll add LLM to generate actual answers
-        answer = f"Found {result['document_count']} relevant documents. This is a placeholder response."
+        # Retrieve relevant documents and generate the answer. The pipeline
+        # blocks, so it runs on a worker thread and concurrent queries overlap
+        # (their query embeddings are then batched together)
+        result = await asyncio.to_thread(get_pipeline().query, request.question,
+                                         top_k=request.top_k, filters=filters)
+        if "error" in result:
+            raise HTTPException(status_code=500, detail=result["error"])
         
         return QueryResponse(
             question=request.question,
-            answer=answer,
+            answer=result['answer'],
             relevant_documents=result['relevant_documents'],
             document_count=result['document_count']
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing query: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+@app.post("/query/stream")
+async def query_documents_stream(request: QueryRequest):
+    """Query the RAG system, streaming the answer as server-sent events.
+    
+    The first event carries the retrieved documents, then one event per
+    generated text delta, then `data: [DONE]`.
+    """
+    filters = None
+    if request.filters is not None:
+        filters = request.filters.model_dump(exclude_none=True)
+        try:
+            build_where_clause(**filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        documents, answer = await asyncio.to_thread(get_pipeline().stream_query, request.question,
+                                                    top_k=request.top_k, filters=filters)
+    except Exception as e:
+        logger.error(f"Error processing query: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def events():
+        yield _sse_event({"type": "documents", "document_count": len(documents),
+                          "relevant_documents": documents})
+        for delta in answer:
+            yield _sse_event({"type": "delta", "text": delta})
+        yield "data: [DONE]\n\n"
+    
+    # A sync iterator is consumed in the threadpool, so generation never blocks the event loop
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
 @app.post("/ingest", response_model=IngestResponse)
 async def ingest_document(file: UploadFile = File(...)):
-    """Ingest a PDF document into the system"""
+    """Ingest a document (PDF, Markdown, LaTeX, HTML or JSONL) into the system"""
     try:
-        # Check if file is PDF
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+        # Check a loader is registered for the file type
+        loader = get_pipeline().loader
+        if not loader.supports(file.filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file type. Supported: {', '.join(loader.supported_formats)}"
+            )
         
         # Create temporary file path
         temp_dir = "data/raw"
@@ -136,15 +288,27 @@ async def ingest_document(file: UploadFile = File(...)):
         
         logger.info(f"Saved uploaded file to: {temp_path}")
         
+        if ingest_queue is not None:
+            job_id = ingest_queue.enqueue(temp_path)
+            status = get_pipeline().get_system_status()
+            return IngestResponse(
+                status="queued",
+                message=f"Document '{file.filename}' queued for ingestion",
+                document_count=status['vector_store']['document_count'],
+                job_id=job_id
+            )
+        
         # Ingest document
-        success = rag_pipeline.ingest_document(temp_path)
+        report = DedupReport(temp_path)
+        success = get_pipeline().ingest_document(temp_path, report)
         
         if success:
-            status = rag_pipeline.get_system_status()
+            status = get_pipeline().get_system_status()
             return IngestResponse(
                 status="success",
                 message=f"Document '{file.filename}' ingested successfully",
-                document_count=status['vector_store']['document_count']
+                document_count=status['vector_store']['document_count'],
+                deduplication=report.to_dict() if config.DEDUP_ENABLED else None
             )
         else:
             raise HTTPException(status_code=500, detail="Failed to ingest document")
@@ -162,14 +326,31 @@ async def ingest_document_by_path(file_path: str):
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found")
         
-        success = rag_pipeline.ingest_document(file_path)
+        loader = get_pipeline().loader
+        if not loader.supports(file_path):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file type. Supported: {', '.join(loader.supported_formats)}"
+            )
+        
+        if ingest_queue is not None:
+            job_id = ingest_queue.enqueue(file_path)
+            return {
+                "status": "queued",
+                "message": f"Document '{file_path}' queued for ingestion",
+                "job_id": job_id
+            }
+        
+        report = DedupReport(file_path)
+        success = get_pipeline().ingest_document(file_path, report)
         
         if success:
-            status = rag_pipeline.get_system_status()
+            status = get_pipeline().get_system_status()
             return {
                 "status": "success",
                 "message": f"Document '{file_path}' ingested successfully",
-                "document_count": status['vector_store']['document_count']
+                "document_count": status['vector_store']['document_count'],
+                "deduplication": report.to_dict() if config.DEDUP_ENABLED else None
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to ingest document")
@@ -180,6 +361,16 @@ async def ingest_document_by_path(file_path: str):
         logger.error(f"Error ingesting document: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ingest/jobs/{job_id}")
+async def get_ingest_job(job_id: str):
+    """Status of a queued ingest job (queue mode only)"""
+    if ingest_queue is None:
+        raise HTTPException(status_code=404, detail="Ingest queue is not enabled")
+    job = ingest_queue.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=config.API_HOST, port=config.API_PORT)
@@ -0,0 +1,225 @@
+# src/clients/llm_providers.py
+"""
+Chat completion providers behind one interface.
+
+`ResponseGenerator` talks to an `LLMProvider` instead of the OpenAI SDK, so
+answers can come from api.openai.com or from an OpenAI-compatible server on
+the same machine (Ollama serves one at http://localhost:11434/v1, LM Studio
+at http://localhost:1234/v1). Each provider owns a keep-alive connection
+pool and a `ResilientCaller`, and can cap the generations it runs at once.
+"""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config import config
+from src.clients.openai_client import build_openai_client, get_caller, get_openai_client
+from src.clients.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+from src.monitoring.llm_logging import llm_call_log
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()  # building a pool builds its members
+_providers: Dict[str, "LLMProvider"] = {}
+
+PROVIDER_KINDS = ("openai", "local", "anthropic", "gemini", "pool")
+
+
+class ChatResult:
+    """Text and token usage of one chat completion"""
+
+    def __init__(self, text: str, model: str, provider: str,
+                 prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+        self.text = text
+        self.model = model
+        self.provider = provider
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class LLMProvider(ABC):
+    """Interface for chat completion backends"""
+
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+                 tokens: int = 0, kind: str = "chat") -> ChatResult:
+        """Run one chat completion and return the full answer"""
+
+    @abstractmethod
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+               tokens: int = 0, kind: str = "chat",
+               on_open: Optional[Callable[[Any], None]] = None) -> Iterator[str]:
+        """Run one chat completion, yielding answer text as it is generated.
+
+        `on_open`, if given, receives the open response (anything with
+        `close()`) as soon as the request is accepted, so another thread can
+        abandon the stream before its first token.
+        """
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for any server speaking the OpenAI chat completions API.
+
+    `max_concurrency` bounds generations in flight, including streams still
+    being consumed; the caller's own semaphore only covers opening a request.
+    """
+
+    def __init__(self, name: str, model: str, client, caller: ResilientCaller,
+                 max_concurrency: Optional[int] = None):
+        self.name = name
+        self.model = model
+        self.client = client
+        self.caller = caller
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    @contextmanager
+    def _slot(self):
+        if self.slots is None:
+            yield
+            return
+        with self.slots:
+            yield
+
+    def _create(self, messages, temperature, max_tokens, tokens, **kwargs):
+        return self.caller.call(
+            self.client.chat.completions.create,
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tokens=tokens,
+            **kwargs
+        )
+
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+                 tokens: int = 0, kind: str = "chat") -> ChatResult:
+        start = time.perf_counter()
+        try:
+            with self._slot():
+                response = self._create(messages, temperature, max_tokens, tokens)
+        except Exception as e:
+            llm_call_log.log_call(kind, self.model, time.perf_counter() - start, request=messages, error=e,
+                                  provider=self.name)
+            raise
+        usage = getattr(response, "usage", None)
+        result = ChatResult(
+            response.choices[0].message.content, self.model, self.name,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None)
+        )
+        llm_call_log.log_call(
+            kind, self.model, time.perf_counter() - start,
+            prompt_tokens=result.prompt_tokens, completion_tokens=result.completion_tokens,
+            request=messages, response=result.text, provider=self.name
+        )
+        return result
+
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+               tokens: int = 0, kind: str = "chat",
+               on_open: Optional[Callable[[Any], None]] = None) -> Iterator[str]:
+        start = time.perf_counter()
+        parts: List[str] = []
+        first_token_seconds = None
+        error: Optional[BaseException] = None
+        try:
+            with self._slot():
+                # Retries cover opening the stream; a stream that fails midway is not replayed
+                response = self._create(messages, temperature, max_tokens, tokens, stream=True)
+                try:
+                    if on_open is not None:
+                        on_open(response)
+                    for chunk in response:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            if first_token_seconds is None:
+                                first_token_seconds = time.perf_counter() - start
+                            parts.append(delta)
+                            yield delta
+                finally:
+                    response.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            fields = {"provider": self.name, "stream": True}
+            if first_token_seconds is not None:
+                fields["first_token_ms"] = round(first_token_seconds * 1000, 3)
+            llm_call_log.log_call(kind, self.model, time.perf_counter() - start, request=messages,
+                                  response="".join(parts), error=error, **fields)
+
+
+def build_provider(kind: Optional[str] = None) -> LLMProvider:
+    """Create the provider named by `kind` (default: config.LLM_PROVIDER)"""
+    kind = kind or config.LLM_PROVIDER
+    if kind == "openai":
+        return OpenAICompatibleProvider("openai", config.LLM_MODEL, get_openai_client(), get_caller("chat"))
+    if kind == "local":
+        # One pooled connection per generation slot; no RPM/TPM budget on-box
+        client = build_openai_client(api_key=config.LOCAL_LLM_API_KEY, base_url=config.LOCAL_LLM_BASE_URL,
+                                     max_connections=config.LOCAL_LLM_CONCURRENCY,
+                                     timeout=config.LOCAL_LLM_TIMEOUT_SECONDS)
+        caller = ResilientCaller(
+            "local_chat",
+            max_concurrency=config.LOCAL_LLM_CONCURRENCY,
+            retry_policy=RetryPolicy(max_retries=config.LOCAL_LLM_MAX_RETRIES),
+            circuit_breaker=CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD,
+                                           config.CIRCUIT_BREAKER_RESET_SECONDS)
+        )
+        return OpenAICompatibleProvider("local", config.LOCAL_LLM_MODEL, client, caller,
+                                        max_concurrency=config.LOCAL_LLM_CONCURRENCY)
+    if kind in ("anthropic", "gemini"):
+        prefix = kind.upper()
+        client = build_openai_client(api_key=getattr(config, f"{prefix}_API_KEY"),
+                                     base_url=getattr(config, f"{prefix}_BASE_URL"))
+        caller = ResilientCaller(
+            f"{kind}_chat",
+            max_concurrency=config.LLM_MAX_CONCURRENCY,
+            retry_policy=RetryPolicy(max_retries=config.LLM_MAX_RETRIES),
+            circuit_breaker=CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD,
+                                           config.CIRCUIT_BREAKER_RESET_SECONDS)
+        )
+        return OpenAICompatibleProvider(kind, getattr(config, f"{prefix}_MODEL"), client, caller)
+    if kind == "pool":
+        from src.clients.provider_pool import ProviderPool  # the pool module imports this one
+
+        members = [get_provider(member) for member in config.LLM_POOL_PROVIDERS if provider_configured(member)]
+        return ProviderPool(
+            members,
+            hedging=config.LLM_HEDGE_ENABLED,
+            hedge_percentile=config.LLM_HEDGE_PERCENTILE,
+            min_hedge_delay=config.LLM_HEDGE_MIN_DELAY_SECONDS,
+            initial_hedge_delay=config.LLM_HEDGE_INITIAL_DELAY_SECONDS,
+            min_samples=config.LLM_HEDGE_MIN_SAMPLES,
+            window=config.LLM_ROUTING_WINDOW
+        )
+    raise ValueError(f"Unknown LLM provider '{kind}'; expected one of {', '.join(PROVIDER_KINDS)}")
+
+
+def get_provider(kind: Optional[str] = None) -> LLMProvider:
+    """Shared provider per kind"""
+    kind = kind or config.LLM_PROVIDER
+    provider = _providers.get(kind)
+    if provider is None:
+        with _lock:
+            provider = _providers.get(kind)
+            if provider is None:
+                provider = _providers[kind] = build_provider(kind)
+    return provider
+
+
+def provider_configured(kind: Optional[str] = None) -> bool:
+    """Whether answers can be generated: a local endpoint needs no API key"""
+    kind = kind or config.LLM_PROVIDER
+    if kind == "pool":
+        return any(provider_configured(member) for member in config.LLM_POOL_PROVIDERS if member != "pool")
+    if kind == "local":
+        return True
+    return kind in PROVIDER_KINDS and bool(getattr(config, f"{kind.upper()}_API_KEY"))
@@ -0,0 +1,114 @@
+# src/clients/openai_client.py
+import threading
+from typing import Dict, Optional
+
+from config import config
+from src.clients.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+
+_lock = threading.Lock()
+_client = None
+_callers: Dict[str, ResilientCaller] = {}
+
+
+def build_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                        max_connections: Optional[int] = None, timeout: Optional[float] = None):
+    """Create an OpenAI client backed by a keep-alive connection pool.
+
+    The SDK's own retries are disabled; retries, backoff and rate limiting
+    are handled by `ResilientCaller` so they are applied consistently.
+    """
+    import httpx
+    from openai import OpenAI  # deferred: the openai SDK is slow to import
+
+    max_connections = max_connections or config.LLM_MAX_CONNECTIONS
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections,
+                            keepalive_expiry=30.0),
+        timeout=httpx.Timeout(timeout or config.LLM_TIMEOUT_SECONDS, connect=5.0)
+    )
+    return OpenAI(
+        api_key=api_key or config.OPENAI_API_KEY,
+        base_url=base_url or config.OPENAI_BASE_URL,
+        http_client=http_client,
+        max_retries=0
+    )
+
+
+def build_async_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                              max_connections: Optional[int] = None, timeout: Optional[float] = None):
+    """Create an AsyncOpenAI client with its own keep-alive pool.
+
+    Async connections belong to the event loop that opened them, so callers
+    create one per loop and close it when the loop's work is done.
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    max_connections = max_connections or config.LLM_MAX_CONNECTIONS
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections,
+                            keepalive_expiry=30.0),
+        timeout=httpx.Timeout(timeout or config.LLM_TIMEOUT_SECONDS, connect=5.0)
+    )
+    return AsyncOpenAI(
+        api_key=api_key or config.OPENAI_API_KEY,
+        base_url=base_url or config.OPENAI_BASE_URL,
+        http_client=http_client,
+        max_retries=0
+    )
+
+
+def run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run directly, or a helper thread when the calling thread
+    already runs an event loop (e.g. a FastAPI endpoint).
+    """
+    import asyncio
+    import concurrent.futures
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def get_openai_client():
+    """Process-wide OpenAI client shared by the embedder and response generator"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = build_openai_client()
+    return _client
+
+
+def build_caller(name: str) -> ResilientCaller:
+    """Create a caller using the configured concurrency, rate limits and retry policy"""
+    return ResilientCaller(
+        name,
+        max_concurrency=config.LLM_MAX_CONCURRENCY,
+        requests_per_minute=config.OPENAI_RPM,
+        tokens_per_minute=config.OPENAI_TPM,
+        retry_policy=RetryPolicy(max_retries=config.LLM_MAX_RETRIES),
+        circuit_breaker=CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD,
+                                       config.CIRCUIT_BREAKER_RESET_SECONDS)
+    )
+
+
+def get_caller(name: str) -> ResilientCaller:
+    """Shared caller per endpoint kind (e.g. "embeddings", "chat")"""
+    caller = _callers.get(name)
+    if caller is None:
+        with _lock:
+            caller = _callers.setdefault(name, build_caller(name))
+    return caller
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for TPM budgeting"""
+    return max(1, len(text) // 4)
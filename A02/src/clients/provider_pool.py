@@ -0,0 +1,288 @@
+# src/clients/provider_pool.py
+"""
+Latency-aware routing and hedged requests across several LLM providers.
+
+`ProviderPool` is itself an `LLMProvider`. Each call goes first to the
+member with the lowest recent latency. If that member has not answered
+within its own recent `hedge_percentile` latency, the same request is sent
+to the next member, and whichever answers first is used. Attempts run as
+streams on worker threads. Cancelling the loser closes its open response,
+even before the first token, so its connection is closed rather than
+returned to the pool. The server only notices on its next write; servers
+that check for disconnects then stop generating, others run to completion
+unseen.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.clients.llm_providers import ChatResult, LLMProvider
+from src.clients.resilience import CircuitBreaker
+from src.monitoring.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DELTA, DONE, ERROR = "delta", "done", "error"
+
+
+class ProviderStats:
+    """Sliding window of one provider's recent latencies, plus a decaying failure rate"""
+
+    def __init__(self, window: int = 200, failure_alpha: float = 0.2):
+        self.latencies: deque = deque(maxlen=window)
+        self.failure_rate = 0.0
+        self.failure_alpha = failure_alpha
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.failure_rate *= 1 - self.failure_alpha
+
+    def record_cancelled(self, seconds: float):
+        """Record an attempt cancelled after `seconds` without an answer.
+
+        Its latency is only known to exceed that, so the sample is raised to
+        the current median: a cancelled attempt never makes a provider look
+        faster. It is not a success, so the failure rate is left alone.
+        """
+        floor = self.percentile(50)
+        with self._lock:
+            self.latencies.append(max(seconds, floor))
+
+    def record_failure(self):
+        with self._lock:
+            self.failure_rate += self.failure_alpha * (1 - self.failure_rate)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, pct: float) -> float:
+        """Latency (seconds) at `pct` over the window; 0.0 before any sample"""
+        with self._lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def score(self, failure_penalty_seconds: float) -> float:
+        """Expected cost of routing here: median latency plus a penalty for recent failures"""
+        return self.percentile(50) + self.failure_rate * failure_penalty_seconds
+
+
+class _Attempt:
+    """One provider's streamed answer, produced on a worker thread into the race's event queue"""
+
+    def __init__(self, provider: LLMProvider, events: "queue.Queue", collect: bool,
+                 messages: List[Dict[str, str]], options: Dict[str, Any]):
+        self.provider = provider
+        self.events = events
+        self.collect = collect
+        self.messages = messages
+        self.options = options
+        self.cancelled = threading.Event()
+        self.response = None  # the provider's open response, once the request is accepted
+        self._lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name=f"llm-attempt-{provider.name}", daemon=True)
+        self.thread.start()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def cancel(self):
+        """Stop the attempt, closing its response if the request has been accepted.
+
+        A worker blocked reading the response returns once that read completes.
+        """
+        with self._lock:
+            self.cancelled.set()
+            response = self.response
+        if response is not None:
+            response.close()
+
+    def _opened(self, response):
+        with self._lock:
+            self.response = response
+            cancelled = self.cancelled.is_set()
+        if cancelled:  # lost the race while the request was being accepted
+            response.close()
+
+    def _run(self):
+        stream = self.provider.stream(self.messages, on_open=self._opened, **self.options)
+        parts: List[str] = []
+        try:
+            for delta in stream:
+                if self.cancelled.is_set():
+                    return
+                if self.collect:
+                    parts.append(delta)
+                else:
+                    self.events.put((self, DELTA, delta))
+            self.events.put((self, DONE, "".join(parts)))
+        except Exception as e:
+            if not self.cancelled.is_set():  # reading a closed response fails; nobody is listening
+                self.events.put((self, ERROR, e))
+        finally:
+            stream.close()
+
+
+class _Race:
+    """Run one request across the pool: primary first, then a hedge or failover.
+
+    With `first_token_wins` the first attempt to produce text wins (streaming);
+    otherwise the first to finish does. Iterating yields the winner's text.
+    """
+
+    def __init__(self, pool: "ProviderPool", messages: List[Dict[str, str]], options: Dict[str, Any],
+                 first_token_wins: bool):
+        self.pool = pool
+        self.messages = messages
+        self.options = options
+        self.first_token_wins = first_token_wins
+        self.stats = pool.first_token_stats if first_token_wins else pool.latency_stats
+        self.winner: Optional[_Attempt] = None
+        self.hedged = False
+        self.start = 0.0  # when the primary was launched
+
+    def _launch(self, provider: LLMProvider, live: List[_Attempt], events: "queue.Queue") -> _Attempt:
+        attempt = _Attempt(provider, events, not self.first_token_wins, self.messages, self.options)
+        live.append(attempt)
+        return attempt
+
+    def _choose(self, attempt: _Attempt, live: List[_Attempt]):
+        self.winner = attempt
+        self.stats[attempt.provider.name].record(attempt.elapsed)
+        race_time = time.perf_counter() - self.start
+        if self.hedged:
+            metrics.increment("llm_hedge_wins_total", provider=attempt.provider.name)
+        for other in live:
+            if other is not attempt:
+                other.cancel()
+                # It had not answered within the race, so it is at least that slow,
+                # even if it was the hedge and its own elapsed time is shorter
+                self.stats[other.provider.name].record_cancelled(race_time)
+                metrics.increment("llm_cancelled_total", provider=other.provider.name)
+        live[:] = [attempt]
+
+    def __iter__(self) -> Iterator[str]:
+        events: "queue.Queue" = queue.Queue()
+        pending = self.pool.route(self.stats)
+        live: List[_Attempt] = []
+        primary = self._launch(pending.pop(0), live, events)
+        self.start = primary.start
+        hedge_at = primary.start + self.pool.hedge_delay(primary.provider, self.stats)
+        try:
+            while True:
+                timeout = None
+                if self.winner is None and pending and not self.hedged and self.pool.hedging:
+                    timeout = max(0.0, hedge_at - time.perf_counter())
+                try:
+                    attempt, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    self.hedged = True
+                    metrics.increment("llm_hedges_total", provider=pending[0].name)
+                    self._launch(pending.pop(0), live, events)
+                    continue
+                if attempt.cancelled.is_set():
+                    continue
+                if kind == ERROR:
+                    live.remove(attempt)
+                    self.stats[attempt.provider.name].record_failure()
+                    if attempt is self.winner or (not live and not pending):
+                        raise value
+                    logger.warning(f"LLM provider '{attempt.provider.name}' failed ({value})")
+                    if not live:
+                        metrics.increment("llm_failovers_total", provider=pending[0].name)
+                        self._launch(pending.pop(0), live, events)
+                    continue
+                if self.winner is None:
+                    self._choose(attempt, live)
+                if kind == DONE:
+                    if not self.first_token_wins:
+                        yield value
+                    return
+                yield value
+        finally:
+            for attempt in live:
+                attempt.cancel()
+
+
+class ProviderPool(LLMProvider):
+    """Route calls to the fastest healthy member and hedge slow ones to the next.
+
+    The hedge delay for a member is its recent `hedge_percentile` latency
+    (never below `min_hedge_delay`), or `initial_hedge_delay` until it has
+    `min_samples` observations. Completions are timed to the last token and
+    streams to the first, each with its own window. A failed attempt fails
+    over to the next member immediately. Pooled completions are streamed, so
+    they carry no token usage.
+    """
+
+    def __init__(self, providers: List[LLMProvider], hedging: bool = True, hedge_percentile: float = 95.0,
+                 min_hedge_delay: float = 0.05, initial_hedge_delay: float = 2.0, min_samples: int = 20,
+                 window: int = 200, failure_penalty_seconds: float = 10.0):
+        if not providers:
+            raise ValueError("ProviderPool needs at least one provider")
+        self.providers = list(providers)
+        self.name = "pool"
+        self.model = ",".join(provider.model for provider in self.providers)
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.failure_penalty_seconds = failure_penalty_seconds
+        self.latency_stats = {provider.name: ProviderStats(window) for provider in self.providers}
+        self.first_token_stats = {provider.name: ProviderStats(window) for provider in self.providers}
+
+    def route(self, stats: Optional[Dict[str, ProviderStats]] = None) -> List[LLMProvider]:
+        """Members in the order to try them: closed breakers first, then by score, then as configured"""
+        stats = stats or self.latency_stats
+
+        def key(item):
+            position, provider = item
+            breaker = getattr(getattr(provider, "caller", None), "circuit_breaker", None)
+            is_open = breaker is not None and breaker.state == CircuitBreaker.OPEN
+            return (is_open, stats[provider.name].score(self.failure_penalty_seconds), position)
+
+        return [provider for _, provider in sorted(enumerate(self.providers), key=key)]
+
+    def hedge_delay(self, provider: LLMProvider, stats: Optional[Dict[str, ProviderStats]] = None) -> float:
+        """Seconds to wait on `provider` before hedging to the next member"""
+        provider_stats = (stats or self.latency_stats)[provider.name]
+        if provider_stats.count < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, provider_stats.percentile(self.hedge_percentile))
+
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+                 tokens: int = 0, kind: str = "chat") -> ChatResult:
+        race = _Race(self, messages, dict(temperature=temperature, max_tokens=max_tokens, tokens=tokens,
+                                          kind=kind), first_token_wins=False)
+        text = "".join(race)
+        return ChatResult(text, race.winner.provider.model, race.winner.provider.name)
+
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.1, max_tokens: int = 500,
+               tokens: int = 0, kind: str = "chat",
+               on_open: Optional[Callable[[Any], None]] = None) -> Iterator[str]:
+        # Members' responses stay owned by their attempts; on_open is not forwarded
+        return iter(_Race(self, messages, dict(temperature=temperature, max_tokens=max_tokens, tokens=tokens,
+                                               kind=kind), first_token_wins=True))
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-member routing state for status endpoints"""
+        return {
+            provider.name: {
+                "samples": self.latency_stats[provider.name].count,
+                "p50_ms": round(1000 * self.latency_stats[provider.name].percentile(50), 3),
+                "hedge_delay_ms": round(1000 * self.hedge_delay(provider), 3),
+                "failure_rate": round(self.latency_stats[provider.name].failure_rate, 3),
+            }
+            for provider in self.route()
+        }
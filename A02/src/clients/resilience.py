@@ -0,0 +1,254 @@
+# src/clients/resilience.py
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from src.monitoring.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Take `amount` tokens if available; otherwise return seconds to wait"""
+        with self._lock:
+            self._refill()
+            # Requests larger than the bucket are allowed once it is full
+            amount = min(amount, self.capacity)
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate_per_second
+
+    def acquire(self, amount: float = 1):
+        """Block until `amount` tokens are available"""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1):
+        """Wait without blocking the event loop until `amount` tokens are available"""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """Open after consecutive failed calls, then allow one trial call after a cool-down"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0  # identifies the trial call currently in flight
+        self._lock = threading.Lock()
+
+    def admit(self) -> Tuple[bool, Optional[int]]:
+        """Return (allowed, probe): `probe` is set for the single trial call of a half-open breaker.
+
+        While that call is in flight every other caller is rejected; it must
+        end with `record_success`, `record_failure` or `release_probe`.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True, None
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probes += 1
+                return True, self._probes
+            return False, None
+
+    def allow_request(self) -> bool:
+        return self.admit()[0]
+
+    def release_probe(self, probe: int):
+        """End a trial call without a verdict (client error, cancellation) so the next caller can probe"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and probe == self._probes:
+                self.state = self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable errors"""
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 0.5, max_delay: float = 20.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return max(backoff, retry_after or 0.0)
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429s, 5xx responses, timeouts and connection failures are worth retrying"""
+    status = status_code_of(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError",
+                                  "ReadTimeout", "ConnectTimeout", "RemoteProtocolError")
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientCaller:
+    """Wrap provider calls with bounded concurrency, RPM/TPM limits, retries and a breaker"""
+
+    def __init__(self, name: str, max_concurrency: int = 8,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+    def _admit(self) -> Optional[int]:
+        """Pass the circuit breaker once per logical call; returns the probe id of a trial call"""
+        allowed, probe = self.circuit_breaker.admit()
+        if not allowed:
+            metrics.increment("llm_rejected_total", client=self.name)
+            raise CircuitOpenError(f"Circuit breaker for '{self.name}' is open")
+        return probe
+
+    def _retry_delay(self, exc: Exception, attempt: int, probe: Optional[int]) -> float:
+        """Seconds to wait before retrying `exc`, or re-raise it.
+
+        The breaker counts one failure per call, once its retries are
+        exhausted; a call stops retrying early if other calls opened it.
+        """
+        retryable = is_retryable(exc)
+        if retryable and attempt >= self.retry_policy.max_retries:
+            self.circuit_breaker.record_failure()
+        if not retryable or attempt >= self.retry_policy.max_retries:
+            metrics.increment("llm_failures_total", client=self.name)
+            raise exc
+        if probe is None and self.circuit_breaker.state != CircuitBreaker.CLOSED:
+            metrics.increment("llm_rejected_total", client=self.name)
+            raise CircuitOpenError(f"Circuit breaker for '{self.name}' is open") from exc
+        delay = self.retry_policy.delay(attempt, retry_after_seconds(exc))
+        metrics.increment("llm_retries_total", client=self.name)
+        logger.warning(f"{self.name} call failed ({exc}); retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def call(self, fn: Callable[..., Any], *args, tokens: int = 0, **kwargs) -> Any:
+        """Call `fn(*args, **kwargs)`, retrying transient failures.
+
+        `tokens` is the estimated token cost charged against the TPM budget.
+        """
+        probe = self._admit()
+        try:
+            attempt = 0
+            while True:
+                if self.request_bucket:
+                    self.request_bucket.acquire(1)
+                if self.token_bucket and tokens:
+                    self.token_bucket.acquire(tokens)
+
+                try:
+                    with self.semaphore:
+                        result = fn(*args, **kwargs)
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, probe)
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self.circuit_breaker.record_success()
+                return result
+        finally:
+            if probe is not None:
+                self.circuit_breaker.release_probe(probe)
+
+    async def call_async(self, fn: Callable[..., Any], *args, tokens: int = 0, **kwargs) -> Any:
+        """Async counterpart of `call` for coroutine functions.
+
+        Concurrency is bounded by the caller's own asyncio semaphore; rate
+        limits, retries and the circuit breaker are shared with `call`.
+        """
+        probe = self._admit()
+        try:
+            attempt = 0
+            while True:
+                if self.request_bucket:
+                    await self.request_bucket.acquire_async(1)
+                if self.token_bucket and tokens:
+                    await self.token_bucket.acquire_async(tokens)
+
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, probe)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self.circuit_breaker.record_success()
+                return result
+        finally:
+            if probe is not None:
+                self.circuit_breaker.release_probe(probe)
@@ -0,0 +1,347 @@
+# src/document_loader/dedup.py
+"""
+Near-duplicate chunk detection with MinHash signatures and an LSH index.
+
+Academic PDFs repeat running headers, footers, license boilerplate and
+reference entries on page after page. `NearDuplicateIndex` drops a chunk
+when its estimated Jaccard similarity (over word shingles) to an already
+stored chunk, or to an earlier chunk of the same batch, reaches
+`threshold`, so those chunks are never embedded or stored.
+
+Signatures are split into `bands`; two chunks become candidates when any
+band matches exactly, and candidates are confirmed on the full signature.
+The index lives in its own directory next to the vector store:
+  - manifest.json     MinHash parameters and the id of the vector store
+                      collection the rows describe; a mismatch starts a
+                      fresh index
+  - signatures.u32    uint32 rows of `num_perm` values, append-only
+  - sources.jsonl     the source file of each row, same order
+Rows are appended after their chunks are stored, so writes stay
+proportional to the batch, not the corpus. Re-ingesting a source first
+`forget`s its rows, so an edited file is compared with the rest of the
+corpus rather than with its own previous version. Chunks written around the
+pipeline (bulk import, snapshot restore into an existing collection) are not
+in the index until `rebuild` re-signs the stored chunks
+(`python manage.py rebuild-dedup`).
+numpy is imported on first use, so importing the API does not load it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+SIGNATURES_FILE = "signatures.u32"
+SOURCES_FILE = "sources.jsonl"
+
+_TOKEN = re.compile(r"\w+")
+
+
+class DedupReport:
+    """Per-file counts of chunks seen, kept and dropped as near-duplicates"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.chunks = 0
+        self.within_document = 0
+        self.cross_document = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.within_document + self.cross_document
+
+    @property
+    def kept(self) -> int:
+        return self.chunks - self.dropped
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of the file's chunks dropped as near-duplicates"""
+        return self.dropped / self.chunks if self.chunks else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "chunks": self.chunks,
+            "kept": self.kept,
+            "within_document": self.within_document,
+            "cross_document": self.cross_document,
+            "dedup_ratio": round(self.ratio, 4),
+        }
+
+
+class _Bands:
+    """LSH buckets: one dict per band from the band's bytes to row numbers"""
+
+    def __init__(self, bands: int, rows: int):
+        self.rows = rows
+        self.buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def _keys(self, signature: np.ndarray):
+        for band, buckets in enumerate(self.buckets):
+            yield buckets, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, signature: np.ndarray, row: int):
+        for buckets, key in self._keys(signature):
+            buckets.setdefault(key, []).append(row)
+
+    def candidates(self, signature: np.ndarray) -> List[int]:
+        found: Dict[int, None] = {}
+        for buckets, key in self._keys(signature):
+            for row in buckets.get(key, ()):
+                found[row] = None
+        return list(found)
+
+
+class PendingBatch:
+    """Chunks kept by `NearDuplicateIndex.deduplicate`, waiting to be committed once stored"""
+
+    def __init__(self, source: str, signatures: np.ndarray):
+        self.source = source
+        self.signatures = signatures
+
+
+class NearDuplicateIndex:
+    """Persistent MinHash/LSH index of every chunk stored so far.
+
+    The default 128 permutations in 16 bands of 8 rows make chunk pairs at
+    0.8 Jaccard candidates with probability ~0.95 and pairs at 0.5 with ~0.06;
+    `threshold` is then checked on the full signature.
+    """
+
+    def __init__(self, index_dir: str, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 1, collection: Optional[str] = None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.index_dir = index_dir
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = max(1, shingle_size)
+        self.seed = seed
+        self.collection = collection
+        import numpy as np
+        rng = np.random.RandomState(seed)
+        # Multiply-add-shift hashing: (a*h + b) mod 2**64, top 32 bits, with a odd
+        self._a = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._reset_rows()
+        self._load()
+
+    def _reset_rows(self):
+        import numpy as np
+        self._signatures = np.empty((0, self.num_perm), dtype=np.uint32)
+        self._count = 0
+        self._sources: List[str] = []
+        self._bands = _Bands(self.bands, self.num_perm // self.bands)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def _manifest(self) -> Dict[str, Any]:
+        return {"format_version": INDEX_FORMAT_VERSION, "num_perm": self.num_perm, "bands": self.bands,
+                "shingle_size": self.shingle_size, "seed": self.seed, "collection": self.collection}
+
+    def shingles(self, text: str) -> np.ndarray:
+        """CRC32 hashes of the text's word n-grams (the whole text when it is shorter)"""
+        import numpy as np
+        tokens = _TOKEN.findall(text.lower())
+        size = min(self.shingle_size, len(tokens)) or 1
+        grams = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+        return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature: per permutation, the minimum hash over all shingles"""
+        import numpy as np
+        hashes = self.shingles(text)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float((first == second).sum()) / self.num_perm
+
+    def _match(self, signature: np.ndarray, bands: _Bands, signatures: np.ndarray) -> Optional[int]:
+        for row in bands.candidates(signature):
+            if self.similarity(signature, signatures[row]) >= self.threshold:
+                return row
+        return None
+
+    def deduplicate(self, chunks: List[Dict[str, Any]], source: str,
+                    report: Optional[DedupReport] = None) -> Tuple[List[Dict[str, Any]], PendingBatch]:
+        """Drop chunks that nearly duplicate a stored chunk or an earlier chunk in `chunks`.
+
+        Returns the kept chunks and a `PendingBatch` to `commit` once they are
+        stored; the index itself is unchanged until then.
+        """
+        import numpy as np
+        report = report or DedupReport(source)
+        kept: List[Dict[str, Any]] = []
+        kept_signatures: List[np.ndarray] = []
+        batch_bands = _Bands(self.bands, self.num_perm // self.bands)
+        for chunk in chunks:
+            report.chunks += 1
+            signature = self.signature(chunk['content'])
+            with self._lock:
+                row = self._match(signature, self._bands, self._signatures)
+                match_source = self._sources[row] if row is not None else None
+            if row is not None:
+                if match_source == source:
+                    report.within_document += 1
+                else:
+                    report.cross_document += 1
+                continue
+            if kept_signatures and self._match(signature, batch_bands, kept_signatures) is not None:
+                report.within_document += 1
+                continue
+            batch_bands.add(signature, len(kept_signatures))
+            kept_signatures.append(signature)
+            kept.append(chunk)
+        signatures = np.array(kept_signatures, dtype=np.uint32).reshape(-1, self.num_perm)
+        return kept, PendingBatch(source, signatures)
+
+    def _append_rows(self, signatures: np.ndarray, sources: List[str]):
+        import numpy as np
+        with self._lock:
+            needed = self._count + len(signatures)
+            if needed > len(self._signatures):
+                grown = np.empty((max(needed, 2 * len(self._signatures), 1024), self.num_perm), dtype=np.uint32)
+                grown[:self._count] = self._signatures[:self._count]
+                self._signatures = grown
+            for offset, signature in enumerate(signatures):
+                self._bands.add(signature, self._count + offset)
+            self._signatures[self._count:needed] = signatures
+            self._sources = self._sources + sources
+            self._count = needed
+
+    def commit(self, batch: PendingBatch):
+        """Add a stored batch's signatures to the index and append them to disk"""
+        if not len(batch.signatures):
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            with open(manifest_path, "w") as f:
+                json.dump(self._manifest, f, indent=2)
+        # Sources first: on load, rows without both a signature and a source are ignored
+        with open(os.path.join(self.index_dir, SOURCES_FILE), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(batch.source) + "\n" for _ in range(len(batch.signatures)))
+        with open(os.path.join(self.index_dir, SIGNATURES_FILE), "ab") as f:
+            f.write(batch.signatures.tobytes())
+        self._append_rows(batch.signatures, [batch.source] * len(batch.signatures))
+
+    def rebuild(self, manager, batch_size: int = 5000) -> Dict[str, int]:
+        """Re-sign every chunk stored in `manager`'s collection (after bulk imports or snapshots)"""
+        import numpy as np
+        self.clear()
+        collection = manager.collection
+        count = collection.count()
+        sources: Dict[str, None] = {}
+        for offset in range(0, count, batch_size):
+            batch = collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            if not batch['ids']:
+                break
+            by_source: Dict[str, List[np.ndarray]] = {}
+            for text, metadata in zip(batch['documents'], batch['metadatas']):
+                source = (metadata or {}).get('source', "")
+                by_source.setdefault(source, []).append(self.signature(text or ""))
+            for source, signatures in by_source.items():
+                sources[source] = None
+                self.commit(PendingBatch(source, np.array(signatures, dtype=np.uint32)))
+        return {"chunks": len(self), "sources": len(sources)}
+
+    def forget(self, source: str) -> int:
+        """Drop every row of `source`, on disk and in memory, before the source is re-ingested.
+
+        The remaining rows are written to a staging directory that replaces
+        the index; a crash between the two renames is recovered on load.
+        Returns the number of rows dropped.
+        """
+        with self._lock:
+            keep = [row for row, row_source in enumerate(self._sources[:self._count]) if row_source != source]
+            dropped = self._count - len(keep)
+            if not dropped:
+                return 0
+            signatures = self._signatures[keep]
+            sources = [self._sources[row] for row in keep]
+            staging, previous = self.index_dir + ".new", self.index_dir + ".old"
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+                json.dump(self._manifest, f, indent=2)
+            with open(os.path.join(staging, SOURCES_FILE), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(row_source) + "\n" for row_source in sources)
+            with open(os.path.join(staging, SIGNATURES_FILE), "wb") as f:
+                f.write(signatures.tobytes())
+            shutil.rmtree(previous, ignore_errors=True)
+            os.replace(self.index_dir, previous)
+            os.replace(staging, self.index_dir)
+            shutil.rmtree(previous, ignore_errors=True)
+            self._reset_rows()
+        self._append_rows(signatures, sources)
+        return dropped
+
+    def _load(self):
+        import numpy as np
+        previous = self.index_dir + ".old"
+        if not os.path.exists(self.index_dir) and os.path.exists(previous):
+            # `forget` stopped between its renames; the previous index is still whole
+            os.replace(previous, self.index_dir)
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest != self._manifest:
+                logger.warning(f"Dedup index at {self.index_dir} was built with {manifest}; starting a new one")
+                self.clear()
+                return
+            signatures = np.fromfile(os.path.join(self.index_dir, SIGNATURES_FILE), dtype=np.uint32)
+            with open(os.path.join(self.index_dir, SOURCES_FILE), encoding="utf-8") as f:
+                sources = [json.loads(line) for line in f if line.endswith("\n")]
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dedup index at {self.index_dir}: {e}")
+            return
+        rows = min(len(signatures) // self.num_perm, len(sources))
+        if len(signatures) != rows * self.num_perm or len(sources) != rows:
+            # An interrupted commit left a partial row; cut both files back to whole rows
+            logger.warning(f"Truncating dedup index at {self.index_dir} to {rows} complete rows")
+            with open(os.path.join(self.index_dir, SIGNATURES_FILE), "r+b") as f:
+                f.truncate(rows * self.num_perm * signatures.itemsize)
+            with open(os.path.join(self.index_dir, SOURCES_FILE), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(source) + "\n" for source in sources[:rows])
+        self._append_rows(signatures[:rows * self.num_perm].reshape(rows, self.num_perm), sources[:rows])
+        logger.info(f"Loaded dedup index with {rows} chunks from {self.index_dir}")
+
+    def clear(self):
+        """Forget every stored signature, on disk and in memory"""
+        with self._lock:
+            self._reset_rows()
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+
+
+def open_dedup_index(config, collection: Optional[str] = None) -> NearDuplicateIndex:
+    """The index configured by `config`, kept next to the vector store unless DEDUP_INDEX_DIR is set"""
+    return NearDuplicateIndex(
+        config.DEDUP_INDEX_DIR or config.VECTOR_DB_PATH.rstrip(os.sep) + "_dedup",
+        threshold=config.DEDUP_THRESHOLD,
+        num_perm=config.DEDUP_NUM_PERM,
+        bands=config.DEDUP_BANDS,
+        shingle_size=config.DEDUP_SHINGLE_SIZE,
+        collection=collection
+    )
@@ -0,0 +1,77 @@
+# src/document_loader/extraction_cache.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction output changes (page handling, text clean-up, ...)
+EXTRACTOR_REVISION = 1
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extractor_version() -> str:
+    """Identifies the code that produced cached text; part of every cache key"""
+    import pypdf
+    return f"pypdf-{pypdf.__version__}-r{EXTRACTOR_REVISION}"
+
+
+class ExtractionCache:
+    """Per-page PDF text keyed by file content hash and extractor version.
+
+    Each entry is one zlib-compressed JSON file holding the page count and
+    the (page_index, text) pairs, so re-chunking or re-embedding a corpus
+    never has to parse the PDFs again.
+    """
+
+    def __init__(self, cache_dir: str, version: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._version = version
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            self._version = extractor_version()
+        return self._version
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, content_hash[:2], f"{content_hash}.{self.version}.json.z")
+
+    def get(self, content_hash: str) -> Optional[Tuple[int, List[Tuple[int, str]]]]:
+        """Return (total_pages, pages) for a cached file, or None"""
+        path = self._entry_path(content_hash)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+        return entry["total_pages"], [(page_num, text) for page_num, text in entry["pages"]]
+
+    def put(self, content_hash: str, total_pages: int, pages: List[Tuple[int, str]]):
+        """Store extracted pages; written atomically so readers never see partial entries"""
+        path = self._entry_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(json.dumps({"total_pages": total_pages, "pages": pages}).encode(), 6)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache entry {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
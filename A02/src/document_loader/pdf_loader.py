@@ -1,44 +1,113 @@
 # src/document_loader/pdf_loader.py
 import os
-from typing import List, Dict, Any
-from pypdf import PdfReader
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
+from src.document_loader.extraction_cache import ExtractionCache, file_sha256
+from src.monitoring.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Worker entry point: open the file and extract pages [start, stop)"""
+    from pypdf import PdfReader
+    
+    reader = PdfReader(file_path)
+    return [(page_num, reader.pages[page_num].extract_text()) for page_num in range(start, stop)]
+
 class AcademicPDFLoader:
     """Loader for academic PDF papers"""
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, pages_per_task: Optional[int] = None,
+                 cache: Optional[ExtractionCache] = None):
+        from config import config
         self.supported_formats = ['.pdf']
+        if cache is None and config.EXTRACTION_CACHE_ENABLED:
+            cache = ExtractionCache(config.EXTRACTION_CACHE_DIR)
+        self.cache = cache
+        # workers <= 1 extracts in-process; larger documents are split into
+        # page ranges and extracted by a pool of worker processes
+        self.workers = workers if workers is not None else config.PDF_EXTRACT_WORKERS
+        self.pages_per_task = pages_per_task or config.PDF_PAGES_PER_TASK
+        self._executor = None
+    
+    def _get_executor(self):
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn: forking a threaded server process is not safe
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+    
+    def close(self):
+        """Shut down the extraction worker pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+    
+    def _iter_page_texts(self, file_path: str, total_pages: int, reader) -> Iterator[Tuple[int, str]]:
+        """Yield (page_index, text) in page order, in parallel when worthwhile"""
+        if self.workers <= 1 or total_pages < 2 * self.pages_per_task:
+            for page_num, page in enumerate(reader.pages):
+                yield page_num, page.extract_text()
+            return
+        
+        starts = list(range(0, total_pages, self.pages_per_task))
+        stops = [min(start + self.pages_per_task, total_pages) for start in starts]
+        # map() submits every range up front and yields results in order, so
+        # later ranges keep extracting while earlier pages are consumed
+        results = self._get_executor().map(_extract_page_range, [file_path] * len(starts), starts, stops)
+        for page_range in results:
+            yield from page_range
+    
+    def iter_pages(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Stream non-empty pages of a PDF in page order"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        logger.info(f"Loading PDF: {file_path}")
+        
+        content_hash = file_sha256(file_path) if self.cache else None
+        cached = self.cache.get(content_hash) if self.cache else None
+        if cached is not None:
+            metrics.increment("extraction_cache_hits_total")
+            total_pages, page_texts = cached
+            for page_num, text in page_texts:
+                yield self._page_record(file_path, page_num, text, total_pages)
+            return
+        
+        from pypdf import PdfReader  # deferred to keep imports cheap
+        
+        reader = PdfReader(file_path)
+        total_pages = len(reader.pages)
+        extracted = []
+        for page_num, text in self._iter_page_texts(file_path, total_pages, reader):
+            if text.strip():  # Only add non-empty pages
+                extracted.append((page_num, text))
+                yield self._page_record(file_path, page_num, text, total_pages)
+        
+        if self.cache:
+            metrics.increment("extraction_cache_misses_total")
+            self.cache.put(content_hash, total_pages, extracted)
+    
+    def _page_record(self, file_path: str, page_num: int, text: str, total_pages: int) -> Dict[str, Any]:
+        return {
+            'content': text,
+            'metadata': {
+                'source': file_path,
+                'filename': os.path.basename(file_path),
+                'page': page_num + 1,
+                'total_pages': total_pages
+            }
+        }
     
     def load_document(self, file_path: str) -> List[Dict[str, Any]]:
         """Load and extract text from PDF document"""
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            logger.info(f"Loading PDF: {file_path}")
-            
-            # Extract text from PDF
-            reader = PdfReader(file_path)
-            documents = []
-            
-            for page_num, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text.strip():  # Only add non-empty pages
-                    documents.append({
-                        'content': text,
-                        'metadata': {
-                            'source': file_path,
-                            'page': page_num + 1,
-                            'total_pages': len(reader.pages)
-                        }
-                    })
-            
+            documents = list(self.iter_pages(file_path))
             logger.info(f"Extracted {len(documents)} pages from {file_path}")
             return documents
-            
+        
         except Exception as e:
             logger.error(f"Error loading PDF {file_path}: {e}")
             raise
@@ -0,0 +1,71 @@
+# src/document_loader/registry.py
+"""
+Loader registry keyed by file extension.
+
+Every loader exposes `iter_pages(file_path)` and `load_document(file_path)`
+and yields records of the same shape:
+
+    {'content': str,
+     'metadata': {'source', 'filename', 'page', optional 'total_pages',
+                  optional 'section', ...scalar extras}}
+
+`page` is the PDF page, the section number for sectioned text formats and
+the line number for JSONL, so page filters behave the same for every source.
+"""
+import logging
+import os
+from typing import Any, Dict, Iterator, List
+
+from src.document_loader.pdf_loader import AcademicPDFLoader
+from src.document_loader.text_loaders import HTMLLoader, JSONLLoader, LaTeXLoader, MarkdownLoader
+
+logger = logging.getLogger(__name__)
+
+class UnsupportedFormatError(ValueError):
+    """Raised when no loader is registered for a file's extension"""
+
+class LoaderRegistry:
+    """Dispatch documents to the loader registered for their extension"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Any] = {}
+
+    def register(self, loader, extensions: List[str] = None):
+        """Register `loader` for `extensions` (defaults to its supported_formats)"""
+        for extension in extensions or loader.supported_formats:
+            self._loaders[extension.lower()] = loader
+
+    @property
+    def supported_formats(self) -> List[str]:
+        return sorted(self._loaders)
+
+    def supports(self, file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in self._loaders
+
+    def get_loader(self, file_path: str):
+        extension = os.path.splitext(file_path)[1].lower()
+        loader = self._loaders.get(extension)
+        if loader is None:
+            raise UnsupportedFormatError(
+                f"Unsupported file type '{extension or file_path}'. "
+                f"Supported: {', '.join(self.supported_formats)}"
+            )
+        return loader
+
+    def iter_pages(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        return self.get_loader(file_path).iter_pages(file_path)
+
+    def load_document(self, file_path: str) -> List[Dict[str, Any]]:
+        return self.get_loader(file_path).load_document(file_path)
+
+def build_default_registry() -> LoaderRegistry:
+    """Registry with the PDF loader and the built-in text format loaders"""
+    registry = LoaderRegistry()
+    for loader in (AcademicPDFLoader(), MarkdownLoader(), LaTeXLoader(), HTMLLoader(), JSONLLoader()):
+        registry.register(loader)
+    return registry
+
+# Test the registry
+if __name__ == "__main__":
+    registry = build_default_registry()
+    print(f"Supported formats: {', '.join(registry.supported_formats)}")
@@ -0,0 +1,206 @@
+# src/document_loader/text_loaders.py
+import json
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def make_record(file_path: str, page: int, content: str, section: Optional[str] = None,
+                total_pages: Optional[int] = None, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a page/section record with the same shape AcademicPDFLoader yields"""
+    metadata = {
+        'source': file_path,
+        'filename': os.path.basename(file_path),
+        'page': page
+    }
+    if total_pages is not None:
+        metadata['total_pages'] = total_pages
+    if section:
+        metadata['section'] = section
+    if extra:
+        # Chroma metadata values must be scalars
+        metadata.update({k: v for k, v in extra.items()
+                         if isinstance(v, (str, int, float, bool)) and k not in metadata})
+    return {'content': content, 'metadata': metadata}
+
+class SectionedTextLoader(ABC):
+    """Base for text formats split into sections; each section is one record"""
+    
+    supported_formats: List[str] = []
+    
+    @abstractmethod
+    def split_sections(self, text: str) -> List[Tuple[Optional[str], str]]:
+        """Return (section title, section text) pairs in document order"""
+    
+    def iter_pages(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield non-empty sections in document order.
+        
+        The whole file is read and split first: section boundaries (fenced
+        code, LaTeX preamble, HTML nesting) depend on the full text, and every
+        record carries the section count as `total_pages`.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        logger.info(f"Loading {file_path}")
+        with open(file_path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        
+        sections = [(title, body.strip()) for title, body in self.split_sections(text)]
+        sections = [(title, body) for title, body in sections if body]
+        for page, (title, body) in enumerate(sections, 1):
+            yield make_record(file_path, page, body, section=title, total_pages=len(sections))
+    
+    def load_document(self, file_path: str) -> List[Dict[str, Any]]:
+        documents = list(self.iter_pages(file_path))
+        logger.info(f"Extracted {len(documents)} sections from {file_path}")
+        return documents
+
+class MarkdownLoader(SectionedTextLoader):
+    """Split Markdown at ATX headings (#, ##, ###)"""
+    
+    supported_formats = ['.md', '.markdown']
+    HEADING = re.compile(r'^(#{1,3})\s+(.+?)\s*#*\s*$', re.MULTILINE)
+    FENCE = re.compile(r'^(```|~~~).*?^\1', re.MULTILINE | re.DOTALL)
+    
+    def split_sections(self, text: str) -> List[Tuple[Optional[str], str]]:
+        # Headings inside fenced code blocks are not section breaks
+        fenced = [m.span() for m in self.FENCE.finditer(text)]
+        headings = [m for m in self.HEADING.finditer(text)
+                    if not any(start <= m.start() < end for start, end in fenced)]
+        sections = [(None, text[:headings[0].start()] if headings else text)]
+        for i, match in enumerate(headings):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            sections.append((match.group(2), text[match.end():end]))
+        return sections
+
+class LaTeXLoader(SectionedTextLoader):
+    """Split LaTeX sources at sectioning commands and strip markup"""
+    
+    supported_formats = ['.tex']
+    SECTION = re.compile(r'\\(?:chapter|section|subsection|subsubsection)\*?\s*\{([^{}]*)\}')
+    COMMENT = re.compile(r'(?<!\\)%.*$', re.MULTILINE)
+    DROPPED_ENVIRONMENTS = re.compile(r'\\begin\{(figure|table|tikzpicture)\*?\}.*?\\end\{\1\*?\}', re.DOTALL)
+    DROPPED_COMMANDS = re.compile(r'\\(?:label|ref|eqref|cite[pt]?|includegraphics|bibliography\w*|vspace|hspace)\*?(?:\[[^\]]*\])?\{[^{}]*\}')
+    TEXT_COMMANDS = re.compile(r'\\(?:textbf|textit|emph|texttt|underline|title|author|caption|footnote)\{([^{}]*)\}')
+    OTHER_COMMANDS = re.compile(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?')
+    
+    def _clean(self, text: str) -> str:
+        text = self.DROPPED_ENVIRONMENTS.sub('', text)
+        text = self.DROPPED_COMMANDS.sub('', text)
+        text = self.TEXT_COMMANDS.sub(r'\1', text)
+        text = self.OTHER_COMMANDS.sub('', text)
+        text = text.replace('~', ' ').replace('{', '').replace('}', '')
+        return re.sub(r'[ \t]+', ' ', text)
+    
+    def split_sections(self, text: str) -> List[Tuple[Optional[str], str]]:
+        text = self.COMMENT.sub('', text)
+        begin = text.find('\\begin{document}')
+        if begin != -1:
+            text = text[begin + len('\\begin{document}'):]
+        end = text.find('\\end{document}')
+        if end != -1:
+            text = text[:end]
+        
+        matches = list(self.SECTION.finditer(text))
+        sections = [(None, self._clean(text[:matches[0].start()] if matches else text))]
+        for i, match in enumerate(matches):
+            stop = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            sections.append((self._clean(match.group(1)).strip(), self._clean(text[match.end():stop])))
+        return sections
+
+class _HTMLSectionParser(HTMLParser):
+    """Collect visible text, starting a new section at each h1-h3"""
+    
+    SKIPPED = {'script', 'style', 'noscript', 'nav', 'head'}
+    BLOCKS = {'p', 'div', 'br', 'li', 'tr', 'section', 'article', 'h4', 'h5', 'h6', 'pre', 'blockquote'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections: List[List[Any]] = [[None, []]]
+        self._skip_depth = 0
+        self._heading: Optional[List[str]] = None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self._skip_depth += 1
+        elif tag in ('h1', 'h2', 'h3'):
+            self._heading = []
+        elif tag in self.BLOCKS:
+            self.sections[-1][1].append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in ('h1', 'h2', 'h3') and self._heading is not None:
+            self.sections.append([' '.join(''.join(self._heading).split()), []])
+            self._heading = None
+        elif tag in self.BLOCKS:
+            self.sections[-1][1].append('\n')
+    
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._heading is not None:
+            self._heading.append(data)
+        else:
+            self.sections[-1][1].append(data)
+
+class HTMLLoader(SectionedTextLoader):
+    """Extract visible HTML text, split at h1-h3 headings"""
+    
+    supported_formats = ['.html', '.htm']
+    
+    def split_sections(self, text: str) -> List[Tuple[Optional[str], str]]:
+        parser = _HTMLSectionParser()
+        parser.feed(text)
+        parser.close()
+        sections = []
+        for title, parts in parser.sections:
+            lines = (' '.join(line.split()) for line in ''.join(parts).splitlines())
+            sections.append((title, '\n'.join(line for line in lines if line)))
+        return sections
+
+class JSONLLoader:
+    """Stream JSON Lines dumps; each line with text becomes one record.
+    
+    Lines carry their text in `content` or `text`; an optional `metadata`
+    object and scalar top-level fields such as `title` are kept. Records are
+    numbered by line, so `page` filters work on JSONL sources too.
+    """
+    
+    supported_formats = ['.jsonl', '.ndjson']
+    TEXT_FIELDS = ('content', 'text')
+    
+    def iter_pages(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        logger.info(f"Streaming JSONL: {file_path}")
+        with open(file_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{file_path}:{line_number}: invalid JSON ({e})") from e
+                text = next((row[field] for field in self.TEXT_FIELDS
+                             if isinstance(row.get(field), str)), None)
+                if not text or not text.strip():
+                    continue
+                extra = dict(row.get('metadata') or {})
+                extra.update({k: v for k, v in row.items()
+                              if k not in self.TEXT_FIELDS and k != 'metadata'})
+                section = extra.pop('section', None) or extra.pop('title', None)
+                yield make_record(file_path, line_number, text,
+                                  section=section if isinstance(section, str) else None, extra=extra)
+    
+    def load_document(self, file_path: str) -> List[Dict[str, Any]]:
+        documents = list(self.iter_pages(file_path))
+        logger.info(f"Extracted {len(documents)} records from {file_path}")
+        return documents
@@ -1,66 +1,175 @@
 # src/embedding/embedder.py
+import asyncio
 import logging
-from typing import List
-import numpy as np
+import time
+from typing import AsyncIterator, List, Optional, Tuple
 import os
+from src.monitoring.llm_logging import llm_call_log
+from src.monitoring.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+class EmbeddingError(RuntimeError):
+    """Raised when embeddings could not be generated after retries"""
+
 class EmbeddingGenerator:
     """Generate embeddings for text chunks"""
     
-    def __init__(self, model_type: str = "openai"):
+    def __init__(self, model_type: str = "openai", client=None, caller=None,
+                 batch_size: Optional[int] = None, concurrency: Optional[int] = None,
+                 async_client_factory=None):
         self.model_type = model_type
         
         if model_type == "openai":
             try:
-                from openai import OpenAI
-                api_key = os.getenv("OPENAI_API_KEY")
-                if not api_key:
-                    raise ValueError("OPENAI_API_KEY environment variable not set")
-                self.client = OpenAI(api_key=api_key)
-                self.model_name = "text-embedding-3-small"
-                logger.info("Using OpenAI embeddings")
-            except ImportError:
-                logger.warning("OpenAI not available, falling back to dummy embeddings")
-                self.model_type = "dummy"
+                from src.clients.openai_client import get_openai_client, get_caller
+            except ImportError as e:
+                raise EmbeddingError(f"OpenAI embeddings requested but unavailable: {e}")
+            from config import config
+            if client is None and not (config.OPENAI_API_KEY or config.OPENAI_BASE_URL):
+                raise ValueError("OPENAI_API_KEY environment variable not set")
+            # Shared pooled client; retries and rate limits live in the caller
+            self.client = client or get_openai_client()
+            self.caller = caller or get_caller("embeddings")
+            # Async clients are bound to one event loop, so each run builds its own
+            self.async_client_factory = async_client_factory
+            self.model_name = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+            self.batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+            self.concurrency = concurrency or config.EMBEDDING_CONCURRENCY
+            logger.info("Using OpenAI embeddings")
         else:
             self.model_type = "dummy"
+            self.batch_size = batch_size or 64
+            self.concurrency = concurrency or 1
             logger.info("Using dummy embeddings for testing")
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text chunk"""
-        if self.model_type == "openai":
-            try:
-                response = self.client.embeddings.create(
-                    model=self.model_name,
-                    input=text
-                )
-                return response.data[0].embedding
-            except Exception as e:
-                logger.error(f"Error generating OpenAI embedding: {e}")
-                logger.info("Falling back to dummy embeddings")
-                return self._generate_dummy_embedding(text)
-        else:
-            return self._generate_dummy_embedding(text)
+        with tracer.start_span("embedder.generate_embedding", model_type=self.model_type):
+            return self._embed_batch([text])[0]
+    
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request-sized batch; never substitutes dummy vectors on failure"""
+        if self.model_type != "openai":
+            return [self._generate_dummy_embedding(text) for text in texts]
+        
+        from src.clients.openai_client import estimate_tokens
+        start = time.perf_counter()
+        try:
+            response = self.caller.call(
+                self.client.embeddings.create,
+                model=self.model_name,
+                input=texts,
+                tokens=sum(estimate_tokens(text) for text in texts)
+            )
+        except Exception as e:
+            self._log_call(texts, start, error=e)
+            logger.error(f"Error generating OpenAI embeddings for {len(texts)} texts: {e}")
+            raise EmbeddingError(f"Embedding request failed: {e}") from e
+        self._log_call(texts, start, response)
+        
+        # The API may return items out of order; restore input order by index
+        data = sorted(response.data, key=lambda item: item.index)
+        if len(data) != len(texts):
+            raise EmbeddingError(f"Expected {len(texts)} embeddings, received {len(data)}")
+        return [item.embedding for item in data]
+    
+    def _log_call(self, texts: List[str], start: float, response=None, error: Optional[Exception] = None):
+        """Record one embeddings request in the LLM call log (vectors are never logged)"""
+        usage = getattr(response, "usage", None)
+        llm_call_log.log_call("embeddings", self.model_name, time.perf_counter() - start,
+                              prompt_tokens=getattr(usage, "prompt_tokens", None),
+                              request=texts, error=error, batch_size=len(texts))
     
     def _generate_dummy_embedding(self, text: str) -> List[float]:
         """Generate a simple dummy embedding for testing"""
         # Create a simple hash-based "embedding" for testing
         import hashlib
+        import numpy as np
         seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
         np.random.seed(seed)
         return np.random.randn(1536).tolist()  # Same dimension as OpenAI embeddings
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
+        """Generate embeddings for multiple texts, one API request per batch"""
         embeddings = []
-        for text in texts:
-            embedding = self.generate_embedding(text)
-            embeddings.append(embedding)
+        with tracer.start_span("embedder.generate_embeddings_batch",
+                               model_type=self.model_type, texts=len(texts)):
+            for start in range(0, len(texts), self.batch_size):
+                embeddings.extend(self._embed_batch(texts[start:start + self.batch_size]))
         
         logger.info(f"Generated {len(embeddings)} embeddings using {self.model_type} model")
         return embeddings
+    
+    async def _embed_batch_async(self, client, texts: List[str]) -> List[List[float]]:
+        """Async counterpart of `_embed_batch` sharing the caller's limits and breaker"""
+        from src.clients.openai_client import estimate_tokens
+        start = time.perf_counter()
+        try:
+            response = await self.caller.call_async(
+                client.embeddings.create,
+                model=self.model_name,
+                input=texts,
+                tokens=sum(estimate_tokens(text) for text in texts)
+            )
+        except Exception as e:
+            self._log_call(texts, start, error=e)
+            logger.error(f"Error generating OpenAI embeddings for {len(texts)} texts: {e}")
+            raise EmbeddingError(f"Embedding request failed: {e}") from e
+        self._log_call(texts, start, response)
+        
+        data = sorted(response.data, key=lambda item: item.index)
+        if len(data) != len(texts):
+            raise EmbeddingError(f"Expected {len(texts)} embeddings, received {len(data)}")
+        return [item.embedding for item in data]
+    
+    async def iter_embedding_batches(self, texts: List[str]) -> AsyncIterator[Tuple[int, List[List[float]]]]:
+        """Yield `(start_index, embeddings)` per batch, in input order.
+        
+        Up to `concurrency` batch requests are in flight at once; a batch is
+        yielded as soon as it and every batch before it have completed, so
+        consumers can store early batches while later ones are still running.
+        """
+        batches = [texts[start:start + self.batch_size]
+                   for start in range(0, len(texts), self.batch_size)]
+        if not batches:
+            return
+        if self.model_type != "openai":
+            for i, batch in enumerate(batches):
+                yield i * self.batch_size, self._embed_batch(batch)
+            return
+        
+        from src.clients.openai_client import build_async_openai_client
+        factory = self.async_client_factory or build_async_openai_client
+        client = factory()
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._embed_batch_async(client, batch)
+        
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            for i, task in enumerate(tasks):
+                yield i * self.batch_size, await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+    
+    async def generate_embeddings_async(self, texts: List[str]) -> List[List[float]]:
+        """Embed `texts` with several batches in flight; results keep input order"""
+        embeddings: List[List[float]] = []
+        with tracer.start_span("embedder.generate_embeddings_async",
+                               model_type=self.model_type, texts=len(texts),
+                               concurrency=self.concurrency):
+            async for _, batch_embeddings in self.iter_embedding_batches(texts):
+                embeddings.extend(batch_embeddings)
+        
+        logger.info(f"Generated {len(embeddings)} embeddings using {self.model_type} model "
+                    f"({self.concurrency} concurrent requests)")
+        return embeddings
 
 # Test the embedder
 if __name__ == "__main__":
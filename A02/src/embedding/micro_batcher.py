@@ -0,0 +1,115 @@
+# src/embedding/micro_batcher.py
+"""
+Dynamic micro-batching of single-text embedding requests.
+
+Concurrent queries each need one embedding. Rather than one API request per
+query, `EmbeddingMicroBatcher` queues the texts and a dispatcher thread
+sends them together: a batch goes out when it reaches `max_batch_size` or
+when its oldest text has waited `max_wait_seconds`. While all
+`max_in_flight` batches are busy, new texts keep queueing, so batches grow
+with load. Identical texts within a batch are embedded once.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EmbeddingMicroBatcher:
+    """Coalesce concurrent `embed(text)` calls into batched embedding requests.
+
+    `max_wait_seconds` trades latency for batch size: 0 sends whatever is
+    already queued, larger values wait for company. Batch sizes are recorded
+    in the `embedding_batch_size` distribution and queueing time in the
+    `query_embed_wait` stage.
+    """
+
+    def __init__(self, embedder, max_batch_size: int = 32, max_wait_seconds: float = 0.002,
+                 max_in_flight: int = 4):
+        self.embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="embed-batch")
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="embed-batcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, text: str) -> "Future[List[float]]":
+        """Queue `text`; the future resolves to its embedding"""
+        if self._closed:
+            raise RuntimeError("EmbeddingMicroBatcher is closed")
+        future: "Future[List[float]]" = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        """Embedding of `text`, computed in a batch with concurrent callers"""
+        with tracer.start_span("embedder.micro_batch"):
+            return self.submit(text).result(timeout)
+
+    def _collect(self, first: Tuple) -> Tuple[list, bool]:
+        """Gather up to max_batch_size items until the first one has waited max_wait_seconds"""
+        batch = [first]
+        deadline = first[2] + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _dispatch(self):
+        stopping = False
+        while not stopping:
+            # Wait for a free request slot first, so texts pile up while every batch is busy
+            self._slots.acquire()
+            item = self._queue.get()
+            if item is _STOP:
+                self._slots.release()
+                break
+            batch, stopping = self._collect(item)
+            dispatched = time.perf_counter()
+            for _, _, enqueued in batch:
+                metrics.observe("query_embed_wait", dispatched - enqueued)
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list):
+        try:
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            metrics.observe_value("embedding_batch_size", len(texts))
+            metrics.increment("embedding_microbatches_total")
+            try:
+                embeddings = dict(zip(texts, self.embedder.generate_embeddings_batch(texts)))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                return
+            for text, future, _ in batch:
+                future.set_result(embeddings[text])
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Embed everything already queued, then stop the dispatcher"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
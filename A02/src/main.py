@@ -1,18 +1,25 @@
 # src/main.py
+import itertools
 import logging
 import os
 import sys
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 # Add the parent directory to Python path so we can import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import config
-from src.document_loader.pdf_loader import AcademicPDFLoader
+from src.clients.llm_providers import provider_configured
+from src.clients.provider_pool import ProviderPool
+from src.document_loader.registry import build_default_registry
 from src.document_loader.chunker import TextChunker
+from src.document_loader.dedup import DedupReport, NearDuplicateIndex, open_dedup_index
 from src.retrieval.retriever import DocumentRetriever
-# from src.retrieval.response_generator import ResponseGenerator  # 暂时注释，没有API密钥
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
+from src.serving.ingest_queue import IndexVersion
+from src.retrieval.response_generator import ResponseGenerator
 
 # Set up logging
 logging.basicConfig(
@@ -26,57 +33,152 @@ class RAGPipeline:
     
     def __init__(self):
         self.config = config
-        self.loader = AcademicPDFLoader()
+        # PDF, Markdown, LaTeX, HTML and JSONL loaders keyed by file extension
+        self.loader = build_default_registry()
         self.chunker = TextChunker(
             chunk_size=config.CHUNK_SIZE,
             chunk_overlap=config.CHUNK_OVERLAP
         )
         self.retriever = DocumentRetriever(config)
-        # self.response_generator = ResponseGenerator(config)  # 暂时注释
-        self.performance_stats = {
-            "total_queries": 0,
-            "average_retrieval_time": 0,
-            "average_generation_time": 0
+        self._dedup_index: Optional[NearDuplicateIndex] = None  # loaded on first ingest
+        # Answers need an OpenAI key or a local OpenAI-compatible server (LLM_PROVIDER=local)
+        self.response_generator = ResponseGenerator(config) if provider_configured() else None
+        
+        # In queue mode a separate writer process commits ingests; track its
+        # index version so this (reader) process refreshes when it changes
+        self.index_version = IndexVersion(config.INDEX_VERSION_FILE) if config.INGEST_MODE == "queue" else None
+        self._seen_index_version = self.index_version.read() if self.index_version else 0
+    
+    @property
+    def performance_stats(self) -> Dict[str, Any]:
+        """Live performance statistics drawn from the metrics registry"""
+        stages = metrics.summary()
+        stats = {
+            "total_queries": int(metrics.counter_value("queries_total")),
+            "average_retrieval_time": stages.get("retrieval", {}).get("mean_ms", 0) / 1000,
+            "average_generation_time": stages.get("generation", {}).get("mean_ms", 0) / 1000,
+            "stages": stages,
+            "distributions": metrics.value_summary()
         }
+        provider = self.response_generator.provider if self.response_generator is not None else None
+        if isinstance(provider, ProviderPool):
+            stats["llm_routing"] = provider.summary()
+        return stats
     
-    def ingest_document(self, file_path: str) -> bool:
-        """Ingest a single document into the system"""
+    @property
+    def dedup_index(self) -> Optional[NearDuplicateIndex]:
+        """Near-duplicate index stored next to the vector store, or None when dedup is off"""
+        if not self.config.DEDUP_ENABLED:
+            return None
+        if self._dedup_index is None:
+            # Keyed by collection id: signatures of a deleted and recreated
+            # collection (e.g. a snapshot restore) would drop chunks it lacks
+            index = open_dedup_index(self.config, str(self.retriever.vector_store.collection.id))
+            if len(index) and self.retriever.get_stats()["document_count"] == 0:
+                logger.warning(f"Vector store is empty; clearing stale dedup index at {index.index_dir}")
+                index.clear()
+            self._dedup_index = index
+        return self._dedup_index
+    
+    def ingest_document(self, file_path: str, report: Optional[DedupReport] = None) -> bool:
+        """Ingest a single document into the system.
+        
+        `report`, if given, is filled with the file's near-duplicate counts.
+        """
         try:
             logger.info(f"Starting ingestion of: {file_path}")
             
-            # 1. Load document
-            documents = self.loader.load_document(file_path)
-            logger.info(f"Loaded {len(documents)} pages")
-            
-            # 2. Chunk documents
-            chunked_documents = self.chunker.chunk_documents(documents)
-            logger.info(f"Created {len(chunked_documents)} chunks")
-            
-            # 3. Add to vector store
-            self.retriever.add_documents(chunked_documents)
+            page_count = 0
+            chunk_count = 0
+            dedup_index = self.dedup_index
+            report = report if report is not None else DedupReport(file_path)
+            with tracer.start_span("pipeline.ingest_document", file_path=file_path):
+                # Re-ingesting replaces the source: its old chunks and signatures
+                # would otherwise shadow or outlive the new text
+                self.retriever.remove_source(file_path)
+                if dedup_index is not None:
+                    dedup_index.forget(file_path)
+                
+                # Stream pages in batches so long documents are chunked and
+                # stored while later page ranges are still being extracted
+                pages = self.loader.iter_pages(file_path)
+                while True:
+                    # 1. Load the next batch of pages
+                    with tracer.start_span("loader.iter_pages"), metrics.time_stage("load"):
+                        documents = list(itertools.islice(pages, self.config.INGEST_PAGE_BATCH))
+                    if not documents:
+                        break
+                    page_count += len(documents)
+                    
+                    # 2. Chunk documents
+                    with tracer.start_span("chunker.chunk_documents"), metrics.time_stage("chunk"):
+                        chunked_documents = self.chunker.chunk_documents(documents)
+                    
+                    # 3. Drop near-duplicates before they are embedded
+                    if dedup_index is not None:
+                        with tracer.start_span("dedup.deduplicate"), metrics.time_stage("dedup"):
+                            chunked_documents, pending = dedup_index.deduplicate(chunked_documents, file_path, report)
+                    
+                    # 4. Add to vector store
+                    if chunked_documents:
+                        self.retriever.add_documents(chunked_documents)
+                    if dedup_index is not None:
+                        dedup_index.commit(pending)
+                    chunk_count += len(chunked_documents)
+                logger.info(f"Loaded {page_count} pages, created {chunk_count} chunks")
             
+            if dedup_index is not None:
+                logger.info(f"Dedup {file_path}: dropped {report.dropped} of {report.chunks} chunks "
+                            f"({report.ratio:.1%}; {report.within_document} within the document, "
+                            f"{report.cross_document} across the corpus)")
+                metrics.increment("chunks_deduplicated_total", report.within_document, scope="document")
+                metrics.increment("chunks_deduplicated_total", report.cross_document, scope="corpus")
+            metrics.increment("documents_ingested_total")
+            metrics.increment("chunks_ingested_total", chunk_count)
             logger.info(f"Successfully ingested: {file_path}")
             return True
             
         except Exception as e:
+            metrics.increment("ingest_failures_total")
             logger.error(f"Failed to ingest {file_path}: {e}")
             return False
     
-    def query(self, question: str, top_k: int = 5) -> Dict[str, Any]:
-        """Query the RAG system"""
+    def refresh_if_stale(self) -> bool:
+        """Refresh cached index state if the writer committed new ingests"""
+        if self.index_version is None:
+            return False
+        version = self.index_version.read()
+        if version == self._seen_index_version:
+            return False
+        logger.info(f"Index version changed ({self._seen_index_version} -> {version}), refreshing")
+        self.retriever.refresh()
+        self._dedup_index = None  # re-validated against the collection on next use
+        self._seen_index_version = version
+        return True
+    
+    def query(self, question: str, top_k: int = 5,
+              filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Query the RAG system, optionally restricted by metadata filters"""
         start_time = time.time()
         
         try:
+            self.refresh_if_stale()
+            
             # 1. Retrieve relevant documents
             retrieval_start = time.time()
-            relevant_docs = self.retriever.retrieve(question, top_k=top_k)
+            with tracer.start_span("pipeline.query", top_k=top_k, filtered=bool(filters)):
+                relevant_docs = self.retriever.retrieve(question, top_k=top_k, filters=filters)
             retrieval_time = time.time() - retrieval_start
+            metrics.observe("retrieval", retrieval_time)
             
-            # 2. Simple response without LLM
-            if relevant_docs:
-                answer = f"I found {len(relevant_docs)} relevant documents. To get AI-generated answers, please configure OpenAI API key."
+            # 2. Generate the answer, or a simple response without LLM
+            generation_time = 0.0
+            if relevant_docs and self.response_generator is not None:
+                generation_start = time.time()
+                answer = self.response_generator.generate_response(question, relevant_docs)
+                generation_time = time.time() - generation_start
             else:
-                answer = "No relevant documents found. The system is working but no documents have been added yet."
+                answer = self._fallback_answer(relevant_docs)
             
             result = {
                 "question": question,
@@ -85,16 +187,46 @@ class RAGPipeline:
                 "document_count": len(relevant_docs),
                 "performance": {
                     "retrieval_time_seconds": round(retrieval_time, 3),
+                    "generation_time_seconds": round(generation_time, 3),
                     "total_time_seconds": round(time.time() - start_time, 3)
                 }
             }
             
+            metrics.increment("queries_total")
+            metrics.observe("query", time.time() - start_time)
             return result
             
         except Exception as e:
+            metrics.increment("errors_total", stage="query")
             logger.error(f"Error during query: {e}")
             return {"error": str(e)}
     
+    def stream_query(self, question: str, top_k: int = 5,
+                     filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Iterator[str]]:
+        """Retrieve documents, then return them with an iterator over the answer as it is generated"""
+        self.refresh_if_stale()
+        retrieval_start = time.time()
+        with tracer.start_span("pipeline.query", top_k=top_k, filtered=bool(filters), stream=True):
+            relevant_docs = self.retriever.retrieve(question, top_k=top_k, filters=filters)
+        metrics.observe("retrieval", time.time() - retrieval_start)
+        metrics.increment("queries_total")
+        
+        if relevant_docs and self.response_generator is not None:
+            return relevant_docs, self.response_generator.stream_response(question, relevant_docs)
+        return relevant_docs, iter([self._fallback_answer(relevant_docs)])
+    
+    def _fallback_answer(self, relevant_docs: List[Dict[str, Any]]) -> str:
+        """Answer used when no documents were found or no LLM provider is configured"""
+        if relevant_docs:
+            return f"I found {len(relevant_docs)} relevant documents. To get AI-generated answers, set OPENAI_API_KEY or LLM_PROVIDER=local."
+        return "No relevant documents found. The system is working but no documents have been added yet."
+    
+    def warmup(self):
+        """Load heavy dependencies and touch the vector store before serving"""
+        import pypdf  # noqa: F401 - imported here so the first ingest is not slowed down
+        self.retriever.embedder.generate_embedding("warmup")
+        self.retriever.get_stats()
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get system status and statistics"""
         stats = self.retriever.get_stats()
@@ -105,7 +237,8 @@ class RAGPipeline:
             "config": {
                 "chunk_size": self.config.CHUNK_SIZE,
                 "embedding_model": self.config.EMBEDDING_MODEL,
-                "llm_model": "OpenAI GPT (API key not configured)",
+                "llm_model": (f"{self.response_generator.provider.name}:{self.response_generator.model}"
+                              if self.response_generator is not None else "not configured"),
                 "max_retrieval_docs": self.config.MAX_RETRIEVAL_DOCS
             }
         }
@@ -129,6 +262,7 @@ def main():
     print("\nTo enable AI responses:")
     print("  1. Get OpenAI API key from https://platform.openai.com/api-keys")
     print("  2. Create .env file with: OPENAI_API_KEY=your_key_here")
+    print("  Or run a local model (Ollama / LM Studio) and set LLM_PROVIDER=local")
     
     # Demo query
     demo_query = "What is machine learning?"
@@ -0,0 +1,179 @@
+# src/monitoring/llm_logging.py
+"""
+Non-blocking structured logging of LLM requests and responses.
+
+Call sites only build a small dict and put it on a bounded queue through a
+`QueueHandler`; a `QueueListener` thread serializes each record as one
+compact JSON line and writes it through a size-rotated file handler.
+Full request/response payloads are kept for a sampled fraction of calls
+and every string in them is truncated, so log volume stays bounded.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from typing import Any, Dict, Optional
+
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
+
+MAX_PAYLOAD_ITEMS = 16
+
+
+def truncate_payload(value: Any, max_chars: int, max_items: int = MAX_PAYLOAD_ITEMS) -> Any:
+    """Cap strings at `max_chars` and lists at `max_items`, keeping the payload's structure"""
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}...[{len(value) - max_chars} more chars]"
+    if isinstance(value, dict):
+        return {key: truncate_payload(item, max_chars, max_items) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [truncate_payload(item, max_chars, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"...[{len(value) - max_items} more items]")
+        return items
+    return value
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Render a record's `llm_call` dict as one compact JSON line"""
+
+    def __init__(self, max_payload_chars: int = 2000):
+        super().__init__()
+        self.max_payload_chars = max_payload_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        # Rotating handlers format each record twice (size check, then write)
+        line = getattr(record, "llm_line", None)
+        if line is None:
+            entry = dict(record.llm_call)
+            for key in ("request", "response"):
+                if key in entry:
+                    entry[key] = truncate_payload(entry[key], self.max_payload_chars)
+            line = record.llm_line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers all formatting and drops records when the queue is full"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock handler formats (and copies) on the calling thread; the
+        # entry dict belongs to this record alone, so hand it over as-is
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("llm_log_dropped_total")
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room instead of failing on a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LLMCallLogger:
+    """Structured JSONL log of LLM calls written off the calling thread.
+
+    Disabled until `configure()` is given a path; while disabled `log_call`
+    returns immediately. Payloads are serialized later on the listener
+    thread, so callers must not mutate them after logging.
+    """
+
+    def __init__(self):
+        self.payload_sample_rate = 0.0
+        self._handler: Optional[DroppingQueueHandler] = None
+        self._listener: Optional[DrainingQueueListener] = None
+        self._file_handler: Optional[logging.Handler] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._handler is not None
+
+    def configure(self, path: Optional[str], max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  payload_sample_rate: float = 0.0, max_payload_chars: int = 2000,
+                  queue_size: int = 10000):
+        """Start logging to `path` (None disables), rotating at `max_bytes`"""
+        self.close()
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.payload_sample_rate = payload_sample_rate
+        self._file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self._file_handler.setFormatter(JsonLineFormatter(max_payload_chars))
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self._listener = DrainingQueueListener(log_queue, self._file_handler)
+        self._listener.start()
+        self._handler = DroppingQueueHandler(log_queue)
+
+    def log_call(self, kind: str, model: str, latency_seconds: float,
+                 prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                 request: Any = None, response: Any = None, error: Optional[BaseException] = None,
+                 **fields):
+        """Queue one call record; payloads are attached only for sampled calls"""
+        handler = self._handler
+        if handler is None:
+            return
+        entry: Dict[str, Any] = {
+            "ts": round(time.time(), 6),
+            "kind": kind,
+            "model": model,
+            "latency_ms": round(latency_seconds * 1000, 3),
+            "status": "error" if error is not None else "ok",
+        }
+        if prompt_tokens is not None:
+            entry["prompt_tokens"] = prompt_tokens
+        if completion_tokens is not None:
+            entry["completion_tokens"] = completion_tokens
+        trace_id = tracer.current_trace_id()
+        if trace_id:
+            entry["trace_id"] = trace_id
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        entry.update(fields)
+        if self.payload_sample_rate > 0 and random.random() < self.payload_sample_rate:
+            if request is not None:
+                entry["request"] = request
+            if response is not None:
+                entry["response"] = response
+        # A bare record skips the logger hierarchy and its caller lookup
+        record = logging.LogRecord(__name__, logging.INFO, "", 0, kind, None, None)
+        record.llm_call = entry
+        handler.handle(record)
+
+    def configure_from_config(self, config):
+        """Apply the LLM_LOG_* settings"""
+        self.configure(
+            config.LLM_LOG_FILE if config.LLM_LOG_ENABLED else None,
+            max_bytes=config.LLM_LOG_MAX_BYTES,
+            backup_count=config.LLM_LOG_BACKUP_COUNT,
+            payload_sample_rate=config.LLM_LOG_PAYLOAD_SAMPLE_RATE,
+            max_payload_chars=config.LLM_LOG_MAX_PAYLOAD_CHARS,
+        )
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        if self._listener is not None:
+            self._listener.stop()  # drains the queue before returning
+            self._listener.start()
+
+    def close(self):
+        """Write out queued records and stop the listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._file_handler.close()
+        self._handler = self._listener = self._file_handler = None
+
+
+# Shared call log used by the LLM call sites (disabled until configured)
+llm_call_log = LLMCallLogger()
@@ -0,0 +1,245 @@
+# src/monitoring/metrics.py
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple
+
+# Bucket boundaries (seconds) used for the Prometheus exposition
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                      0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bucket boundaries for size distributions such as requests per batch
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear latency histogram.
+
+    Values are recorded in microseconds into buckets that split every power
+    of two into `2 ** sub_bucket_bits` linear sub-buckets, so the relative
+    error of any reported percentile is bounded (< 1% with the default 7 bits)
+    while memory stays proportional to the number of distinct buckets hit.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_seconds = 0.0
+        self.min_seconds = math.inf
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _bucket_index(self, micros: int) -> int:
+        if micros < self.sub_bucket_count:
+            return micros
+        shift = micros.bit_length() - self.sub_bucket_bits - 1
+        return ((shift + 1) << self.sub_bucket_bits) + (micros >> shift) - self.sub_bucket_count
+
+    def _bucket_upper_seconds(self, index: int) -> float:
+        if index < self.sub_bucket_count:
+            return (index + 1) / 1e6
+        shift = (index >> self.sub_bucket_bits) - 1
+        sub = (index & (self.sub_bucket_count - 1)) + self.sub_bucket_count
+        return ((sub + 1) << shift) / 1e6
+
+    def record(self, seconds: float):
+        micros = max(0, int(seconds * 1e6))
+        index = self._bucket_index(micros)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.sum_seconds += seconds
+            self.min_seconds = min(self.min_seconds, seconds)
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def _sorted_buckets(self) -> List[Tuple[float, int]]:
+        with self._lock:
+            items = sorted(self.counts.items())
+        return [(self._bucket_upper_seconds(index), count) for index, count in items]
+
+    def percentile(self, pct: float) -> float:
+        """Return the latency (seconds) at the given percentile"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for upper, count in self._sorted_buckets():
+            seen += count
+            if seen >= target:
+                return min(upper, self.max_seconds)
+        return self.max_seconds
+
+    def cumulative_buckets(self, bounds=PROMETHEUS_BUCKETS) -> List[Tuple[float, int]]:
+        """Roll the fine-grained buckets up into cumulative `le` buckets"""
+        buckets = self._sorted_buckets()
+        result = []
+        position = 0
+        cumulative = 0
+        for bound in bounds:
+            while position < len(buckets) and buckets[position][0] <= bound:
+                cumulative += buckets[position][1]
+                position += 1
+            result.append((bound, cumulative))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(1000 * self.sum_seconds / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(1000 * self.percentile(50), 3),
+            "p95_ms": round(1000 * self.percentile(95), 3),
+            "p99_ms": round(1000 * self.percentile(99), 3),
+            "max_ms": round(1000 * self.max_seconds, 3),
+        }
+
+
+class ValueHistogram:
+    """Distribution of non-latency values (e.g. batch sizes) over fixed bucket bounds"""
+
+    def __init__(self, bounds=SIZE_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        with self._lock:
+            counts = list(self.counts)
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, counts):
+            cumulative += count
+            result.append((bound, cumulative))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "buckets": {f"le_{bound:g}": cumulative for bound, cumulative in self.cumulative_buckets()},
+        }
+
+
+class MetricsRegistry:
+    """Process-wide registry of per-stage latency histograms and counters"""
+
+    def __init__(self, namespace: str = "rag"):
+        self.namespace = namespace
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.value_histograms: Dict[str, ValueHistogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration for a pipeline stage"""
+        self.histogram(stage).record(seconds)
+
+    def observe_value(self, name: str, value: float, bounds=SIZE_BUCKETS):
+        """Record one value in the `name` distribution (bounds apply on first use)"""
+        histogram = self.value_histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.value_histograms.setdefault(name, ValueHistogram(bounds))
+        histogram.record(value)
+
+    def value_summary(self) -> Dict[str, Any]:
+        """Summary of every value distribution"""
+        with self._lock:
+            histograms = dict(self.value_histograms)
+        return {name: histogram.summary() for name, histogram in sorted(histograms.items())}
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Time the enclosed block; failures are counted per stage and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment("errors_total", stage=stage)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter_value(self, name: str, **labels) -> float:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        return self.counters.get(key, 0)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.value_histograms.clear()
+            self.counters.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact per-stage latency summary for /status"""
+        with self._lock:
+            stages = dict(self.histograms)
+        return {stage: histogram.summary() for stage, histogram in sorted(stages.items())}
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_stage_duration_seconds Latency of RAG pipeline stages",
+            f"# TYPE {ns}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self.histograms.items())
+            values = sorted(self.value_histograms.items())
+            counters = sorted(self.counters.items())
+
+        for stage, histogram in stages:
+            for bound, cumulative in histogram.cumulative_buckets():
+                lines.append(f'{ns}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{ns}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{ns}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.sum_seconds:.6f}')
+            lines.append(f'{ns}_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        for name, histogram in values:
+            metric = f"{ns}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, cumulative in histogram.cumulative_buckets():
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum {histogram.sum:g}")
+            lines.append(f"{metric}_count {histogram.count}")
+
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{ns}_{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{metric}{suffix} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used across the pipeline
+metrics = MetricsRegistry()
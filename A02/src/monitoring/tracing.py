@@ -0,0 +1,342 @@
+# src/monitoring/tracing.py
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Span currently active in this request/task (None, a Span, or _UNSAMPLED)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+# Queued after the last span to stop a BatchSpanProcessor's worker
+_SHUTDOWN = object()
+
+
+class Span:
+    """A single timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns",
+                 "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace-context header value for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# Marker stored in the context when the enclosing trace was not sampled
+_UNSAMPLED = object()
+
+
+class JsonLinesExporter:
+    """Append finished spans to a local JSON-lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), separators=(",", ":"), default=str) + "\n")
+
+
+class OTLPHttpExporter:
+    """Send finished spans to an OTLP/HTTP collector using the JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str = "academic-rag", timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _encode(self, spans: List[Span]) -> bytes:
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+                "status": {"code": 2 if span.status == "error" else 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "src.monitoring.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+        return json.dumps(body).encode()
+
+    def export(self, spans: List[Span]):
+        request = urllib.request.Request(
+            self.endpoint, data=self._encode(spans),
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class BatchSpanProcessor:
+    """Queue finished spans and export them in batches from a background thread"""
+
+    def __init__(self, exporter, max_queue_size: int = 2048, batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_spans = 0
+        self._stopped = False
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    def on_end(self, span: Span):
+        if self._stopped:  # a span that ended while its tracer was reconfigured
+            self.dropped_spans += 1
+            return
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped_spans += 1
+
+    def _export(self, batch: List[Span]):
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    def _run(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                span = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                span = None
+            else:
+                if span is None or span is _SHUTDOWN:  # flush request
+                    self._export(batch)
+                    batch = []
+                    self._queue.task_done()
+                    if span is _SHUTDOWN:
+                        return
+                    continue
+                batch.append(span)
+                self._queue.task_done()
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._export(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def flush(self):
+        """Block until every queued span has been exported"""
+        self._queue.put(None)
+        self._queue.join()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Export the queued spans and stop the worker thread"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(_SHUTDOWN)
+        self._worker.join(timeout)
+
+
+class Tracer:
+    """Lightweight tracer with head sampling and contextvar propagation.
+
+    The sampling decision is made once per trace (at the root span or from an
+    incoming `traceparent` header) and inherited by every child span, so
+    unsampled requests only pay for a context-variable lookup.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, processor: Optional[BatchSpanProcessor] = None):
+        self.sample_rate = sample_rate
+        self.processor = processor
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None and self.sample_rate > 0
+
+    def configure(self, exporter=None, sample_rate: Optional[float] = None):
+        """Install an exporter (None disables tracing) and/or change the sample rate.
+
+        The previous processor exports what it has queued and stops.
+        """
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        previous = self.processor
+        self.processor = BatchSpanProcessor(exporter) if exporter is not None else None
+        if previous is not None:
+            previous.shutdown()
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        span = _current_span.get()
+        return span if isinstance(span, Span) else None
+
+    def current_trace_id(self) -> Optional[str]:
+        span = self.current_span()
+        return span.trace_id if span else None
+
+    @contextmanager
+    def start_span(self, name: str, traceparent: Optional[str] = None, **attributes):
+        """Start a span as a child of the current one (or of `traceparent`)"""
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            yield None
+            return
+
+        trace_id = parent_id = None
+        if isinstance(parent, Span):
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif traceparent:
+            parsed = parse_traceparent(traceparent)
+            if parsed:
+                trace_id, parent_id, sampled = parsed
+                if not sampled:
+                    token = _current_span.set(_UNSAMPLED)
+                    try:
+                        yield None
+                    finally:
+                        _current_span.reset(token)
+                    return
+
+        if trace_id is None:
+            if random.random() >= self.sample_rate:
+                token = _current_span.set(_UNSAMPLED)
+                try:
+                    yield None
+                finally:
+                    _current_span.reset(token)
+                return
+            trace_id = "%032x" % random.getrandbits(128)
+
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.attributes["error"] = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.processor.on_end(span)
+
+    def open_span(self, name: str, **attributes) -> Optional[Span]:
+        """Start a child of the current span without making it current.
+
+        For work resumed in several contexts, such as a generator that a
+        server drives from a thread pool; the caller ends it with `end_span`.
+        """
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return None
+        if isinstance(parent, Span):
+            return Span(name, parent.trace_id, parent.span_id, attributes)
+        if random.random() >= self.sample_rate:
+            return None
+        return Span(name, "%032x" % random.getrandbits(128), None, attributes)
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        """Finish a span from `open_span` and queue it for export"""
+        if span is None:
+            return
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = str(error)
+        span.end_ns = time.time_ns()
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    def flush(self):
+        if self.processor is not None:
+            self.processor.flush()
+
+
+def parse_traceparent(header: str):
+    """Parse a W3C traceparent header into (trace_id, parent_span_id, sampled)"""
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+def exporter_from_config(config):
+    """Build the span exporter selected by configuration, or None when disabled"""
+    if not config.TRACING_ENABLED:
+        return None
+    if config.TRACE_EXPORTER == "otlp":
+        return OTLPHttpExporter(config.OTLP_ENDPOINT)
+    return JsonLinesExporter(config.TRACE_FILE)
+
+
+# Shared tracer used across the pipeline (disabled until configured)
+tracer = Tracer()
@@ -1,9 +1,11 @@
 # src/retrieval/response_generator.py
 import logging
-from typing import List, Dict, Any
-from openai import OpenAI
+import time
+from typing import List, Dict, Any, Iterator
 import os
 from dotenv import load_dotenv
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
 
 load_dotenv()
 
@@ -12,40 +14,88 @@ logger = logging.getLogger(__name__)
 class ResponseGenerator:
     """Generate responses using LLM based on retrieved documents"""
     
-    def __init__(self, config):
+    NO_DOCUMENTS_ANSWER = "I couldn't find any relevant information in the knowledge base to answer your question."
+    
+    def __init__(self, config, client=None, caller=None, provider=None):
+        from src.clients.llm_providers import OpenAICompatibleProvider, get_provider
+        from src.clients.openai_client import get_openai_client, get_caller, estimate_tokens
         self.config = config
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-        self.model = config.LLM_MODEL
+        if provider is None and (client is not None or caller is not None):
+            provider = OpenAICompatibleProvider("openai", config.LLM_MODEL,
+                                                client or get_openai_client(), caller or get_caller("chat"))
+        # Shared pooled provider (config.LLM_PROVIDER); retries and limits live in its caller
+        self.provider = provider or get_provider()
+        self._estimate_tokens = estimate_tokens
+        self.model = self.provider.model
         
     def generate_response(self, question: str, documents: List[Dict[str, Any]]) -> str:
         """Generate a response using LLM based on retrieved documents"""
         try:
             if not documents:
-                return "I couldn't find any relevant information in the knowledge base to answer your question."
+                return self.NO_DOCUMENTS_ANSWER
             
-            # Prepare context from documents
-            context = self._prepare_context(documents)
-            
-            # Create prompt
-            prompt = self._create_prompt(question, context)
+            messages, tokens = self._answer_messages(question, documents)
             
             # Generate response
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an academic research assistant. Provide accurate, well-supported answers based on the provided context."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.config.TEMPERATURE,
-                max_tokens=500
-            )
+            with tracer.start_span("llm.chat_completion", model=self.model, provider=self.provider.name), \
+                    metrics.time_stage("generation"):
+                result = self.provider.complete(messages, temperature=self.config.TEMPERATURE,
+                                                max_tokens=500, tokens=tokens, kind="chat")
+            if result.prompt_tokens is not None:
+                metrics.increment("llm_tokens_total", result.prompt_tokens, kind="prompt")
+            if result.completion_tokens is not None:
+                metrics.increment("llm_tokens_total", result.completion_tokens, kind="completion")
             
-            return response.choices[0].message.content
+            return result.text
             
         except Exception as e:
             logger.error(f"Error generating response: {e}")
             return f"I encountered an error while generating a response: {str(e)}"
     
+    def stream_response(self, question: str, documents: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the response text as the LLM generates it"""
+        if not documents:
+            yield self.NO_DOCUMENTS_ANSWER
+            return
+        
+        messages, tokens = self._answer_messages(question, documents)
+        start = time.perf_counter()
+        first_token = True
+        # StreamingResponse resumes this generator in a different context for each
+        # chunk, so the span is never made current (its reset would fail across yields)
+        span = tracer.open_span("llm.chat_completion", model=self.model, provider=self.provider.name,
+                                stream=True)
+        error = None
+        try:
+            for delta in self.provider.stream(messages, temperature=self.config.TEMPERATURE,
+                                              max_tokens=500, tokens=tokens, kind="chat"):
+                if first_token:
+                    metrics.observe("generation_first_token", time.perf_counter() - start)
+                    first_token = False
+                yield delta
+            metrics.observe("generation", time.perf_counter() - start)
+        except Exception as e:
+            error = e
+            logger.error(f"Error streaming response: {e}")
+            yield f"I encountered an error while generating a response: {str(e)}"
+        finally:
+            tracer.end_span(span, error)
+    
+    def _answer_messages(self, question: str, documents: List[Dict[str, Any]]):
+        """Chat messages answering `question` from `documents`, with their estimated token cost"""
+        with tracer.start_span("response_generator.prompt_build"), \
+                metrics.time_stage("prompt_build"):
+            # Prepare context from documents
+            context = self._prepare_context(documents)
+            
+            # Create prompt
+            prompt = self._create_prompt(question, context)
+        messages = [
+            {"role": "system", "content": "You are an academic research assistant. Provide accurate, well-supported answers based on the provided context."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, self._estimate_tokens(prompt) + 500
+    
     def _prepare_context(self, documents: List[Dict[str, Any]]) -> str:
         """Prepare context string from retrieved documents"""
         context_parts = []
@@ -93,18 +143,19 @@ Answer:"""
             Provide scores and brief reasoning.
             """
             
-            evaluation = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            evaluation = self.provider.complete(
+                [
                     {"role": "system", "content": "You are an evaluation assistant. Provide honest, constructive feedback."},
                     {"role": "user", "content": evaluation_prompt}
                 ],
                 temperature=0.1,
-                max_tokens=300
+                max_tokens=300,
+                tokens=self._estimate_tokens(evaluation_prompt) + 300,
+                kind="evaluation"
             )
             
             return {
-                "evaluation": evaluation.choices[0].message.content,
+                "evaluation": evaluation.text,
                 "documents_used": len(documents)
             }
             
@@ -115,9 +166,10 @@ Answer:"""
 # Test the response generator
 if __name__ == "__main__":
     from config import config
+    from src.clients.llm_providers import provider_configured
     
-    if not config.OPENAI_API_KEY:
-        print("❌ OPENAI_API_KEY not set. Please add it to your .env file")
+    if not provider_configured():
+        print("❌ OPENAI_API_KEY not set. Please add it to your .env file, or set LLM_PROVIDER=local")
     else:
         generator = ResponseGenerator(config)
         test_question = "What is machine learning?"
@@ -1,8 +1,14 @@
 # src/retrieval/retriever.py
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.embedding.embedder import EmbeddingGenerator
+from src.embedding.micro_batcher import EmbeddingMicroBatcher
+from src.vector_store.centroids import DOCUMENT_LEVEL, PAGE_LEVEL, CentroidIndex
 from src.vector_store.chroma_manager import ChromaDBManager
+from src.vector_store.filters import build_where_clause
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -11,36 +17,114 @@ class DocumentRetriever:
     
     def __init__(self, config):
         self.config = config
-        self.embedder = EmbeddingGenerator(model_type="dummy")  # Use dummy for now
+        self.embedder = EmbeddingGenerator(model_type=config.EMBEDDING_PROVIDER)
         self.vector_store = ChromaDBManager(
             db_path=config.VECTOR_DB_PATH,
-            collection_name=config.COLLECTION_NAME
+            collection_name=config.COLLECTION_NAME,
+            server_host=config.CHROMA_SERVER_HOST,
+            server_port=config.CHROMA_SERVER_PORT
         )
+        # Per-document and per-page centroids, kept up to date as chunks are stored
+        self.centroids = CentroidIndex(self.vector_store) if config.CENTROIDS_ENABLED else None
+        # Concurrent queries share embedding requests; local dummy vectors gain nothing from batching
+        self.query_batcher = None
+        if config.EMBEDDING_MICROBATCH_ENABLED and self.embedder.model_type == "openai":
+            self.query_batcher = EmbeddingMicroBatcher(
+                self.embedder,
+                max_batch_size=config.EMBEDDING_MICROBATCH_MAX_SIZE,
+                max_wait_seconds=config.EMBEDDING_MICROBATCH_MAX_WAIT_MS / 1000,
+                max_in_flight=config.EMBEDDING_MICROBATCH_IN_FLIGHT
+            )
     
     def add_documents(self, documents: List[Dict[str, Any]]):
         """Add documents to the vector database"""
         logger.info(f"Adding {len(documents)} documents to vector store")
         
+        if self.embedder.model_type == "openai" and self.embedder.concurrency > 1:
+            from src.clients.openai_client import run_coroutine_sync
+            run_coroutine_sync(self.add_documents_async(documents))
+            return
+        
         # Extract text content for embedding
         texts = [doc['content'] for doc in documents]
         
-        # Generate embeddings
-        embeddings = self.embedder.generate_embeddings_batch(texts)
-        
-        # Add to vector store
-        self.vector_store.add_documents(documents, embeddings)
+        with tracer.start_span("retriever.add_documents", documents=len(documents)):
+            # Generate embeddings
+            with metrics.time_stage("embed"):
+                embeddings = self.embedder.generate_embeddings_batch(texts)
+            metrics.increment("embeddings_total", len(embeddings))
+            
+            # Add to vector store
+            with metrics.time_stage("store"):
+                self.vector_store.add_documents(documents, embeddings)
+                if self.centroids is not None:
+                    self.centroids.add(documents, embeddings)
         
         logger.info(f"Successfully added {len(documents)} documents")
     
-    def retrieve(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Retrieve relevant documents for a query"""
-        logger.info(f"Retrieving documents for query: '{query}'")
+    async def add_documents_async(self, documents: List[Dict[str, Any]]):
+        """Embed with several requests in flight and store batches as they complete.
+        
+        Batches arrive in input order; each is written on a worker thread while
+        the next ones are still being embedded. At most one write is pending,
+        so the collection sees a single ordered writer.
+        """
+        texts = [doc['content'] for doc in documents]
+        pending_write = None
+        stored = 0
+        
+        with tracer.start_span("retriever.add_documents_async", documents=len(documents),
+                               concurrency=self.embedder.concurrency):
+            with metrics.time_stage("embed"):
+                async for start, embeddings in self.embedder.iter_embedding_batches(texts):
+                    metrics.increment("embeddings_total", len(embeddings))
+                    if pending_write is not None:
+                        stored += await pending_write
+                    pending_write = asyncio.ensure_future(asyncio.to_thread(
+                        self._store_batch, documents[start:start + len(embeddings)], embeddings
+                    ))
+            if pending_write is not None:
+                stored += await pending_write
+        
+        logger.info(f"Successfully added {stored} documents")
+    
+    def _store_batch(self, documents: List[Dict[str, Any]], embeddings: List[List[float]]) -> int:
+        with metrics.time_stage("store"):
+            self.vector_store.add_documents(documents, embeddings)
+            if self.centroids is not None:
+                self.centroids.add(documents, embeddings)
+        return len(documents)
+    
+    def retrieve(self, query: str, top_k: int = 5,
+                 filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Retrieve relevant documents for a query.
         
-        # Generate query embedding
-        query_embedding = self.embedder.generate_embedding(query)
+        `filters` accepts the keyword arguments of `build_where_clause`
+        (source, page_min, page_max, metadata) and is pushed down into the
+        vector store rather than applied to the top-k afterwards.
+        """
+        logger.info(f"Retrieving documents for query: '{query}'")
+        where = build_where_clause(**filters) if filters else None
         
-        # Search vector database
-        results = self.vector_store.search_similar(query_embedding, top_k=top_k)
+        with tracer.start_span("retriever.retrieve", top_k=top_k):
+            # Generate query embedding
+            with metrics.time_stage("query_embed"):
+                if self.query_batcher is not None:
+                    query_embedding = self.query_batcher.embed(query)
+                else:
+                    query_embedding = self.embedder.generate_embedding(query)
+            
+            # Narrow the search to the nearest documents first (unfiltered queries only)
+            candidates = None
+            if where is None and self._use_hierarchical():
+                with metrics.time_stage("route"):
+                    where, candidates = self.centroids.candidate_filter(
+                        query_embedding, self.config.HIERARCHICAL_LEVEL, self._route_width())
+            
+            # Search vector database
+            with metrics.time_stage("search"):
+                results = self.vector_store.search_similar(query_embedding, top_k=top_k, where=where,
+                                                           candidate_count=candidates)
         
         # Format results
         retrieved_docs = []
@@ -55,10 +139,36 @@ class DocumentRetriever:
         logger.info(f"Retrieved {len(retrieved_docs)} documents")
         return retrieved_docs
     
+    def _use_hierarchical(self) -> bool:
+        """Two-stage retrieval pays off once the corpus spans enough documents"""
+        return (self.config.HIERARCHICAL_RETRIEVAL and self.centroids is not None
+                and self.centroids.count() >= self.config.HIERARCHICAL_MIN_DOCUMENTS)
+    
+    def _route_width(self) -> int:
+        if self.config.HIERARCHICAL_LEVEL == PAGE_LEVEL:
+            return self.config.HIERARCHICAL_TOP_PAGES
+        return self.config.HIERARCHICAL_TOP_DOCUMENTS
+    
+    def remove_source(self, source: str) -> int:
+        """Delete a source's stored chunks and centroids before a new version of it is ingested"""
+        if self.centroids is not None:
+            self.centroids.remove_source(source)
+        return self.vector_store.delete_source(source)
+    
+    def refresh(self):
+        """Pick up index changes committed by another process"""
+        self.vector_store.refresh()
+        if self.centroids is not None:
+            self.centroids.refresh()
+    
     def get_stats(self):
         """Get statistics about the vector store"""
         count = self.vector_store.get_collection_info()
-        return {"document_count": count}
+        stats = {"document_count": count}
+        if self.centroids is not None:
+            stats["centroids"] = {"documents": self.centroids.count(DOCUMENT_LEVEL),
+                                  "pages": self.centroids.count(PAGE_LEVEL)}
+        return stats
 
 # Test the retriever
 if __name__ == "__main__":
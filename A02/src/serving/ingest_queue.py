@@ -0,0 +1,130 @@
+# src/serving/ingest_queue.py
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """File-backed job queue handing ingest work to the single writer process.
+
+    Jobs move between `pending/`, `processing/` and `done/` with atomic
+    renames, so any number of API workers can enqueue while exactly one
+    ingest worker claims and processes them.
+    """
+
+    def __init__(self, queue_dir: str):
+        self.queue_dir = queue_dir
+        self.pending_dir = os.path.join(queue_dir, "pending")
+        self.processing_dir = os.path.join(queue_dir, "processing")
+        self.done_dir = os.path.join(queue_dir, "done")
+        for directory in (self.pending_dir, self.processing_dir, self.done_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def enqueue(self, file_path: str) -> str:
+        """Queue a document for ingestion and return its job id"""
+        # Time-ordered ids keep processing roughly first-in, first-out
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        job = {"job_id": job_id, "file_path": os.path.abspath(file_path),
+               "status": "pending", "enqueued_at": time.time()}
+        self._write_json(os.path.join(self.pending_dir, f"{job_id}.json"), job)
+        logger.info(f"Queued ingest job {job_id} for {file_path}")
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Claim the oldest pending job, or return None when the queue is empty"""
+        for name in sorted(os.listdir(self.pending_dir)):
+            if not name.endswith(".json"):
+                continue
+            source = os.path.join(self.pending_dir, name)
+            target = os.path.join(self.processing_dir, name)
+            try:
+                os.rename(source, target)
+            except FileNotFoundError:
+                continue  # claimed by someone else
+            with open(target, encoding="utf-8") as f:
+                job = json.load(f)
+            job["status"] = "processing"
+            return job
+        return None
+
+    def complete(self, job: Dict[str, Any], success: bool, error: Optional[str] = None):
+        """Record the outcome of a claimed job"""
+        job = dict(job, status="succeeded" if success else "failed",
+                   error=error, completed_at=time.time())
+        name = f"{job['job_id']}.json"
+        self._write_json(os.path.join(self.done_dir, name), job)
+        try:
+            os.remove(os.path.join(self.processing_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def requeue_stale(self):
+        """Return jobs left in processing/ by a crashed writer to the queue"""
+        for name in os.listdir(self.processing_dir):
+            if name.endswith(".json"):
+                os.rename(os.path.join(self.processing_dir, name),
+                          os.path.join(self.pending_dir, name))
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id in any state"""
+        name = f"{job_id}.json"
+        for directory, state in ((self.done_dir, None), (self.processing_dir, "processing"),
+                                 (self.pending_dir, "pending")):
+            path = os.path.join(directory, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    job = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if state:
+                job["status"] = state
+            return job
+        return None
+
+
+class IndexVersion:
+    """Monotonic counter the writer bumps after each committed ingest.
+
+    Readers compare the file's mtime/contents with the last value they saw
+    and refresh their cached views of the index when it changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._last_mtime_ns = -1
+        self._last_version = 0
+
+    def read(self) -> int:
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+        if mtime_ns != self._last_mtime_ns:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._last_version = int(f.read().strip() or 0)
+                self._last_mtime_ns = mtime_ns
+            except (ValueError, FileNotFoundError):
+                pass
+        return self._last_version
+
+    def bump(self) -> int:
+        version = self.read() + 1
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(version))
+        os.replace(tmp_path, self.path)
+        return version
@@ -0,0 +1,80 @@
+# src/serving/ingest_worker.py
+"""
+Single-writer ingestion process
+Run with: python -m src.serving.ingest_worker
+
+Claims jobs queued by the API workers, ingests them through RAGPipeline and
+bumps the shared index version so query workers refresh.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import config
+from src.serving.ingest_queue import IngestQueue, IndexVersion
+
+logger = logging.getLogger(__name__)
+
+
+class IngestWorker:
+    """Drain the ingest queue, committing one document at a time"""
+
+    def __init__(self, pipeline, queue: IngestQueue, index_version: IndexVersion,
+                 poll_interval: float = 0.5):
+        self.pipeline = pipeline
+        self.queue = queue
+        self.index_version = index_version
+        self.poll_interval = poll_interval
+
+    def process_one(self) -> bool:
+        """Process the next pending job; return False when the queue is empty"""
+        job = self.queue.claim()
+        if job is None:
+            return False
+
+        logger.info(f"Processing ingest job {job['job_id']}: {job['file_path']}")
+        try:
+            success = self.pipeline.ingest_document(job['file_path'])
+            error = None if success else "Ingestion failed, see ingest worker logs"
+        except Exception as e:
+            success, error = False, str(e)
+
+        if success:
+            version = self.index_version.bump()
+            logger.info(f"Committed job {job['job_id']} (index version {version})")
+        self.queue.complete(job, success, error)
+        return True
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None):
+        self.queue.requeue_stale()
+        logger.info(f"Ingest worker watching {self.queue.queue_dir}")
+        while stop_event is None or not stop_event.is_set():
+            if not self.process_one():
+                time.sleep(self.poll_interval)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    from src.main import RAGPipeline
+
+    worker = IngestWorker(
+        pipeline=RAGPipeline(),
+        queue=IngestQueue(config.INGEST_QUEUE_DIR),
+        index_version=IndexVersion(config.INDEX_VERSION_FILE)
+    )
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Ingest worker stopped")
+
+
+if __name__ == "__main__":
+    main()
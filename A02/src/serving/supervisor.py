@@ -0,0 +1,90 @@
+# src/serving/supervisor.py
+import logging
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+from config import config
+from src.vector_store.chroma_manager import ensure_metadata_indexes
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def start_chroma_server(db_path: str, host: str, port: int, timeout: float = 60.0) -> subprocess.Popen:
+    """Start a local Chroma server that owns `db_path` and wait for its heartbeat"""
+    env = dict(os.environ, IS_PERSISTENT="TRUE", PERSIST_DIRECTORY=db_path,
+               ANONYMIZED_TELEMETRY="FALSE")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "chromadb.app:app",
+         "--host", host, "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=PROJECT_ROOT
+    )
+    deadline = time.monotonic() + timeout
+    url = f"http://{host}:{port}/api/v1/heartbeat"
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Chroma server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                logger.info(f"Chroma server ready at {host}:{port} over {db_path}")
+                return process
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise TimeoutError("Chroma server did not become ready")
+
+
+def serving_environment(chroma_host: str, chroma_port: int) -> Dict[str, str]:
+    """Environment shared by the writer and every query worker"""
+    return {
+        "CHROMA_SERVER_HOST": chroma_host,
+        "CHROMA_SERVER_PORT": str(chroma_port),
+        "INGEST_MODE": "queue",
+        "INGEST_QUEUE_DIR": config.INGEST_QUEUE_DIR,
+        "VECTOR_DB_PATH": config.VECTOR_DB_PATH,
+    }
+
+
+def serve_multiprocess(workers: int, host: str = None, port: int = None):
+    """Run N query workers plus one ingest writer over a shared Chroma server.
+
+    Process layout:
+      - one Chroma server process, the only process that opens VECTOR_DB_PATH
+      - one ingest worker, the only process that writes to the collection
+      - N uvicorn workers serving queries through Chroma's HTTP client and
+        queueing uploads for the ingest worker
+    """
+    import uvicorn
+
+    host = host or config.API_HOST
+    port = port or config.API_PORT
+    chroma_host = "127.0.0.1"
+    chroma_port = config.CHROMA_SERVER_PORT
+
+    children: List[subprocess.Popen] = []
+    try:
+        children.append(start_chroma_server(config.VECTOR_DB_PATH, chroma_host, chroma_port))
+        ensure_metadata_indexes(config.VECTOR_DB_PATH)
+
+        # Query workers and the writer inherit this environment, so every
+        # process reads the same serving settings when it imports config
+        os.environ.update(serving_environment(chroma_host, chroma_port))
+        children.append(subprocess.Popen(
+            [sys.executable, "-m", "src.serving.ingest_worker"], cwd=PROJECT_ROOT
+        ))
+
+        uvicorn.run("src.api.app:app", host=host, port=port, workers=workers)
+    finally:
+        for child in reversed(children):
+            child.terminate()
+        for child in children:
+            try:
+                child.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                child.kill()
@@ -0,0 +1,211 @@
+# src/vector_store/bulk_import.py
+"""
+Bulk import of pre-chunked corpora into ChromaDBManager.
+
+Rows are streamed from JSONL or Parquet in fixed-size batches, so memory
+stays bounded by the batch size regardless of corpus size. Each row needs
+chunk text (`content` or `text`); `id`, `metadata` and `embedding` are
+optional, and remaining scalar columns become metadata. Rows without an
+embedding are embedded with the configured embedder; rows that carry one
+are written as-is, skipping chunking and embedding entirely.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.monitoring.metrics import metrics
+from src.vector_store.chroma_manager import drop_metadata_indexes, ensure_metadata_indexes
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ("content", "text")
+RESERVED_FIELDS = ("id", "metadata", "embedding") + TEXT_FIELDS
+
+
+class ImportStats:
+    """Progress of one bulk import"""
+
+    def __init__(self):
+        self.rows = 0
+        self.skipped = 0
+        self.embedded = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def iter_jsonl_batches(path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of at most `batch_size` parsed JSONL rows"""
+    batch = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from e
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def iter_parquet_batches(path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of rows, reading one Parquet record batch at a time"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet import requires pyarrow (pip install pyarrow)") from e
+    parquet_file = pq.ParquetFile(path)
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield record_batch.to_pylist()
+
+
+def iter_row_batches(path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return iter_jsonl_batches(path, batch_size)
+    if extension == ".parquet":
+        return iter_parquet_batches(path, batch_size)
+    raise ValueError(f"Unsupported bulk import format '{extension}' (use .jsonl or .parquet)")
+
+
+def _row_id(row: Dict[str, Any], text: str, source: str) -> str:
+    if row.get("id") is not None:
+        return str(row["id"])
+    # Stable ids keep re-runs idempotent when the source has none
+    return hashlib.sha1(f"{source}\0{text}".encode()).hexdigest()
+
+
+def _row_metadata(row: Dict[str, Any], source: str) -> Dict[str, Any]:
+    metadata = dict(row.get("metadata") or {})
+    metadata.update({k: v for k, v in row.items() if k not in RESERVED_FIELDS})
+    # Chroma only stores scalar metadata and rejects empty metadata dicts
+    metadata = {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))}
+    metadata.setdefault("source", source)
+    metadata.setdefault("filename", os.path.basename(str(metadata["source"])))
+    return metadata
+
+
+def prefetch(batches: Iterator[List[Dict[str, Any]]], depth: int = 1,
+             poll_seconds: float = 0.1) -> Iterator[List[Dict[str, Any]]]:
+    """Read ahead on a background thread; at most `depth` batches wait in memory.
+
+    Closing the iterator, which a failing consumer does on the way out, stops
+    the reader instead of leaving it blocked on a full buffer.
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=poll_seconds)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+        except BaseException as e:  # re-raised in the consumer
+            put(e)
+            return
+        put(done)
+
+    threading.Thread(target=reader, name="bulk-import-reader", daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def bulk_import(manager, path: str, batch_size: int = 5000, embedder=None,
+                progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """Stream `path` into `manager` in batches of `batch_size` rows.
+
+    For a local store the metadata indexes are dropped for the duration of
+    the load and rebuilt once at the end, which is cheaper than maintaining
+    them row by row.
+    """
+    local = getattr(manager, "is_local", False)
+    if local:
+        drop_metadata_indexes(manager.db_path)
+    try:
+        return _import_rows(manager, path, batch_size, embedder, progress)
+    finally:
+        if local:
+            ensure_metadata_indexes(manager.db_path)
+
+
+def _import_rows(manager, path: str, batch_size: int, embedder,
+                 progress: Optional[Callable[[ImportStats], None]]) -> ImportStats:
+    stats = ImportStats()
+    start = time.perf_counter()
+    batches = prefetch(iter_row_batches(path, batch_size))
+    with closing(batches):  # stops the reader if a batch fails
+        for rows in batches:
+            ids, contents, metadatas, embeddings = [], [], [], []
+            positions: Dict[str, int] = {}
+            for row in rows:
+                text = next((row[field] for field in TEXT_FIELDS if isinstance(row.get(field), str)), None)
+                if not text or not text.strip():
+                    stats.skipped += 1
+                    continue
+                row_id = _row_id(row, text, path)
+                embedding = row.get("embedding")
+                record = (text, _row_metadata(row, path), list(embedding) if embedding is not None else None)
+                if row_id in positions:
+                    # Chroma rejects duplicate ids within one call; the last row wins
+                    stats.skipped += 1
+                    i = positions[row_id]
+                    contents[i], metadatas[i], embeddings[i] = record
+                    continue
+                positions[row_id] = len(ids)
+                ids.append(row_id)
+                contents.append(record[0])
+                metadatas.append(record[1])
+                embeddings.append(record[2])
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+            if missing:
+                if embedder is None:
+                    raise ValueError(f"{len(missing)} rows have no embedding and no embedder was given")
+                vectors = embedder.generate_embeddings_batch([contents[i] for i in missing])
+                for i, vector in zip(missing, vectors):
+                    embeddings[i] = vector
+                stats.embedded += len(missing)
+
+            if ids:
+                with metrics.time_stage("bulk_import"):
+                    manager.upsert_records(ids, contents, metadatas, embeddings)
+            stats.rows += len(ids)
+            stats.seconds = time.perf_counter() - start
+            metrics.increment("bulk_import_rows_total", len(ids))
+            if progress:
+                progress(stats)
+
+    stats.seconds = time.perf_counter() - start
+    logger.info(f"Imported {stats.rows} rows from {path} in {stats.seconds:.1f}s "
+                f"({stats.rows_per_second:.0f} rows/s, {stats.skipped} skipped)")
+    return stats
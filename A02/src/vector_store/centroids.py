@@ -0,0 +1,168 @@
+# src/vector_store/centroids.py
+"""
+Per-document and per-page centroid vectors for two-stage retrieval.
+
+Alongside the chunk collection, two small collections hold one record per
+document (`<collection>_documents`) and one per page (`<collection>_pages`).
+Each record stores the mean embedding of the chunks it covers and their
+count, so centroids can be merged batch by batch as a document streams in.
+Re-ingesting a source removes its centroids first, so the new version is
+not merged into the old one.
+Both collections use cosine distance, which ignores how far the mean has
+shrunk towards the origin.
+
+At query time `candidate_filter` finds the documents (or pages) closest to
+the query and returns a `where` clause limiting the chunk search to them.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.monitoring.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_LEVEL = "document"
+PAGE_LEVEL = "page"
+
+
+def _page_id(source: str, page: Any) -> str:
+    return f"{source}#{page}"
+
+
+class CentroidIndex:
+    """Document and page centroids of a `ChromaDBManager` collection"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.refresh()
+
+    def _collection(self, level: str):
+        return self.manager.client.get_or_create_collection(
+            name=f"{self.manager.collection_name}_{level}s",
+            metadata={"hnsw:space": "cosine", "description": f"Per-{level} centroids"}
+        )
+
+    def refresh(self):
+        """Re-resolve the collection handles after another process changed the index"""
+        self.documents = self._collection(DOCUMENT_LEVEL)
+        self.pages = self._collection(PAGE_LEVEL)
+
+    def _level(self, level: str):
+        if level == DOCUMENT_LEVEL:
+            return self.documents
+        if level == PAGE_LEVEL:
+            return self.pages
+        raise ValueError(f"Unknown centroid level '{level}'; expected '{DOCUMENT_LEVEL}' or '{PAGE_LEVEL}'")
+
+    def count(self, level: str = DOCUMENT_LEVEL) -> int:
+        return self._level(level).count()
+
+    @staticmethod
+    def _group(documents: List[Dict[str, Any]], embeddings,
+               level: str) -> Dict[str, Tuple[Dict[str, Any], Any, int]]:
+        """Sum embeddings per document or page: id -> (metadata, vector sum, chunk count)"""
+        import numpy as np
+        groups: Dict[str, Tuple[Dict[str, Any], Any, int]] = {}
+        for document, embedding in zip(documents, embeddings):
+            metadata = document['metadata']
+            source = metadata.get('source')
+            if source is None or (level == PAGE_LEVEL and metadata.get('page') is None):
+                continue
+            key = source if level == DOCUMENT_LEVEL else _page_id(source, metadata['page'])
+            vector = np.asarray(embedding, dtype=np.float64)
+            if key in groups:
+                meta, total, count = groups[key]
+                groups[key] = (meta, total + vector, count + 1)
+            else:
+                meta = {"source": source, "filename": metadata.get('filename', source)}
+                if level == PAGE_LEVEL:
+                    meta["page"] = metadata['page']
+                groups[key] = (meta, vector, 1)
+        return groups
+
+    def _merge(self, collection, groups: Dict[str, Tuple[Dict[str, Any], Any, int]]):
+        """Fold new chunk sums into the stored centroids and upsert the results"""
+        if not groups:
+            return
+        import numpy as np
+        ids = list(groups)
+        existing = collection.get(ids=ids, include=["embeddings", "metadatas"])
+        stored = {record_id: (np.asarray(embedding), metadata['chunks'])
+                  for record_id, embedding, metadata in zip(existing['ids'], existing['embeddings'],
+                                                             existing['metadatas'])}
+        embeddings, metadatas = [], []
+        for record_id in ids:
+            metadata, total, count = groups[record_id]
+            if record_id in stored:
+                centroid, stored_count = stored[record_id]
+                total = total + centroid * stored_count
+                count += stored_count
+            embeddings.append((total / count).tolist())
+            metadatas.append({**metadata, "chunks": count})
+        collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=ids)
+
+    def add(self, documents: List[Dict[str, Any]], embeddings):
+        """Update document and page centroids with newly stored chunks"""
+        with tracer.start_span("centroids.add", documents=len(documents)):
+            for level in (DOCUMENT_LEVEL, PAGE_LEVEL):
+                self._merge(self._level(level), self._group(documents, embeddings, level))
+
+    def remove_source(self, source: str):
+        """Drop a source's document and page centroids before a new version of it is stored"""
+        with tracer.start_span("centroids.remove_source"):
+            self.documents.delete(ids=[source])
+            self.pages.delete(where={"source": source})
+
+    def rebuild(self, batch_size: int = 5000) -> Dict[str, int]:
+        """Recompute every centroid from the chunk collection (after bulk imports or snapshots)"""
+        start = time.perf_counter()
+        client = self.manager.client
+        for level in (DOCUMENT_LEVEL, PAGE_LEVEL):
+            try:
+                client.delete_collection(f"{self.manager.collection_name}_{level}s")
+            except ValueError:
+                pass  # never created
+        self.refresh()
+        collection = self.manager.collection
+        count = collection.count()
+        for offset in range(0, count, batch_size):
+            batch = collection.get(limit=batch_size, offset=offset, include=["metadatas", "embeddings"])
+            if not batch['ids']:
+                break
+            self.add([{'metadata': metadata} for metadata in batch['metadatas']], batch['embeddings'])
+        result = {"chunks": count, "documents": self.documents.count(), "pages": self.pages.count()}
+        logger.info(f"Rebuilt centroids in {time.perf_counter() - start:.1f}s: {result}")
+        return result
+
+    def nearest(self, query_embedding: List[float], level: str = DOCUMENT_LEVEL,
+                top_n: int = 8) -> List[Dict[str, Any]]:
+        """Metadata of the `top_n` documents or pages closest to the query, nearest first"""
+        collection = self._level(level)
+        top_n = min(top_n, collection.count())
+        if top_n <= 0:
+            return []
+        with tracer.start_span("centroids.nearest", level=level, top_n=top_n):
+            results = collection.query(query_embeddings=[query_embedding], n_results=top_n,
+                                       include=["metadatas"])
+        return results['metadatas'][0]
+
+    def candidate_filter(self, query_embedding: List[float], level: str = DOCUMENT_LEVEL,
+                         top_n: int = 8) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Chroma `where` clause restricting a chunk search to the nearest documents or pages.
+
+        Also returns how many chunks the clause matches at least (their
+        centroids' chunk counts), so the search can skip counting them.
+        Pages are matched as (source in sources) and (page in pages): a nested
+        $or per page makes Chroma's filter far slower than the few extra
+        candidates this admits.
+        """
+        nearest = self.nearest(query_embedding, level, top_n)
+        if not nearest:
+            return None, 0
+        sources = list(dict.fromkeys(metadata['source'] for metadata in nearest))
+        candidates = sum(metadata['chunks'] for metadata in nearest)
+        if level == DOCUMENT_LEVEL:
+            return {"source": {"$in": sources}}, candidates
+        pages = list(dict.fromkeys(metadata['page'] for metadata in nearest))
+        return {"$and": [{"source": {"$in": sources}}, {"page": {"$in": pages}}]}, candidates
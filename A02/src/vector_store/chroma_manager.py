@@ -1,18 +1,99 @@
 # src/vector_store/chroma_manager.py
-import chromadb
+import hashlib
 import logging
-from typing import List, Dict, Any
+import os
+import sqlite3
+from typing import List, Dict, Any, Optional
 import uuid
+from src.monitoring.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Chroma releases whose sqlite schema `ensure_metadata_indexes` was written
+# against (requirements.txt pins chromadb==0.4.15)
+METADATA_INDEX_CHROMA_VERSIONS = ("0.4.",)
+
+def ensure_metadata_indexes(db_path: str):
+    """Create secondary indexes on Chroma's metadata table.
+
+    Chroma only keys `embedding_metadata` by (id, key), so every `where`
+    filter scans the whole table. Indexing (key, value) lets filtered
+    queries resolve their candidate ids with an index lookup instead.
+
+    `embedding_metadata` is a private Chroma table, not an API, so the
+    indexes are only created on the chromadb releases listed in
+    `METADATA_INDEX_CHROMA_VERSIONS`; on any other version this logs and
+    leaves the database untouched. Re-check the schema before extending it.
+    """
+    import chromadb
+    if not chromadb.__version__.startswith(METADATA_INDEX_CHROMA_VERSIONS):
+        logger.info(f"Skipping metadata indexes: not verified against chromadb {chromadb.__version__}")
+        return
+    sqlite_path = os.path.join(db_path, "chroma.sqlite3")
+    if not os.path.exists(sqlite_path):
+        return
+    try:
+        with sqlite3.connect(sqlite_path) as conn:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_metadata_key_string "
+                "ON embedding_metadata (key, string_value)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_metadata_key_int "
+                "ON embedding_metadata (key, int_value)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_metadata_key_float "
+                "ON embedding_metadata (key, float_value)"
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Could not create metadata indexes: {e}")
+
+def drop_metadata_indexes(db_path: str):
+    """Drop the indexes created by `ensure_metadata_indexes`.
+    
+    Bulk loads run faster without secondary indexes to maintain per row;
+    call `ensure_metadata_indexes` afterwards to rebuild them in one pass.
+    """
+    sqlite_path = os.path.join(db_path, "chroma.sqlite3")
+    if not os.path.exists(sqlite_path):
+        return
+    try:
+        with sqlite3.connect(sqlite_path) as conn:
+            for suffix in ("string", "int", "float"):
+                conn.execute(f"DROP INDEX IF EXISTS embedding_metadata_key_{suffix}")
+    except sqlite3.Error as e:
+        logger.warning(f"Could not drop metadata indexes: {e}")
+
+def chunk_record_id(metadata: Dict[str, Any]) -> Optional[str]:
+    """Stable id for a chunk of a loaded document, from (source, page, chunk index).
+    
+    Storing the same batch twice keeps one copy. Ids do not depend on the
+    text, so ingest deletes a source's chunks (`delete_source`) before it
+    stores a new version of the file.
+    """
+    key = [metadata.get(field) for field in ("source", "page", "chunk_id")]
+    if any(value is None for value in key):
+        return None
+    return hashlib.sha1("\0".join(str(value) for value in key).encode()).hexdigest()
+
 class ChromaDBManager:
     """Manage ChromaDB vector database operations"""
     
-    def __init__(self, db_path: str, collection_name: str):
-        self.client = chromadb.PersistentClient(path=db_path)
+    def __init__(self, db_path: str, collection_name: str,
+                 server_host: Optional[str] = None, server_port: int = 8000):
+        import chromadb  # deferred: importing chromadb is slow
+        if server_host:
+            # Shared Chroma server: the only process that opens db_path
+            self.client = chromadb.HttpClient(host=server_host, port=str(server_port))
+        else:
+            self.client = chromadb.PersistentClient(path=db_path)
+        self.db_path = db_path
         self.collection_name = collection_name
+        self.is_local = not server_host
         self.collection = self._get_or_create_collection()
+        if not server_host:
+            ensure_metadata_indexes(db_path)
     
     def _get_or_create_collection(self):
         """Get existing collection or create new one"""
@@ -20,7 +101,8 @@ class ChromaDBManager:
             collection = self.client.get_collection(self.collection_name)
             logger.info(f"Loaded existing collection: {self.collection_name}")
         except Exception:
-            collection = self.client.create_collection(
+            # get_or_create tolerates another process creating it concurrently
+            collection = self.client.get_or_create_collection(
                 name=self.collection_name,
                 metadata={"description": "Academic papers collection"}
             )
@@ -30,16 +112,17 @@ class ChromaDBManager:
     def add_documents(self, documents: List[Dict[str, Any]], embeddings: List[List[float]]):
         """Add documents with their embeddings to the database"""
         try:
-            ids = [str(uuid.uuid4()) for _ in range(len(documents))]
+            ids = [chunk_record_id(doc['metadata']) or str(uuid.uuid4()) for doc in documents]
             documents_content = [doc['content'] for doc in documents]
             metadatas = [doc['metadata'] for doc in documents]
             
-            self.collection.add(
-                embeddings=embeddings,
-                documents=documents_content,
-                metadatas=metadatas,
-                ids=ids
-            )
+            with tracer.start_span("chroma.add_documents", documents=len(documents)):
+                self.collection.upsert(
+                    embeddings=embeddings,
+                    documents=documents_content,
+                    metadatas=metadatas,
+                    ids=ids
+                )
             
             logger.info(f"Added {len(documents)} documents to vector database")
             
@@ -47,18 +130,71 @@ class ChromaDBManager:
             logger.error(f"Error adding documents to vector database: {e}")
             raise
     
-    def search_similar(self, query_embedding: List[float], top_k: int = 5):
-        """Search for similar documents"""
+    def upsert_records(self, ids: List[str], contents: List[str],
+                       metadatas: List[Dict[str, Any]], embeddings: List[List[float]]):
+        """Write pre-identified records in as few calls as Chroma's batch limit allows.
+        
+        Upserting keeps bulk imports idempotent: re-running an interrupted
+        import overwrites rows instead of duplicating them.
+        """
+        # Chroma rejects single calls above its producer's batch limit
+        limit = getattr(self.client, "max_batch_size", None) or len(ids) or 1
+        with tracer.start_span("chroma.upsert_records", documents=len(ids)):
+            for start in range(0, len(ids), limit):
+                stop = start + limit
+                self.collection.upsert(
+                    ids=ids[start:stop],
+                    documents=contents[start:stop],
+                    metadatas=metadatas[start:stop],
+                    embeddings=embeddings[start:stop]
+                )
+    
+    def search_similar(self, query_embedding: List[float], top_k: int = 5,
+                       where: Optional[Dict[str, Any]] = None, candidate_count: Optional[int] = None):
+        """Search for similar documents, optionally restricted by a metadata filter.
+        
+        `candidate_count`, when the caller already knows how many records the
+        filter matches at least, saves resolving the filter an extra time.
+        """
         try:
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k
-            )
+            with tracer.start_span("chroma.search_similar", top_k=top_k, filtered=bool(where)):
+                if where and candidate_count:
+                    top_k = min(top_k, candidate_count)
+                elif where:
+                    # Resolve the candidate set through the metadata index first.
+                    # Chroma treats an empty candidate set as "no filter", so an
+                    # unmatched filter must short-circuit here. Fetching at most
+                    # top_k ids is enough to cap n_results.
+                    candidate_count = len(self.collection.get(where=where, limit=top_k, include=[])['ids'])
+                    if candidate_count == 0:
+                        return {'ids': [[]], 'documents': [[]], 'metadatas': [[]], 'distances': [[]]}
+                    top_k = min(top_k, candidate_count)
+
+                results = self.collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=top_k,
+                    where=where
+                )
             return results
         except Exception as e:
             logger.error(f"Error searching vector database: {e}")
             raise
     
+    def delete_source(self, source: str) -> int:
+        """Delete every chunk stored for `source`; returns how many were removed"""
+        with tracer.start_span("chroma.delete_source"):
+            ids = self.collection.get(where={"source": source}, include=[])['ids']
+            limit = getattr(self.client, "max_batch_size", None) or len(ids) or 1
+            for start in range(0, len(ids), limit):
+                self.collection.delete(ids=ids[start:start + limit])
+        if ids:
+            logger.info(f"Deleted {len(ids)} stored chunks of {source}")
+        return len(ids)
+    
+    def refresh(self):
+        """Re-resolve the collection handle after another process changed the index"""
+        self.collection = self._get_or_create_collection()
+    
     def get_collection_info(self):
         """Get information about the collection"""
         return self.collection.count()
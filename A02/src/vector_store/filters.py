@@ -0,0 +1,64 @@
+# src/vector_store/filters.py
+from typing import Any, Dict, List, Optional
+
+# Operators understood by the Chroma `where` clause
+SUPPORTED_OPERATORS = {"$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin"}
+NUMERIC_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+
+def _validate_predicate(key: str, value: Any):
+    """Validate a single metadata predicate (scalar equality or operator expression)"""
+    if key.startswith("$"):
+        raise ValueError(f"Logical operators are not supported as metadata keys: {key}")
+
+    if isinstance(value, (str, int, float, bool)):
+        return
+
+    if not isinstance(value, dict) or len(value) != 1:
+        raise ValueError(
+            f"Filter for '{key}' must be a scalar or a single-operator expression, got {value!r}"
+        )
+
+    operator, operand = next(iter(value.items()))
+    if operator not in SUPPORTED_OPERATORS:
+        raise ValueError(f"Unsupported filter operator '{operator}' for '{key}'")
+    if operator in NUMERIC_OPERATORS and not isinstance(operand, (int, float)):
+        raise ValueError(f"Operator '{operator}' on '{key}' requires a number, got {operand!r}")
+    if operator in ("$in", "$nin"):
+        if not isinstance(operand, list) or not operand:
+            raise ValueError(f"Operator '{operator}' on '{key}' requires a non-empty list")
+        if not all(isinstance(item, type(operand[0])) for item in operand):
+            raise ValueError(f"Operator '{operator}' on '{key}' requires values of one type")
+
+
+def build_where_clause(source: Optional[str] = None,
+                       page_min: Optional[int] = None,
+                       page_max: Optional[int] = None,
+                       metadata: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Translate query filters into a Chroma `where` clause.
+
+    `source` matches either the stored path or the bare file name, the page
+    bounds are inclusive, and `metadata` holds arbitrary predicates such as
+    {"year": {"$gte": 2020}}. Returns None when no filter applies.
+    """
+    clauses: List[Dict[str, Any]] = []
+
+    if source:
+        clauses.append({"$or": [{"source": source}, {"filename": source}]})
+
+    if page_min is not None and page_max is not None and page_min > page_max:
+        raise ValueError(f"page_min ({page_min}) is greater than page_max ({page_max})")
+    if page_min is not None:
+        clauses.append({"page": {"$gte": int(page_min)}})
+    if page_max is not None:
+        clauses.append({"page": {"$lte": int(page_max)}})
+
+    for key, value in (metadata or {}).items():
+        _validate_predicate(key, value)
+        clauses.append({key: value})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
@@ -0,0 +1,149 @@
+# src/vector_store/snapshot.py
+"""
+Collection snapshots for seeding new environments without re-ingesting PDFs.
+
+A snapshot is a directory holding:
+  - embeddings.npy  float32 matrix, one row per record, memory-mappable
+  - records.jsonl   {"id", "document", "metadata"} per line, same row order
+  - manifest.json   format version, collection, count, dimension, checksums
+
+Export pages through the collection and writes embeddings straight into a
+memory-mapped .npy file; import reads both files in batches, so neither
+side holds the whole collection in memory.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from src.vector_store.chroma_manager import drop_metadata_indexes, ensure_metadata_indexes
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.jsonl"
+
+
+def _sha256(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_snapshot(manager, output_dir: str, batch_size: int = 5000) -> Dict[str, Any]:
+    """Write every record of `manager`'s collection to a snapshot directory"""
+    import numpy as np
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    collection = manager.collection
+    count = collection.count()
+    embeddings = None
+    dimension = 0
+    written = 0
+
+    with open(os.path.join(output_dir, RECORDS_FILE), "w", encoding="utf-8") as records:
+        for offset in range(0, count, batch_size):
+            batch = collection.get(limit=batch_size, offset=offset,
+                                   include=["documents", "metadatas", "embeddings"])
+            if not batch['ids']:
+                break
+            if embeddings is None:
+                dimension = len(batch['embeddings'][0])
+                embeddings = np.lib.format.open_memmap(
+                    os.path.join(output_dir, EMBEDDINGS_FILE), mode="w+",
+                    dtype=np.float32, shape=(count, dimension)
+                )
+            embeddings[written:written + len(batch['ids'])] = np.asarray(batch['embeddings'], dtype=np.float32)
+            for record_id, document, metadata in zip(batch['ids'], batch['documents'], batch['metadatas']):
+                records.write(json.dumps({"id": record_id, "document": document, "metadata": metadata}) + "\n")
+            written += len(batch['ids'])
+
+    if embeddings is None:
+        np.save(os.path.join(output_dir, EMBEDDINGS_FILE), np.zeros((0, 0), dtype=np.float32))
+    else:
+        embeddings.flush()
+        del embeddings
+    if written != count:
+        raise RuntimeError(f"Collection changed during export: expected {count} records, read {written}")
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "collection": manager.collection_name,
+        "count": written,
+        "dimension": dimension,
+        "dtype": "float32",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "checksums": {name: _sha256(os.path.join(output_dir, name))
+                      for name in (EMBEDDINGS_FILE, RECORDS_FILE)},
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    logger.info(f"Exported {written} records to {output_dir} in {time.perf_counter() - start:.1f}s")
+    return manifest
+
+
+def read_manifest(snapshot_dir: str, verify: bool = False) -> Dict[str, Any]:
+    """Load a snapshot manifest, optionally checking file checksums"""
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {manifest.get('format_version')}")
+    if verify:
+        for name, expected in manifest["checksums"].items():
+            if _sha256(os.path.join(snapshot_dir, name)) != expected:
+                raise ValueError(f"Snapshot file {name} does not match its checksum")
+    return manifest
+
+
+def import_snapshot(manager, snapshot_dir: str, batch_size: int = 5000, verify: bool = True,
+                    progress: Optional[Any] = None) -> Dict[str, Any]:
+    """Restore a snapshot into `manager`'s collection with batched upserts"""
+    import numpy as np
+
+    manifest = read_manifest(snapshot_dir, verify=verify)
+    count = manifest["count"]
+    embeddings = np.load(os.path.join(snapshot_dir, EMBEDDINGS_FILE), mmap_mode="r")
+    if count and embeddings.shape != (count, manifest["dimension"]):
+        raise ValueError(f"Embedding matrix shape {embeddings.shape} does not match the manifest")
+
+    local = getattr(manager, "is_local", False)
+    if local:
+        drop_metadata_indexes(manager.db_path)
+    start = time.perf_counter()
+    restored = 0
+    try:
+        with open(os.path.join(snapshot_dir, RECORDS_FILE), encoding="utf-8") as records:
+            while restored < count:
+                rows = []
+                for line in records:
+                    rows.append(json.loads(line))
+                    if len(rows) >= batch_size:
+                        break
+                if not rows:
+                    break
+                manager.upsert_records(
+                    [row["id"] for row in rows],
+                    [row["document"] for row in rows],
+                    [row["metadata"] for row in rows],
+                    embeddings[restored:restored + len(rows)].tolist()
+                )
+                restored += len(rows)
+                if progress:
+                    progress(restored, time.perf_counter() - start)
+    finally:
+        if local:
+            ensure_metadata_indexes(manager.db_path)
+
+    if restored != count:
+        raise ValueError(f"Snapshot records file has {restored} rows, manifest expects {count}")
+    seconds = time.perf_counter() - start
+    logger.info(f"Imported {restored} records from {snapshot_dir} in {seconds:.1f}s")
+    return {"count": restored, "seconds": seconds}
@@ -19,6 +19,19 @@ class TestAPI:
         data = response.json()
         assert data['status'] == 'healthy'
     
+    def test_ready_endpoint_after_warmup(self):
+        """Test readiness is reported separately from liveness"""
+        import time
+        with TestClient(app) as client:
+            for _ in range(100):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                assert response.json()['status'] in ('not_started', 'warming')
+                time.sleep(0.05)
+            assert response.status_code == 200
+            assert response.json()['status'] == 'ready'
+    
     def test_status_endpoint(self):
         """Test system status endpoint"""
         response = self.client.get("/status")
@@ -27,6 +40,17 @@ class TestAPI:
         assert 'vector_store' in data
         assert 'config' in data
     
+    def test_metrics_endpoint(self):
+        """Test Prometheus metrics endpoint reflects served queries"""
+        self.client.post("/query", json={"question": "test question", "top_k": 1})
+        response = self.client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith("text/plain")
+        assert 'rag_stage_duration_seconds_count{stage="search"}' in response.text
+        assert 'rag_queries_total' in response.text
+        status = self.client.get("/status").json()
+        assert 'search' in status['performance']['stages']
+    
     def test_query_endpoint(self):
         """Test query endpoint"""
         response = self.client.post(
@@ -38,5 +62,27 @@ class TestAPI:
         assert 'question' in data
         assert 'answer' in data
 
+    def test_ingest_rejects_unsupported_type(self):
+        """Test uploads without a registered loader are rejected"""
+        response = self.client.post("/ingest", files={"file": ("data.xyz", b"payload")})
+        assert response.status_code == 400
+        assert ".md" in response.json()['detail']
+
+    def test_query_endpoint_with_filters(self):
+        """Test query endpoint accepts metadata filters and rejects bad ones"""
+        response = self.client.post(
+            "/query",
+            json={"question": "test question", "top_k": 3,
+                  "filters": {"source": "missing.pdf", "page_min": 1, "page_max": 2}}
+        )
+        assert response.status_code == 200
+        assert response.json()['document_count'] == 0
+
+        response = self.client.post(
+            "/query",
+            json={"question": "test question", "filters": {"page_min": 3, "page_max": 1}}
+        )
+        assert response.status_code == 400
+
 if __name__ == "__main__":
     pytest.main([__file__])
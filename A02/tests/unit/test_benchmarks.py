@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from benchmarks.corpus import generate_corpus
+from benchmarks.run_benchmarks import compare_results
+from benchmarks.startup import measure_import
+from benchmarks.stats import summarize
+from src.document_loader.extraction_cache import ExtractionCache
+from src.document_loader.pdf_loader import AcademicPDFLoader
+
+class TestBenchmarks:
+    """Unit tests for the benchmark suite helpers"""
+    
+    def test_synthetic_corpus_is_reproducible(self, tmp_path):
+        """Test synthetic PDFs are deterministic and readable by the loader"""
+        first = generate_corpus(str(tmp_path / "a"), num_documents=1, pages_per_document=3, seed=1)
+        second = generate_corpus(str(tmp_path / "b"), num_documents=1, pages_per_document=3, seed=1)
+        with open(first[0], "rb") as f1, open(second[0], "rb") as f2:
+            assert f1.read() == f2.read()
+        pages = AcademicPDFLoader(cache=ExtractionCache(str(tmp_path / "cache"))).load_document(first[0])
+        assert len(pages) == 3
+        assert pages[0]['content'].strip()
+    
+    def test_compare_flags_regressions(self):
+        """Test compare mode flags slower stages only"""
+        baseline = {"stages": {"search": summarize([0.010] * 10, 10, 0.1)}}
+        same = {"stages": {"search": summarize([0.010] * 10, 10, 0.1)}}
+        slower = {"stages": {"search": summarize([0.020] * 10, 10, 0.2)}}
+        assert compare_results(baseline, same, 0.1) == []
+        assert len(compare_results(baseline, slower, 0.1)) == 2
+    
+    def test_api_import_defers_heavy_modules(self):
+        """Test importing the API in a fresh interpreter loads none of the heavy dependencies"""
+        assert measure_import(dict(os.environ))['loaded'] == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import itertools
+import json
+import threading
+import time
+import pytest
+from src.embedding.embedder import EmbeddingGenerator
+from src.vector_store.bulk_import import bulk_import, prefetch
+from src.vector_store.chroma_manager import ChromaDBManager
+
+def write_rows(path, rows):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+class TestBulkImport:
+    """Unit tests for streaming bulk import into the vector store"""
+    
+    def test_jsonl_import_is_batched_and_idempotent(self, tmp_path):
+        """Test precomputed vectors are kept, missing ones embedded, re-runs upsert"""
+        path = str(tmp_path / "chunks.jsonl")
+        rows = [{"id": f"c{i}", "text": f"chunk {i}", "embedding": [float(i), 1.0, 0.0],
+                 "metadata": {"source": "legacy.pdf", "page": i}, "year": 2021} for i in range(5)]
+        rows.append({"text": "   "})  # no text: skipped
+        write_rows(path, rows)
+        manager = ChromaDBManager(str(tmp_path / "db"), "bulk_test")
+        
+        progress = []
+        stats = bulk_import(manager, path, batch_size=2, progress=lambda s: progress.append(s.rows))
+        assert (stats.rows, stats.skipped, stats.embedded) == (5, 1, 0)
+        assert progress == [2, 4, 5]
+        assert stats.rows_per_second > 0
+        
+        stored = manager.collection.get(ids=["c3"], include=["embeddings", "metadatas"])
+        assert stored['embeddings'][0] == pytest.approx([3.0, 1.0, 0.0])
+        assert stored['metadatas'][0] == {"source": "legacy.pdf", "filename": "legacy.pdf",
+                                          "page": 3, "year": 2021}
+        
+        bulk_import(manager, path, batch_size=100)
+        assert manager.get_collection_info() == 5
+        
+        # Rows without vectors need an embedder
+        write_rows(path, [{"content": "fresh text"}])
+        with pytest.raises(ValueError):
+            bulk_import(manager, path)
+        embedder = EmbeddingGenerator(model_type="dummy")
+        other = ChromaDBManager(str(tmp_path / "db"), "bulk_test_embedded")
+        assert bulk_import(other, path, embedder=embedder).embedded == 1
+    
+    def test_parquet_import(self, tmp_path):
+        """Test Parquet files are read one record batch at a time"""
+        pa = pytest.importorskip("pyarrow", exc_type=ImportError)
+        pq = pytest.importorskip("pyarrow.parquet", exc_type=ImportError)
+        path = str(tmp_path / "chunks.parquet")
+        table = pa.table({"id": ["a", "b", "c"], "content": ["x", "y", "z"],
+                          "embedding": [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], "page": [1, 2, 3]})
+        pq.write_table(table, path, row_group_size=1)
+        manager = ChromaDBManager(str(tmp_path / "db"), "bulk_parquet")
+        assert bulk_import(manager, path, batch_size=2).rows == 3
+        assert manager.get_collection_info() == 3
+    
+    def test_failing_consumer_stops_reader(self, tmp_path):
+        """Test the read-ahead thread exits when the import fails instead of blocking on a full buffer"""
+        path = str(tmp_path / "chunks.jsonl")
+        with open(path, "w") as f:
+            for i in range(50):
+                f.write(json.dumps({"id": f"r{i}", "content": f"row {i}"}) + "\n")
+        manager = ChromaDBManager(str(tmp_path / "db"), "bulk_failing")
+        with pytest.raises(ValueError, match="no embedder"):
+            bulk_import(manager, path, batch_size=2)
+        
+        batches = prefetch(([i] for i in itertools.count()), poll_seconds=0.01)
+        assert next(batches) == [0]
+        batches.close()
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and any(t.name == "bulk-import-reader" for t in threading.enumerate()):
+            time.sleep(0.01)
+        assert not any(t.name == "bulk-import-reader" for t in threading.enumerate())
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import numpy as np
+import pytest
+from config import config
+from src.monitoring.metrics import metrics
+from src.vector_store.centroids import DOCUMENT_LEVEL, PAGE_LEVEL, CentroidIndex
+from src.vector_store.chroma_manager import ChromaDBManager
+
+def corpus(documents=3, pages=2, chunks=3, seed=0):
+    """Chunks clustered by document: each document has its own direction"""
+    rng = np.random.default_rng(seed)
+    records, vectors = [], []
+    for doc in range(documents):
+        topic = rng.normal(size=8) * 5
+        for page in range(1, pages + 1):
+            for chunk in range(chunks):
+                records.append({'content': f"d{doc} p{page} c{chunk}",
+                                'metadata': {'source': f"d{doc}.pdf", 'filename': f"d{doc}.pdf", 'page': page}})
+                vectors.append((topic + rng.normal(size=8)).tolist())
+    return records, vectors
+
+class TestCentroidIndex:
+    """Unit tests for document/page centroids and two-stage retrieval"""
+    
+    def test_centroids_merge_across_batches(self, tmp_path):
+        """Test centroids built batch by batch equal the mean of all chunks, and rebuild agrees"""
+        manager = ChromaDBManager(str(tmp_path / "db"), "centroid_merge")
+        centroids = CentroidIndex(manager)
+        records, vectors = corpus()
+        for start in (0, 4, 11):  # batches split documents and pages
+            stop = {0: 4, 4: 11, 11: len(records)}[start]
+            manager.add_documents(records[start:stop], vectors[start:stop])
+            centroids.add(records[start:stop], vectors[start:stop])
+        assert (centroids.count(DOCUMENT_LEVEL), centroids.count(PAGE_LEVEL)) == (3, 6)
+        
+        stored = centroids.documents.get(ids=["d0.pdf"], include=["embeddings", "metadatas"])
+        assert stored['metadatas'][0]['chunks'] == 6
+        assert stored['embeddings'][0] == pytest.approx(np.mean(vectors[:6], axis=0), abs=1e-5)
+        page = centroids.pages.get(ids=["d1.pdf#2"], include=["embeddings", "metadatas"])
+        assert page['metadatas'][0] == {'source': "d1.pdf", 'filename': "d1.pdf", 'page': 2, 'chunks': 3}
+        assert page['embeddings'][0] == pytest.approx(np.mean(vectors[9:12], axis=0), abs=1e-5)
+        
+        assert centroids.rebuild(batch_size=5) == {"chunks": 18, "documents": 3, "pages": 6}
+        rebuilt = centroids.documents.get(ids=["d0.pdf"], include=["embeddings"])
+        assert rebuilt['embeddings'][0] == pytest.approx(stored['embeddings'][0], abs=1e-5)
+    
+    def test_candidate_filter_limits_chunk_search(self, tmp_path):
+        """Test the nearest documents or pages become a where clause the chunk search honours"""
+        manager = ChromaDBManager(str(tmp_path / "db"), "centroid_filter")
+        centroids = CentroidIndex(manager)
+        assert centroids.candidate_filter([0.0] * 8) == (None, 0)
+        records, vectors = corpus()
+        manager.add_documents(records, vectors)
+        centroids.add(records, vectors)
+        
+        query = vectors[7]  # a chunk of d1.pdf, page 1
+        where, candidates = centroids.candidate_filter(query, DOCUMENT_LEVEL, top_n=1)
+        assert (where, candidates) == ({"source": {"$in": ["d1.pdf"]}}, 6)
+        results = manager.search_similar(query, top_k=10, where=where, candidate_count=candidates)
+        assert len(results['ids'][0]) == 6
+        assert {m['source'] for m in results['metadatas'][0]} == {"d1.pdf"}
+        
+        where, candidates = centroids.candidate_filter(query, PAGE_LEVEL, top_n=1)
+        assert where == {"$and": [{"source": {"$in": ["d1.pdf"]}}, {"page": {"$in": [1]}}]}
+        assert manager.search_similar(query, top_k=1, where=where)['documents'][0] == ["d1 p1 c1"]
+    
+    def test_retriever_two_stage(self, tmp_path, monkeypatch):
+        """Test the retriever routes unfiltered queries through the nearest documents once enabled"""
+        from src.retrieval.retriever import DocumentRetriever
+        monkeypatch.setattr(config, "VECTOR_DB_PATH", str(tmp_path / "db"))
+        monkeypatch.setattr(config, "CENTROIDS_ENABLED", True)
+        monkeypatch.setattr(config, "HIERARCHICAL_RETRIEVAL", True)
+        monkeypatch.setattr(config, "HIERARCHICAL_LEVEL", "document")
+        monkeypatch.setattr(config, "HIERARCHICAL_TOP_DOCUMENTS", 1)
+        monkeypatch.setattr(config, "HIERARCHICAL_MIN_DOCUMENTS", 3)
+        retriever = DocumentRetriever(config)
+        records, _ = corpus(documents=2)
+        retriever.add_documents(records)
+        assert retriever.centroids.count() == 2
+        
+        routed = metrics.summary().get("route", {}).get("count", 0)
+        assert len(retriever.retrieve("d0 p1 c0", top_k=8)) == 8  # two documents: still flat
+        assert metrics.summary().get("route", {}).get("count", 0) == routed
+        
+        retriever.add_documents([{'content': "appendix", 'metadata': {'source': "d9.pdf", 'page': 1}}])
+        results = retriever.retrieve("d0 p1 c0", top_k=8)
+        assert metrics.summary()["route"]["count"] == routed + 1
+        assert len({doc['metadata']['source'] for doc in results}) == 1
+        
+        # Metadata filters already narrow the search and bypass the first stage
+        retriever.retrieve("d0 p1 c0", top_k=2, filters={"source": "d1.pdf"})
+        assert metrics.summary()["route"]["count"] == routed + 1
+    
+    def test_reingested_source_replaces_its_centroids(self, tmp_path, monkeypatch):
+        """Test re-ingesting a changed document replaces its centroids instead of merging into them"""
+        from src.retrieval.retriever import DocumentRetriever
+        monkeypatch.setattr(config, "VECTOR_DB_PATH", str(tmp_path / "db"))
+        monkeypatch.setattr(config, "CENTROIDS_ENABLED", True)
+        retriever = DocumentRetriever(config)
+        records, _ = corpus(documents=2)
+        retriever.add_documents(records)
+        
+        edited = [{'content': f"revised d0 c{chunk}", 'metadata': {'source': "d0.pdf", 'page': 1}}
+                  for chunk in range(2)]
+        for _ in range(2):  # a retry stores the same version again
+            assert retriever.remove_source("d0.pdf") in (6, 2)
+            retriever.add_documents(edited)
+        centroids = retriever.centroids
+        stored = centroids.documents.get(ids=["d0.pdf"], include=["embeddings", "metadatas"])
+        assert stored['metadatas'][0]['chunks'] == 2
+        assert centroids.pages.get(where={"source": "d0.pdf"})['ids'] == ["d0.pdf#1"]
+        assert centroids.count(PAGE_LEVEL) == 3
+        
+        centroids.rebuild()
+        rebuilt = centroids.documents.get(ids=["d0.pdf"], include=["embeddings"])
+        assert stored['embeddings'][0] == pytest.approx(rebuilt['embeddings'][0], abs=1e-5)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import threading
+import pytest
+from benchmarks.mock_llm_server import MockLLMServer
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import (CircuitBreaker, CircuitOpenError, ResilientCaller,
+                                    RetryPolicy, TokenBucket)
+from src.embedding.embedder import EmbeddingError, EmbeddingGenerator
+
+class TransientError(Exception):
+    status_code = 503
+
+class TestClients:
+    """Unit tests for pooled LLM clients and their resilience policies"""
+    
+    def test_token_bucket_reports_wait(self):
+        """Test the bucket grants its capacity and then asks callers to wait"""
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        assert bucket.try_acquire() == 0
+        assert bucket.try_acquire() == 0
+        assert 0 < bucket.try_acquire() <= 1.0
+    
+    def test_retry_then_circuit_breaker(self):
+        """Test transient errors are retried and repeated failures open the breaker"""
+        calls = []
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise TransientError("unavailable")
+            return "ok"
+        caller = ResilientCaller("test", retry_policy=RetryPolicy(max_retries=3, base_delay=0.001),
+                                 circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+        assert caller.call(flaky) == "ok"
+        assert len(calls) == 3
+        
+        attempts = []
+        def broken():
+            attempts.append(1)
+            raise TransientError("down")
+        for _ in range(3):  # one failure per call, once its retries are exhausted
+            assert caller.circuit_breaker.state == CircuitBreaker.CLOSED
+            with pytest.raises(TransientError):
+                caller.call(broken)
+        assert len(attempts) == 3 * 4
+        assert caller.circuit_breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            caller.call(lambda: "never called")
+    
+    def test_half_open_admits_one_probe(self):
+        """Test only one trial call runs after the cool-down and its outcome decides the state"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        caller = ResilientCaller("test", retry_policy=RetryPolicy(max_retries=0), circuit_breaker=breaker)
+        breaker.record_failure()
+        started, finish = threading.Event(), threading.Event()
+        def slow_probe():
+            started.set()
+            finish.wait(5)
+            return "ok"
+        probe = threading.Thread(target=caller.call, args=(slow_probe,))
+        probe.start()
+        assert started.wait(5)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            caller.call(lambda: "rejected while the probe is in flight")
+        finish.set()
+        probe.join(5)
+        assert breaker.state == CircuitBreaker.CLOSED
+        
+        # A probe ending without a verdict hands the trial to the next caller
+        breaker.record_failure()
+        with pytest.raises(ValueError):
+            caller.call(lambda: int("not a number"))
+        assert breaker.state == CircuitBreaker.OPEN
+        assert caller.call(lambda: "ok") == "ok"
+    
+    def test_embeddings_retry_against_mock_server(self):
+        """Test embeddings recover from injected 503s and fail loudly otherwise"""
+        policy = RetryPolicy(max_retries=2, base_delay=0.001)
+        with MockLLMServer(embedding_dimension=8, fail_first=2) as mock:
+            client = build_openai_client(api_key="test", base_url=mock.base_url)
+            embedder = EmbeddingGenerator("openai", client=client, batch_size=2,
+                                          caller=ResilientCaller("embeddings", retry_policy=policy))
+            vectors = embedder.generate_embeddings_batch(["a", "b", "c"])
+            assert len(vectors) == 3 and len(vectors[0]) == 8
+            assert mock.request_count == 4  # two failures, then two batches
+        
+        with MockLLMServer(embedding_dimension=8, fail_first=100) as mock:
+            client = build_openai_client(api_key="test", base_url=mock.base_url)
+            embedder = EmbeddingGenerator("openai", client=client,
+                                          caller=ResilientCaller("embeddings", retry_policy=policy))
+            with pytest.raises(EmbeddingError):
+                embedder.generate_embedding("never a random vector")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
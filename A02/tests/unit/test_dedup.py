@@ -0,0 +1,161 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import random
+import pytest
+from benchmarks.corpus import make_sentence
+from config import config
+from src.document_loader.dedup import DedupReport, NearDuplicateIndex, SIGNATURES_FILE
+from src.monitoring.metrics import metrics
+
+LICENSE = ("This article is licensed under a Creative Commons Attribution 4.0 International License, "
+           "which permits use, sharing and reproduction in any medium")
+
+def paragraphs(seed, count):
+    rng = random.Random(seed)
+    return [" ".join(make_sentence(rng) for _ in range(4)) for _ in range(count)]
+
+def chunks(texts, source="a.pdf"):
+    return [{'content': text, 'metadata': {'source': source, 'chunk_id': i}} for i, text in enumerate(texts)]
+
+class TestNearDuplicateIndex:
+    """Unit tests for MinHash/LSH near-duplicate detection at ingest"""
+    
+    def test_signature_estimates_jaccard(self, tmp_path):
+        """Test signature agreement tracks shingle overlap, and unrelated text stays dissimilar"""
+        index = NearDuplicateIndex(str(tmp_path / "dedup"))
+        first, other = paragraphs(1, 2)
+        edited = first.replace(".", ";", 1)
+        shingles = set(index.shingles(first).tolist()), set(index.shingles(edited).tolist())
+        jaccard = len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+        estimate = index.similarity(index.signature(first), index.signature(edited))
+        assert estimate == pytest.approx(jaccard, abs=0.1)
+        assert index.similarity(index.signature(first), index.signature(other)) < 0.2
+    
+    def test_drops_near_duplicates_within_batch(self, tmp_path):
+        """Test repeated boilerplate with page numbers is kept once and counted per file"""
+        index = NearDuplicateIndex(str(tmp_path / "dedup"))
+        texts = paragraphs(2, 5)
+        batch = chunks([texts[0], f"{LICENSE} Page 1", texts[1], f"{LICENSE} Page 2", texts[2]])
+        report = DedupReport("a.pdf")
+        kept, pending = index.deduplicate(batch, "a.pdf", report)
+        assert [c['metadata']['chunk_id'] for c in kept] == [0, 1, 2, 4]
+        assert (report.chunks, report.kept, report.within_document, report.cross_document) == (5, 4, 1, 0)
+        assert report.to_dict()['dedup_ratio'] == 0.2
+        assert len(index) == 0  # nothing is indexed until the batch is committed
+        index.commit(pending)
+        assert len(index) == 4
+    
+    def test_cross_document_and_persistence(self, tmp_path):
+        """Test committed chunks survive a reload and match chunks of later files"""
+        index = NearDuplicateIndex(str(tmp_path / "dedup"))
+        texts = paragraphs(3, 4)
+        kept, pending = index.deduplicate(chunks(texts[:3] + [LICENSE]), "a.pdf")
+        index.commit(pending)
+        
+        reloaded = NearDuplicateIndex(str(tmp_path / "dedup"))
+        assert len(reloaded) == 4
+        report = DedupReport("b.pdf")
+        kept, _ = reloaded.deduplicate(chunks([texts[3], LICENSE + ".", texts[0]], "b.pdf"), "b.pdf", report)
+        assert [c['content'] for c in kept] == [texts[3]]
+        assert (report.cross_document, report.within_document) == (2, 0)
+        
+        # Re-ingesting a file counts its chunks as duplicates within that document
+        report = DedupReport("a.pdf")
+        reloaded.deduplicate(chunks(texts[:1]), "a.pdf", report)
+        assert report.within_document == 1
+    
+    def test_partial_row_and_parameter_change(self, tmp_path):
+        """Test an interrupted append is trimmed on load and changed parameters start afresh"""
+        index_dir = str(tmp_path / "dedup")
+        index = NearDuplicateIndex(index_dir)
+        index.commit(index.deduplicate(chunks(paragraphs(4, 3)), "a.pdf")[1])
+        with open(os.path.join(index_dir, SIGNATURES_FILE), "ab") as f:
+            f.write(b"\0" * 100)
+        assert len(NearDuplicateIndex(index_dir)) == 3
+        assert os.path.getsize(os.path.join(index_dir, SIGNATURES_FILE)) == 3 * 128 * 4
+        assert len(NearDuplicateIndex(index_dir, num_perm=64)) == 0
+    
+    def test_forget_source(self, tmp_path):
+        """Test forgetting a source drops only its rows, persists, and survives an interrupted swap"""
+        index_dir = str(tmp_path / "dedup")
+        index = NearDuplicateIndex(index_dir)
+        first, second = paragraphs(9, 2), paragraphs(10, 2)
+        index.commit(index.deduplicate(chunks(first, "a.pdf"), "a.pdf")[1])
+        index.commit(index.deduplicate(chunks(second, "b.pdf"), "b.pdf")[1])
+        assert index.forget("a.pdf") == 2 and index.forget("a.pdf") == 0
+        assert index.deduplicate(chunks(first + second, "c.pdf"), "c.pdf")[0] == chunks(first, "c.pdf")
+        assert len(NearDuplicateIndex(index_dir)) == 2
+        
+        os.replace(index_dir, index_dir + ".old")  # as if stopped between the renames
+        assert len(NearDuplicateIndex(index_dir)) == 2
+    
+    def test_pipeline_skips_duplicate_chunks(self, tmp_path, monkeypatch):
+        """Test ingest embeds only new chunks and reports the per-file dedup ratio"""
+        from src.main import RAGPipeline
+        monkeypatch.setattr(config, "VECTOR_DB_PATH", str(tmp_path / "chroma_db"))
+        monkeypatch.setattr(config, "DEDUP_ENABLED", True)
+        monkeypatch.setattr(config, "DEDUP_INDEX_DIR", None)
+        texts = paragraphs(5, 4)
+        first = tmp_path / "first.md"
+        first.write_text(f"# One\n{texts[0]}\n\n{LICENSE}\n\n# Two\n{texts[1]}\n\n{LICENSE}\n")
+        second = tmp_path / "second.md"
+        second.write_text(f"# Three\n{texts[2]}\n\n{LICENSE}\n\n{texts[3]}\n")
+        
+        pipeline = RAGPipeline()
+        dropped = metrics.counter_value("chunks_deduplicated_total", scope="corpus")
+        report = DedupReport(str(first))
+        assert pipeline.ingest_document(str(first), report)
+        assert report.within_document == 1
+        report = DedupReport(str(second))
+        assert pipeline.ingest_document(str(second), report)
+        assert (report.cross_document, report.kept) == (1, 2)
+        assert pipeline.get_system_status()['vector_store']['document_count'] == 5
+        assert os.path.isdir(str(tmp_path / "chroma_db_dedup"))
+        assert metrics.counter_value("chunks_deduplicated_total", scope="corpus") == dropped + 1
+    
+    def test_reingesting_changed_file_replaces_it(self, tmp_path, monkeypatch):
+        """Test an edited file re-ingested at the same path keeps every paragraph and no stale chunks"""
+        from src.main import RAGPipeline
+        monkeypatch.setattr(config, "VECTOR_DB_PATH", str(tmp_path / "chroma_db"))
+        monkeypatch.setattr(config, "DEDUP_ENABLED", True)
+        monkeypatch.setattr(config, "DEDUP_INDEX_DIR", None)
+        monkeypatch.setattr(config, "CHUNK_SIZE", 400)
+        texts = paragraphs(8, 5)
+        doc = tmp_path / "doc.md"
+        doc.write_text("\n\n".join(texts[1:4]))
+        pipeline = RAGPipeline()
+        assert pipeline.ingest_document(str(doc))
+        
+        doc.write_text("\n\n".join([texts[0]] + texts[1:3]))  # prepend one paragraph, drop the last
+        report = DedupReport(str(doc))
+        assert pipeline.ingest_document(str(doc), report)
+        assert report.dropped == 0
+        stored = " ".join(pipeline.retriever.vector_store.collection.get(where={"source": str(doc)})['documents'])
+        for text in texts[:3]:
+            assert text[:60] in stored
+        assert texts[3][:60] not in stored
+        assert len(pipeline.dedup_index) == pipeline.get_system_status()['vector_store']['document_count']
+    
+    def test_collection_change_and_rebuild(self, tmp_path):
+        """Test an index of another collection starts afresh and rebuild re-signs stored chunks"""
+        from src.vector_store.chroma_manager import ChromaDBManager
+        manager = ChromaDBManager(str(tmp_path / "db"), "dedup_rebuild")
+        texts = paragraphs(6, 3)
+        records = chunks(texts, "a.pdf")
+        manager.add_documents(records, [[float(i), 1.0] for i in range(len(records))])
+        index_dir = str(tmp_path / "dedup")
+        index = NearDuplicateIndex(index_dir, collection="old-collection")
+        index.commit(index.deduplicate(chunks(paragraphs(7, 2)), "gone.pdf")[1])
+        
+        index = NearDuplicateIndex(index_dir, collection=str(manager.collection.id))
+        assert len(index) == 0
+        assert index.rebuild(manager, batch_size=2) == {"chunks": 3, "sources": 1}
+        report = DedupReport("b.pdf")
+        kept, _ = NearDuplicateIndex(index_dir, collection=str(manager.collection.id)).deduplicate(
+            chunks([texts[1]], "b.pdf"), "b.pdf", report)
+        assert kept == [] and report.cross_document == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
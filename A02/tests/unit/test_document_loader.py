@@ -4,6 +4,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 import pytest
 from src.document_loader.pdf_loader import AcademicPDFLoader
+from src.document_loader.extraction_cache import ExtractionCache
 from src.document_loader.chunker import TextChunker
 
 class TestDocumentLoader:
@@ -15,6 +16,43 @@ class TestDocumentLoader:
         assert loader is not None
         assert '.pdf' in loader.supported_formats
     
+    def test_parallel_extraction_matches_serial(self, tmp_path):
+        """Test page-range workers return the same pages in page order"""
+        from benchmarks.corpus import write_pdf
+        path = str(tmp_path / "long.pdf")
+        write_pdf(path, [[f"Page {n} text"] for n in range(1, 10)] + [[]])
+        
+        serial = AcademicPDFLoader(workers=1, cache=ExtractionCache(str(tmp_path))).load_document(path)
+        loader = AcademicPDFLoader(workers=2, pages_per_task=2)
+        loader.cache = None  # exercise the worker pool, not the cache
+        try:
+            streamed = list(loader.iter_pages(path))
+        finally:
+            loader.close()
+        assert loader._executor is None
+        assert streamed == serial
+        assert [doc['metadata']['page'] for doc in streamed] == list(range(1, 10))
+    
+    def test_extraction_cache_skips_parsing(self, tmp_path, monkeypatch):
+        """Test cached pages are served without opening the PDF parser"""
+        from benchmarks.corpus import write_pdf
+        import pypdf
+        path = str(tmp_path / "paper.pdf")
+        write_pdf(path, [["First page"], [], ["Third page"]])
+        cache = ExtractionCache(str(tmp_path / "cache"), version="test-v1")
+        first = AcademicPDFLoader(cache=cache).load_document(path)
+        
+        def no_parsing(*args, **kwargs):
+            raise AssertionError("PDF was parsed despite a cache hit")
+        monkeypatch.setattr(pypdf, "PdfReader", no_parsing)
+        assert AcademicPDFLoader(cache=cache).load_document(path) == first
+        assert [doc['metadata']['page'] for doc in first] == [1, 3]
+        
+        # A new extractor version must not reuse old entries
+        stale = ExtractionCache(str(tmp_path / "cache"), version="test-v2")
+        with pytest.raises(AssertionError):
+            AcademicPDFLoader(cache=stale).load_document(path)
+    
     def test_chunker_initialization(self):
         """Test text chunker can be initialized"""
         chunker = TextChunker(chunk_size=512, chunk_overlap=50)
@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import queue
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from benchmarks.mock_llm_server import MockLLMServer
+from config import config
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import ResilientCaller
+from src.embedding.embedder import EmbeddingGenerator
+from src.monitoring.llm_logging import DroppingQueueHandler, LLMCallLogger, llm_call_log
+from src.monitoring.metrics import metrics
+from src.retrieval.response_generator import ResponseGenerator
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+class TestLLMLogging:
+    """Unit tests for the non-blocking LLM call log"""
+    
+    def test_records_are_compact_json_lines(self, tmp_path):
+        """Test call metadata is written as one compact line per call, without payloads"""
+        log_file = tmp_path / "llm_calls.jsonl"
+        call_log = LLMCallLogger()
+        call_log.configure(str(log_file), payload_sample_rate=0.0)
+        call_log.log_call("chat", "gpt-test", 0.25, prompt_tokens=120, completion_tokens=30,
+                          request=[{"role": "user", "content": "hi"}], response="hello")
+        call_log.log_call("embeddings", "emb-test", 0.01, error=TimeoutError("slow"), batch_size=4)
+        call_log.close()
+        
+        lines = log_file.read_text().splitlines()
+        assert all('": ' not in line and '", "' not in line for line in lines)
+        chat, embeddings = map(json.loads, lines)
+        assert chat["latency_ms"] == 250.0
+        assert (chat["prompt_tokens"], chat["completion_tokens"], chat["status"]) == (120, 30, "ok")
+        assert "request" not in chat and "response" not in chat
+        assert embeddings["status"] == "error"
+        assert embeddings["error"] == "TimeoutError: slow"
+        assert embeddings["batch_size"] == 4
+    
+    def test_payload_sampling_truncates(self, tmp_path):
+        """Test sampled payloads keep their structure with long strings and lists cut"""
+        log_file = tmp_path / "llm_calls.jsonl"
+        call_log = LLMCallLogger()
+        call_log.configure(str(log_file), payload_sample_rate=1.0, max_payload_chars=10)
+        call_log.log_call("embeddings", "emb-test", 0.1, request=["x" * 25] * 20, response="short")
+        call_log.close()
+        
+        record, = read_records(log_file)
+        assert record["request"][0] == "x" * 10 + "...[15 more chars]"
+        assert record["request"][-1] == "...[4 more items]"
+        assert len(record["request"]) == 17
+        assert record["response"] == "short"
+    
+    def test_size_based_rotation(self, tmp_path):
+        """Test the log rotates at max_bytes and keeps backup_count old files"""
+        log_file = tmp_path / "llm_calls.jsonl"
+        call_log = LLMCallLogger()
+        call_log.configure(str(log_file), max_bytes=1000, backup_count=2)
+        for _ in range(100):
+            call_log.log_call("chat", "gpt-test", 0.5, prompt_tokens=10, completion_tokens=10)
+        call_log.close()
+        
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "llm_calls.jsonl", "llm_calls.jsonl.1", "llm_calls.jsonl.2"]
+        assert all(p.stat().st_size <= 1000 for p in tmp_path.iterdir())
+    
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test a full queue drops the record and counts it"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        call_log = LLMCallLogger()
+        call_log._handler = handler
+        before = metrics.counter_value("llm_log_dropped_total")
+        call_log.log_call("chat", "gpt-test", 0.1)
+        call_log.log_call("chat", "gpt-test", 0.1)
+        assert handler.queue.qsize() == 1
+        assert metrics.counter_value("llm_log_dropped_total") == before + 1
+    
+    def test_call_sites_log_against_mock_server(self, tmp_path):
+        """Test ResponseGenerator and EmbeddingGenerator record latency and token counts"""
+        log_file = tmp_path / "llm_calls.jsonl"
+        llm_call_log.configure(str(log_file))
+        try:
+            with MockLLMServer(embedding_dimension=8, reply="A grounded answer.") as mock:
+                client = build_openai_client(api_key="test", base_url=mock.base_url)
+                generator = ResponseGenerator(config, client=client, caller=ResilientCaller("chat"))
+                answer = generator.generate_response(
+                    "What is attention?", [{"content": "Attention weighs tokens.", "metadata": {"source": "a.pdf"}}])
+                embedder = EmbeddingGenerator("openai", client=client, batch_size=2,
+                                              caller=ResilientCaller("embeddings"))
+                embedder.generate_embeddings_batch(["one two", "three", "four"])
+            llm_call_log.flush()
+        finally:
+            llm_call_log.close()
+        
+        assert answer == "A grounded answer."
+        chat, *embeddings = read_records(log_file)
+        assert chat["kind"] == "chat" and chat["model"] == config.LLM_MODEL
+        assert chat["completion_tokens"] == 3 and chat["prompt_tokens"] > 0
+        assert chat["latency_ms"] > 0
+        assert [(r["kind"], r["batch_size"], r["prompt_tokens"]) for r in embeddings] == [
+            ("embeddings", 2, 3), ("embeddings", 1, 1)]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
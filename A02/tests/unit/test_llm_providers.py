@@ -0,0 +1,94 @@
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from benchmarks.mock_llm_server import MockLLMServer
+from config import config
+from src.clients.llm_providers import OpenAICompatibleProvider, build_provider, provider_configured
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import ResilientCaller
+from src.retrieval.response_generator import ResponseGenerator
+
+MESSAGES = [{"role": "user", "content": "What is attention?"}]
+DOCUMENTS = [{"content": "Attention weighs tokens.", "metadata": {"source": "a.pdf", "page": 1}}]
+
+def local_provider(mock, max_concurrency=None):
+    client = build_openai_client(api_key="local", base_url=mock.base_url)
+    return OpenAICompatibleProvider("local", "mock-model", client, ResilientCaller("local_chat"),
+                                    max_concurrency=max_concurrency)
+
+@pytest.fixture
+def local_config(monkeypatch):
+    """Point the LOCAL_LLM_* settings at a mock server"""
+    mock = MockLLMServer(reply="Attention weighs tokens by relevance.").start()
+    monkeypatch.setattr(config, "LLM_PROVIDER", "local")
+    monkeypatch.setattr(config, "LOCAL_LLM_BASE_URL", mock.base_url)
+    monkeypatch.setattr(config, "LOCAL_LLM_MODEL", "llama-test")
+    monkeypatch.setattr(config, "LOCAL_LLM_CONCURRENCY", 3)
+    yield mock
+    mock.stop()
+
+class TestLLMProviders:
+    """Unit tests for chat completion providers against a local OpenAI-compatible server"""
+    
+    def test_complete_reuses_one_connection(self):
+        """Test sequential completions return text and usage over a single kept-alive connection"""
+        with MockLLMServer(reply="A local answer.") as mock:
+            provider = local_provider(mock)
+            results = [provider.complete(MESSAGES) for _ in range(5)]
+            assert mock.connection_count == 1
+        assert {r.text for r in results} == {"A local answer."}
+        assert results[0].completion_tokens == 3 and results[0].prompt_tokens == 3
+        assert (results[0].provider, results[0].model) == ("local", "mock-model")
+    
+    def test_stream_yields_deltas_as_generated(self):
+        """Test the first streamed delta arrives well before generation finishes"""
+        with MockLLMServer(reply="one two three four five six", token_latency_seconds=0.05) as mock:
+            provider = local_provider(mock)
+            start = time.perf_counter()
+            stream = provider.stream(MESSAGES)
+            first = next(stream)
+            first_token_seconds = time.perf_counter() - start
+            deltas = [first] + list(stream)
+            total_seconds = time.perf_counter() - start
+        assert "".join(deltas) == "one two three four five six"
+        assert len(deltas) == 6
+        assert first_token_seconds < total_seconds / 2
+    
+    def test_concurrency_bound_covers_streams(self):
+        """Test max_concurrency limits generations in flight, including streams being consumed"""
+        with MockLLMServer(reply="a b c d", token_latency_seconds=0.03) as mock:
+            provider = local_provider(mock, max_concurrency=2)
+            outputs = []
+            threads = [threading.Thread(target=lambda: outputs.append("".join(provider.stream(MESSAGES))))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert mock.max_in_flight == 2
+        assert outputs == ["a b c d"] * 5
+    
+    def test_build_provider_from_config(self, local_config):
+        """Test LLM_PROVIDER=local builds a keyless provider from the LOCAL_LLM_* settings"""
+        assert provider_configured()
+        provider = build_provider()
+        assert (provider.name, provider.model) == ("local", "llama-test")
+        assert provider.complete(MESSAGES).text == "Attention weighs tokens by relevance."
+        with pytest.raises(ValueError):
+            build_provider("unknown")
+    
+    def test_response_generator_streams_with_local_provider(self, local_config):
+        """Test ResponseGenerator answers and streams through an injected local provider"""
+        generator = ResponseGenerator(config, provider=build_provider("local"))
+        assert generator.model == "llama-test"
+        assert generator.generate_response("What is attention?", DOCUMENTS) == "Attention weighs tokens by relevance."
+        assert "".join(generator.stream_response("What is attention?", DOCUMENTS)) == \
+            "Attention weighs tokens by relevance."
+        assert list(generator.stream_response("What is attention?", [])) == [ResponseGenerator.NO_DOCUMENTS_ANSWER]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from src.monitoring.metrics import LatencyHistogram, MetricsRegistry
+
+class TestMetrics:
+    """Unit tests for latency histograms and the metrics registry"""
+    
+    def test_histogram_percentiles(self):
+        """Test percentiles stay within the histogram's relative error"""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+        assert histogram.percentile(100) == pytest.approx(1.0)
+    
+    def test_prometheus_rendering(self):
+        """Test stage timings and counters render as Prometheus text"""
+        registry = MetricsRegistry()
+        with registry.time_stage("search"):
+            pass
+        with pytest.raises(RuntimeError):
+            with registry.time_stage("generation"):
+                raise RuntimeError("boom")
+        registry.increment("queries_total")
+        text = registry.render_prometheus()
+        assert 'rag_stage_duration_seconds_count{stage="search"} 1' in text
+        assert 'rag_stage_duration_seconds_bucket{stage="search",le="+Inf"} 1' in text
+        assert 'rag_errors_total{stage="generation"} 1' in text
+        assert "rag_queries_total 1" in text
+        assert registry.summary()["search"]["count"] == 1
+    
+    def test_value_histogram(self):
+        """Test size distributions bucket by value and render as a Prometheus histogram"""
+        registry = MetricsRegistry()
+        for size in (1, 3, 3, 40):
+            registry.observe_value("embedding_batch_size", size)
+        summary = registry.value_summary()["embedding_batch_size"]
+        assert summary["count"] == 4 and summary["mean"] == 11.75
+        assert (summary["buckets"]["le_1"], summary["buckets"]["le_4"], summary["buckets"]["le_32"]) == (1, 3, 3)
+        text = registry.render_prometheus()
+        assert 'rag_embedding_batch_size_bucket{le="64"} 4' in text
+        assert "rag_embedding_batch_size_count 4" in text
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import threading
+import time
+import pytest
+from benchmarks.mock_llm_server import MockLLMServer
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import ResilientCaller
+from src.embedding.embedder import EmbeddingGenerator
+from src.embedding.micro_batcher import EmbeddingMicroBatcher
+
+class RecordingEmbedder:
+    """Embedder stand-in that records each batch it is asked for"""
+    
+    def __init__(self, delay=0.0, error=None):
+        self.batches = []
+        self.delay = delay
+        self.error = error
+    
+    def generate_embeddings_batch(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+def embed_concurrently(batcher, texts):
+    results = [None] * len(texts)
+    def run(i):
+        results[i] = batcher.embed(texts[i])
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+class TestMicroBatcher:
+    """Unit tests for micro-batching concurrent query embeddings"""
+    
+    def test_concurrent_requests_share_batches(self):
+        """Test concurrent callers are answered from a few batched requests, in their own order"""
+        embedder = RecordingEmbedder(delay=0.05)
+        batcher = EmbeddingMicroBatcher(embedder, max_batch_size=32, max_wait_seconds=0.02, max_in_flight=1)
+        texts = [f"question {'x' * i}" for i in range(30)]
+        results = embed_concurrently(batcher, texts)
+        batcher.close()
+        assert results == [[float(len(text))] for text in texts]
+        assert len(embedder.batches) <= 3
+        assert sorted(t for batch in embedder.batches for t in batch) == sorted(texts)
+    
+    def test_max_batch_size_and_duplicates(self):
+        """Test batches never exceed max_batch_size and repeated texts are embedded once"""
+        embedder = RecordingEmbedder(delay=0.02)
+        batcher = EmbeddingMicroBatcher(embedder, max_batch_size=4, max_wait_seconds=0.05, max_in_flight=1)
+        futures = [batcher.submit(text) for text in ["a", "bb", "a", "ccc", "dddd", "bb", "e"]]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        assert results == [[1.0], [2.0], [1.0], [3.0], [4.0], [2.0], [1.0]]
+        assert all(len(batch) <= 4 for batch in embedder.batches)
+        assert embedder.batches[0] == ["a", "bb", "ccc"]  # four requests, three distinct texts
+    
+    def test_zero_wait_sends_without_delay(self):
+        """Test max_wait_seconds=0 dispatches a lone request immediately"""
+        batcher = EmbeddingMicroBatcher(RecordingEmbedder(), max_wait_seconds=0.0)
+        start = time.perf_counter()
+        assert batcher.embed("solo") == [4.0]
+        assert time.perf_counter() - start < 0.05
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit("late")
+    
+    def test_errors_reach_every_caller(self):
+        """Test a failed batch request fails each waiting caller"""
+        batcher = EmbeddingMicroBatcher(RecordingEmbedder(error=ValueError("down")), max_wait_seconds=0.01)
+        futures = [batcher.submit(text) for text in ["a", "b"]]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+        batcher.close()
+    
+    def test_batches_against_mock_server(self):
+        """Test batched embeddings match per-text embeddings and cut the number of API requests"""
+        with MockLLMServer(embedding_dimension=8, latency_seconds=0.03) as mock:
+            client = build_openai_client(api_key="test", base_url=mock.base_url)
+            embedder = EmbeddingGenerator("openai", client=client, caller=ResilientCaller("embeddings"))
+            texts = [f"query {i}" for i in range(20)]
+            expected = [embedder.generate_embedding(text) for text in texts]
+            requests_before = mock.request_count
+            batcher = EmbeddingMicroBatcher(embedder, max_wait_seconds=0.01, max_in_flight=2)
+            results = embed_concurrently(batcher, texts)
+            batcher.close()
+            assert mock.request_count - requests_before < 10
+        assert results == expected
+
+if __name__ == "__main__":
+    pytest.main([__file__])
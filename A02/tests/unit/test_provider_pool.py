@@ -0,0 +1,147 @@
+import sys
+import os
+import queue
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from benchmarks.mock_llm_server import MockLLMServer
+from config import config
+from src.clients import llm_providers
+from src.clients.llm_providers import OpenAICompatibleProvider, build_provider
+from src.clients.openai_client import build_openai_client
+from src.clients.provider_pool import ProviderPool, ProviderStats, _Attempt
+from src.clients.resilience import ResilientCaller, RetryPolicy
+from src.monitoring.metrics import metrics
+
+MESSAGES = [{"role": "user", "content": "What is attention?"}]
+
+def provider_for(name, mock):
+    client = build_openai_client(api_key="test", base_url=mock.base_url)
+    caller = ResilientCaller(f"{name}_chat", retry_policy=RetryPolicy(max_retries=0))
+    return OpenAICompatibleProvider(name, f"{name}-model", client, caller)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestProviderPool:
+    """Unit tests for latency-aware routing and hedged LLM calls against stand-in servers"""
+    
+    def test_stats_percentile_and_failure_penalty(self):
+        """Test the window percentile and that failures raise a provider's routing score"""
+        stats = ProviderStats(window=100)
+        for ms in range(1, 101):
+            stats.record(ms / 1000)
+        assert stats.percentile(50) == 0.05 and stats.percentile(95) == 0.095
+        healthy = stats.score(failure_penalty_seconds=10.0)
+        stats.record_failure()
+        assert stats.score(failure_penalty_seconds=10.0) > healthy + 1
+    
+    def test_routes_to_lower_latency_provider(self):
+        """Test calls settle on the faster provider once both have been observed"""
+        with MockLLMServer(latency_seconds=0.05, reply="slow") as slow, MockLLMServer(reply="fast") as fast:
+            pool = ProviderPool([provider_for("slow", slow), provider_for("fast", fast)], hedging=False)
+            served = [pool.complete(MESSAGES).provider for _ in range(6)]
+        assert served[:2] == ["slow", "fast"]  # unobserved providers are tried first
+        assert served[2:] == ["fast"] * 4
+        assert [p.name for p in pool.route()] == ["fast", "slow"]
+    
+    def test_hedge_after_delay_and_cancel_loser(self):
+        """Test a slow primary is hedged, the secondary's answer is used and the primary is cancelled"""
+        with MockLLMServer(reply=" ".join(["slow"] * 40), token_latency_seconds=0.05) as primary, \
+                MockLLMServer(reply="hedged answer") as secondary:
+            pool = ProviderPool([provider_for("primary", primary), provider_for("secondary", secondary)],
+                                initial_hedge_delay=0.1)
+            hedges = metrics.counter_value("llm_hedges_total", provider="secondary")
+            start = time.perf_counter()
+            result = pool.complete(MESSAGES)
+            elapsed = time.perf_counter() - start
+            assert wait_for(lambda: primary.cancelled_streams == 1)
+        assert (result.text, result.provider) == ("hedged answer", "secondary")
+        assert elapsed < 1.0  # the primary alone needs 2s
+        assert metrics.counter_value("llm_hedges_total", provider="secondary") == hedges + 1
+        assert metrics.counter_value("llm_cancelled_total", provider="primary") >= 1
+    
+    def test_cancelled_hedge_never_outranks_faster_provider(self):
+        """Test a slow hedge cancelled early is not recorded as fast, so routing stays on the fast provider"""
+        with MockLLMServer(latency_seconds=0.12, reply="fast") as primary, \
+                MockLLMServer(latency_seconds=1.0, reply="slow") as secondary:
+            pool = ProviderPool([provider_for("primary", primary), provider_for("secondary", secondary)],
+                                initial_hedge_delay=0.1)
+            served, routes = [], []
+            for _ in range(5):
+                served.append(pool.complete(MESSAGES).provider)
+                routes.append([p.name for p in pool.route()])
+        assert served == ["primary"] * 5
+        assert routes == [["primary", "secondary"]] * 5
+        stats = pool.latency_stats
+        assert stats["secondary"].percentile(50) >= stats["primary"].percentile(50)
+        cancelled = ProviderStats()
+        cancelled.record(1.0)
+        cancelled.record_cancelled(0.02)
+        assert cancelled.percentile(50) == 1.0
+    
+    def test_cancel_closes_response_before_first_token(self):
+        """Test cancelling an accepted request closes its response without waiting for a token"""
+        with MockLLMServer(reply="late answer", token_latency_seconds=0.5) as slow:
+            events = queue.Queue()
+            attempt = _Attempt(provider_for("slow", slow), events, True, MESSAGES, {})
+            assert wait_for(lambda: attempt.response is not None)
+            attempt.cancel()
+            assert attempt.response.response.is_closed
+            attempt.thread.join(5)
+            assert not attempt.thread.is_alive()
+            assert wait_for(lambda: slow.cancelled_streams == 1)
+        assert events.empty()
+    
+    def test_no_hedge_when_primary_is_fast(self):
+        """Test the secondary is never called while the primary answers within the hedge delay"""
+        with MockLLMServer(reply="primary answer") as primary, MockLLMServer(reply="unused") as secondary:
+            pool = ProviderPool([provider_for("primary", primary), provider_for("secondary", secondary)],
+                                initial_hedge_delay=0.5)
+            pool.latency_stats["secondary"].record(1.0)  # keep routing on the primary
+            results = [pool.complete(MESSAGES).text for _ in range(3)]
+            assert secondary.request_count == 0
+        assert results == ["primary answer"] * 3
+    
+    def test_failover_on_error(self):
+        """Test a failing primary falls over to the next provider at once"""
+        with MockLLMServer(fail_first=100, fail_status=400) as primary, \
+                MockLLMServer(reply="backup answer") as secondary:
+            pool = ProviderPool([provider_for("primary", primary), provider_for("secondary", secondary)],
+                                initial_hedge_delay=5.0)
+            start = time.perf_counter()
+            result = pool.complete(MESSAGES)
+            assert time.perf_counter() - start < 1.0
+            assert pool.latency_stats["primary"].failure_rate > 0
+            assert [p.name for p in pool.route()] == ["secondary", "primary"]
+        assert result.text == "backup answer"
+    
+    def test_stream_hedges_on_first_token(self):
+        """Test streams race to the first token and then follow only the winner"""
+        with MockLLMServer(latency_seconds=1.0, reply="late") as primary, \
+                MockLLMServer(reply="streamed hedge answer", token_latency_seconds=0.01) as secondary:
+            pool = ProviderPool([provider_for("primary", primary), provider_for("secondary", secondary)],
+                                initial_hedge_delay=0.05)
+            start = time.perf_counter()
+            text = "".join(pool.stream(MESSAGES))
+            assert time.perf_counter() - start < 0.8
+        assert text == "streamed hedge answer"
+        assert pool.first_token_stats["secondary"].count == 1
+    
+    def test_build_pool_from_config(self, monkeypatch):
+        """Test LLM_PROVIDER=pool builds a pool of the configured members only"""
+        with MockLLMServer(reply="local answer") as mock:
+            monkeypatch.setattr(llm_providers, "_providers", {})
+            monkeypatch.setattr(config, "LOCAL_LLM_BASE_URL", mock.base_url)
+            monkeypatch.setattr(config, "OPENAI_API_KEY", None)
+            monkeypatch.setattr(config, "LLM_POOL_PROVIDERS", ["openai", "local"])
+            pool = build_provider("pool")
+            assert [p.name for p in pool.providers] == ["local"]
+            assert pool.complete(MESSAGES).text == "local answer"
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from src.serving.ingest_queue import IngestQueue, IndexVersion
+from src.serving.ingest_worker import IngestWorker
+
+class FakePipeline:
+    def __init__(self):
+        self.ingested = []
+    
+    def ingest_document(self, file_path):
+        self.ingested.append(file_path)
+        return not file_path.endswith("bad.pdf")
+
+class TestServing:
+    """Unit tests for the single-writer ingest queue"""
+    
+    def test_queue_round_trip(self, tmp_path):
+        """Test jobs are claimed in order and their outcome recorded"""
+        queue = IngestQueue(str(tmp_path / "queue"))
+        first = queue.enqueue("a.pdf")
+        second = queue.enqueue("b.pdf")
+        assert queue.status(first)['status'] == 'pending'
+        
+        job = queue.claim()
+        assert job['job_id'] == first
+        assert queue.status(first)['status'] == 'processing'
+        queue.complete(job, success=True)
+        assert queue.status(first)['status'] == 'succeeded'
+        assert queue.claim()['job_id'] == second
+        assert queue.claim() is None
+    
+    def test_worker_bumps_index_version(self, tmp_path):
+        """Test the writer bumps the index version only for committed ingests"""
+        queue = IngestQueue(str(tmp_path / "queue"))
+        version = IndexVersion(str(tmp_path / "queue" / "index_version"))
+        reader_view = IndexVersion(version.path)
+        worker = IngestWorker(FakePipeline(), queue, version)
+        
+        good = queue.enqueue("good.pdf")
+        bad = queue.enqueue("bad.pdf")
+        assert worker.process_one() and worker.process_one()
+        assert not worker.process_one()
+        assert reader_view.read() == 1
+        assert queue.status(good)['status'] == 'succeeded'
+        assert queue.status(bad)['status'] == 'failed'
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import json
+import numpy as np
+import pytest
+from src.vector_store.chroma_manager import ChromaDBManager
+from src.vector_store.snapshot import export_snapshot, import_snapshot, read_manifest
+
+class TestSnapshot:
+    """Unit tests for vector store snapshot export and import"""
+    
+    def test_round_trip(self, tmp_path):
+        """Test a snapshot restores ids, documents, metadata and embeddings"""
+        source = ChromaDBManager(str(tmp_path / "source"), "snapshot_source")
+        ids = [f"r{i}" for i in range(7)]
+        vectors = [[float(i), 0.5, -1.0] for i in range(7)]
+        source.upsert_records(ids, [f"text {i}" for i in ids],
+                              [{"source": "a.pdf", "page": i} for i in range(7)], vectors)
+        
+        snapshot_dir = str(tmp_path / "snap")
+        manifest = export_snapshot(source, snapshot_dir, batch_size=3)
+        assert (manifest["count"], manifest["dimension"]) == (7, 3)
+        assert np.load(os.path.join(snapshot_dir, "embeddings.npy"), mmap_mode="r").shape == (7, 3)
+        
+        target = ChromaDBManager(str(tmp_path / "target"), "snapshot_target")
+        assert import_snapshot(target, snapshot_dir, batch_size=2)["count"] == 7
+        restored = target.collection.get(ids=["r5"], include=["documents", "metadatas", "embeddings"])
+        assert restored['documents'] == ["text r5"]
+        assert restored['metadatas'] == [{"source": "a.pdf", "page": 5}]
+        assert restored['embeddings'][0] == pytest.approx([5.0, 0.5, -1.0])
+    
+    def test_checksum_mismatch_is_rejected(self, tmp_path):
+        """Test a corrupted snapshot fails verification"""
+        source = ChromaDBManager(str(tmp_path / "source"), "snapshot_corrupt")
+        source.upsert_records(["a"], ["text"], [{"source": "a.pdf"}], [[1.0, 2.0]])
+        snapshot_dir = str(tmp_path / "snap")
+        export_snapshot(source, snapshot_dir)
+        with open(os.path.join(snapshot_dir, "records.jsonl"), "a") as f:
+            f.write(json.dumps({"id": "b", "document": "extra", "metadata": {"source": "b"}}) + "\n")
+        with pytest.raises(ValueError):
+            read_manifest(snapshot_dir, verify=True)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
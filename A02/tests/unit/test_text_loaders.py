@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import json
+import pytest
+from src.document_loader.registry import UnsupportedFormatError, build_default_registry
+
+class TestTextLoaders:
+    """Unit tests for the loader registry and the text format loaders"""
+    
+    def test_markdown_and_latex_sections(self, tmp_path):
+        """Test sectioned formats yield one record per section with the shared contract"""
+        registry = build_default_registry()
+        markdown = tmp_path / "notes.md"
+        markdown.write_text("Intro text.\n\n# Methods\nWe measure.\n```\n# not a heading\n```\n## Results\nIt works.\n")
+        records = registry.load_document(str(markdown))
+        assert [r['metadata'].get('section') for r in records] == [None, "Methods", "Results"]
+        assert "# not a heading" in records[1]['content']
+        assert records[2]['metadata'] == {'source': str(markdown), 'filename': "notes.md",
+                                          'page': 3, 'total_pages': 3, 'section': "Results"}
+        
+        latex = tmp_path / "paper.tex"
+        latex.write_text("\\documentclass{article}\n\\begin{document}\n"
+                         "\\section{Introduction}\nWe study \\textbf{graphs}~\\cite{knuth}. % hidden\n"
+                         "\\begin{figure}\\caption{dropped}\\end{figure}\n"
+                         "\\section*{Conclusion}\nDone.\n\\end{document}\n")
+        records = registry.load_document(str(latex))
+        assert [r['metadata']['section'] for r in records] == ["Introduction", "Conclusion"]
+        assert records[0]['content'] == "We study graphs ."
+    
+    def test_html_and_jsonl(self, tmp_path):
+        """Test HTML drops scripts and JSONL streams one record per text line"""
+        registry = build_default_registry()
+        page = tmp_path / "page.html"
+        page.write_text("<html><head><title>t</title><script>var x;</script></head><body>"
+                        "<p>Preface &amp; thanks</p><h2>Background</h2><p>First.</p><p>Second.</p></body></html>")
+        records = registry.load_document(str(page))
+        assert [(r['metadata'].get('section'), r['content']) for r in records] == [
+            (None, "Preface & thanks"), ("Background", "First.\nSecond.")]
+        
+        dump = tmp_path / "dump.jsonl"
+        rows = [{"text": "alpha", "title": "A", "year": 2020, "tags": ["x"]}, {}, {"content": "beta"}]
+        dump.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+        records = list(registry.iter_pages(str(dump)))
+        assert [r['content'] for r in records] == ["alpha", "beta"]
+        assert records[0]['metadata'] == {'source': str(dump), 'filename': "dump.jsonl",
+                                          'page': 1, 'section': "A", 'year': 2020}
+        assert records[1]['metadata']['page'] == 3
+    
+    def test_registry_rejects_unknown_extensions(self):
+        """Test unsupported extensions raise and PDF stays registered"""
+        registry = build_default_registry()
+        assert registry.supports("paper.PDF") and registry.supports("notes.md")
+        with pytest.raises(UnsupportedFormatError):
+            registry.get_loader("archive.zip")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
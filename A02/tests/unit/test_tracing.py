@@ -0,0 +1,110 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pytest
+from fastapi.testclient import TestClient
+import src.api.app as api
+from benchmarks.mock_llm_server import MockLLMServer
+from config import config
+from src.clients.llm_providers import OpenAICompatibleProvider
+from src.clients.openai_client import build_openai_client
+from src.clients.resilience import ResilientCaller
+from src.monitoring.tracing import Tracer, JsonLinesExporter, parse_traceparent, tracer as shared_tracer
+from src.retrieval.response_generator import ResponseGenerator
+
+DOCUMENTS = [{"content": "Attention weighs tokens.", "metadata": {"source": "a.pdf", "page": 1},
+              "similarity_score": 0.9}]
+
+class StreamingPipeline:
+    """Pipeline stand-in that streams its answer from a ResponseGenerator"""
+    
+    def __init__(self, generator):
+        self.generator = generator
+    
+    def stream_query(self, question, top_k=5, filters=None):
+        return DOCUMENTS, self.generator.stream_response(question, DOCUMENTS)
+
+class TestTracing:
+    """Unit tests for request-scoped tracing"""
+    
+    def test_nested_spans_exported_as_json_lines(self, tmp_path):
+        """Test child spans share the trace id and point at their parent"""
+        trace_file = tmp_path / "traces.jsonl"
+        tracer = Tracer()
+        tracer.configure(JsonLinesExporter(str(trace_file)), sample_rate=1.0)
+        with tracer.start_span("root") as root:
+            with tracer.start_span("child", stage="search") as child:
+                assert tracer.current_trace_id() == root.trace_id
+        tracer.flush()
+        
+        spans = {s['name']: s for s in map(json.loads, trace_file.read_text().splitlines())}
+        assert spans['child']['trace_id'] == spans['root']['trace_id']
+        assert spans['child']['parent_id'] == spans['root']['span_id']
+        assert spans['child']['attributes'] == {"stage": "search"}
+        assert child.traceparent.startswith(f"00-{root.trace_id}-")
+    
+    def test_sampling_and_traceparent(self, tmp_path):
+        """Test unsampled traces record nothing and incoming context is honoured"""
+        trace_file = tmp_path / "traces.jsonl"
+        tracer = Tracer()
+        tracer.configure(JsonLinesExporter(str(trace_file)), sample_rate=0.0)
+        assert not tracer.enabled
+        
+        tracer.sample_rate = 1.0
+        unsampled = "00-" + "a" * 32 + "-" + "b" * 16 + "-00"
+        with tracer.start_span("request", traceparent=unsampled) as span:
+            assert span is None
+            with tracer.start_span("child") as child:
+                assert child is None
+        
+        sampled = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        with tracer.start_span("request", traceparent=sampled) as span:
+            assert span.trace_id == "a" * 32
+            assert span.parent_id == "b" * 16
+        assert parse_traceparent("garbage") is None
+    
+    def test_configure_shuts_down_previous_processor(self, tmp_path):
+        """Test reconfiguring exports the old processor's queued spans and stops its worker"""
+        first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+        tracer = Tracer()
+        tracer.configure(JsonLinesExporter(str(first)), sample_rate=1.0)
+        old = tracer.processor
+        with tracer.start_span("before"):
+            pass
+        tracer.configure(JsonLinesExporter(str(second)))
+        assert not old._worker.is_alive()
+        assert [json.loads(line)['name'] for line in first.read_text().splitlines()] == ["before"]
+        
+        with tracer.start_span("after"):
+            pass
+        tracer.configure(None)
+        assert [json.loads(line)['name'] for line in second.read_text().splitlines()] == ["after"]
+    
+    def test_streamed_answer_is_traced(self, tmp_path, monkeypatch):
+        """Test /query/stream completes with tracing on and exports the streamed completion's span"""
+        trace_file = tmp_path / "traces.jsonl"
+        shared_tracer.configure(JsonLinesExporter(str(trace_file)), sample_rate=1.0)
+        try:
+            with MockLLMServer(reply="one two three four", token_latency_seconds=0.01) as mock:
+                client = build_openai_client(api_key="local", base_url=mock.base_url)
+                provider = OpenAICompatibleProvider("local", "mock-model", client, ResilientCaller("local_chat"))
+                pipeline = StreamingPipeline(ResponseGenerator(config, provider=provider))
+                monkeypatch.setattr(api, "get_pipeline", lambda: pipeline)
+                response = TestClient(api.app).post("/query/stream", json={"question": "What is attention?"})
+            shared_tracer.flush()
+        finally:
+            shared_tracer.configure(None, sample_rate=config.TRACE_SAMPLE_RATE)
+        
+        events = [line[len("data: "):] for line in response.text.splitlines() if line]
+        assert events[-1] == "[DONE]"
+        deltas = [json.loads(event)["text"] for event in events[1:-1]]
+        assert "".join(deltas) == "one two three four"
+        spans = {span["name"]: span for span in map(json.loads, trace_file.read_text().splitlines())}
+        completion, root = spans["llm.chat_completion"], spans["POST /query/stream"]
+        assert completion["status"] == "ok" and completion["attributes"]["stream"] is True
+        assert (completion["trace_id"], completion["parent_id"]) == (root["trace_id"], root["span_id"])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,6 +4,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 import pytest
 from src.vector_store.chroma_manager import ChromaDBManager
+from src.vector_store.filters import build_where_clause
 
 class TestVectorStore:
     """Unit tests for vector store components"""
@@ -20,5 +21,84 @@ class TestVectorStore:
         count = manager.get_collection_info()
         assert count >= 0  # Should not raise exception
 
+    def test_build_where_clause(self):
+        """Test query filters translate into a Chroma where clause"""
+        assert build_where_clause() is None
+        assert build_where_clause(page_min=2) == {"page": {"$gte": 2}}
+        where = build_where_clause(source="paper.pdf", page_min=1, page_max=3,
+                                   metadata={"year": {"$gte": 2020}})
+        assert len(where["$and"]) == 4
+        with pytest.raises(ValueError):
+            build_where_clause(page_min=5, page_max=1)
+        with pytest.raises(ValueError):
+            build_where_clause(metadata={"year": {"$regex": "20.*"}})
+
+    def test_filtered_search(self, tmp_path):
+        """Test filters are pushed down into the vector search"""
+        manager = ChromaDBManager(str(tmp_path), "test_collection_filters")
+        documents = [
+            {'content': f"page {page} of {name}",
+             'metadata': {'source': f"data/{name}", 'filename': name, 'page': page}}
+            for name in ("a.pdf", "b.pdf") for page in range(1, 4)
+        ]
+        embeddings = [[float(i), 1.0, 0.0] for i in range(len(documents))]
+        manager.add_documents(documents, embeddings)
+
+        where = build_where_clause(source="b.pdf", page_min=2)
+        results = manager.search_similar([0.0, 1.0, 0.0], top_k=5, where=where)
+        assert len(results['ids'][0]) == 2
+        assert all(m['filename'] == "b.pdf" and m['page'] >= 2 for m in results['metadatas'][0])
+
+        empty = manager.search_similar([0.0, 1.0, 0.0], top_k=5,
+                                       where=build_where_clause(source="missing.pdf"))
+        assert empty['ids'] == [[]]
+
+    def test_metadata_indexes_gated_on_chroma_version(self, tmp_path, monkeypatch):
+        """Test metadata indexes are only added to the private Chroma schema on verified releases"""
+        import sqlite3
+        import chromadb
+        from src.vector_store.chroma_manager import drop_metadata_indexes, ensure_metadata_indexes
+        manager = ChromaDBManager(str(tmp_path / "db"), "index_gate")
+        sqlite_path = os.path.join(manager.db_path, "chroma.sqlite3")
+        
+        def indexes():
+            with sqlite3.connect(sqlite_path) as conn:
+                rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                                    "AND name LIKE 'embedding_metadata_key_%'").fetchall()
+            return {name for (name,) in rows}
+        assert len(indexes()) == 3
+        
+        drop_metadata_indexes(manager.db_path)
+        monkeypatch.setattr(chromadb, "__version__", "0.5.0")
+        ensure_metadata_indexes(manager.db_path)
+        assert indexes() == set()
+    
+    def test_retried_ingest_does_not_duplicate_chunks(self, tmp_path, monkeypatch):
+        """Test a retry after a failure partway through replaces the batches already stored"""
+        from config import config
+        from src.main import RAGPipeline
+        monkeypatch.setattr(config, "VECTOR_DB_PATH", str(tmp_path / "chroma_db"))
+        monkeypatch.setattr(config, "INGEST_PAGE_BATCH", 1)
+        monkeypatch.setattr(config, "DEDUP_ENABLED", True)
+        monkeypatch.setattr(config, "DEDUP_INDEX_DIR", None)
+        paper = tmp_path / "paper.md"
+        paper.write_text("# One\nFirst section.\n\n# Two\nSecond section.\n\n# Three\nThird section.\n")
+        pipeline = RAGPipeline()
+
+        chunk_documents = pipeline.chunker.chunk_documents
+        calls = []
+
+        def fail_on_second_batch(documents):
+            calls.append(documents)
+            if len(calls) == 2:
+                raise RuntimeError("extraction failed")
+            return chunk_documents(documents)
+        monkeypatch.setattr(pipeline.chunker, "chunk_documents", fail_on_second_batch)
+        assert not pipeline.ingest_document(str(paper))
+        assert pipeline.retriever.get_stats()["document_count"] == 1
+
+        assert pipeline.ingest_document(str(paper))
+        assert pipeline.retriever.get_stats()["document_count"] == 3
+
 if __name__ == "__main__":
     pytest.main([__file__])